@@ -0,0 +1,19 @@
+"""
+Performance benchmarks for the openformats handlers.
+
+Synthetic source files are generated for every registered handler at
+configurable sizes, parsed and compiled back, and the timings and peak memory
+of each phase are written out as JSON so that they can be compared between
+releases. Run with::
+
+    python -m benchmarks --sizes 1KB 1MB --output results.json
+
+The escaping/unescaping of the JSON handlers is benchmarked separately::
+
+    python -m benchmarks.escaping --count 100000
+
+and so are the regular expressions that run over user content, against
+inputs crafted to trigger catastrophic backtracking::
+
+    python -m benchmarks.adversarial --sizes 10000 20000 40000 80000
+"""
@@ -0,0 +1,104 @@
+"""
+Time the regular expressions and scanners that run over user content against
+inputs crafted to trigger catastrophic backtracking, at growing sizes. Every
+case should grow linearly, ie doubling the size should roughly double the
+timing. Run with::
+
+    python -m benchmarks.adversarial --sizes 10000 20000 40000 80000
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import json
+import sys
+from timeit import default_timer
+
+from openformats.formats.github_markdown import split_yaml_header
+from openformats.formats.po import PoHandler
+from openformats.utils.icu import ICUParser
+
+ICU_PARSER = ICUParser()
+
+
+def _icu(size):
+    # An ICU message that is never closed
+    value = '{ count, plural,' + ' ' * size
+    return lambda: ICU_PARSER.parse('key', value)
+
+
+def _yaml_header(size):
+    # A YAML front matter that is never closed
+    content = '---\na' + ' ' * size
+    return lambda: split_yaml_header(content)
+
+
+def _specifier(size):
+    # A printf specifier with endless flags and no type
+    content = '%' + '0' * size
+    return lambda: list(PoHandler.SPECIFIER.finditer(content))
+
+
+CASES = (
+    ('icu', _icu),
+    ('yaml_header', _yaml_header),
+    ('specifier', _specifier),
+)
+
+
+def _best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def run(sizes=(10000, 20000, 40000, 80000), repeat=3):
+    """ Benchmark every case on inputs of each of `sizes` characters.
+
+        :return: a JSON serializable dictionary with the minimum timings of
+            each case, in the order of `sizes`
+    """
+
+    sizes = sorted(sizes)
+    result = {'sizes': sizes}
+    for name, case in CASES:
+        result[name] = [_best_of(case(size), repeat) for size in sizes]
+    return result
+
+
+def format_result(result):
+    sizes = result['sizes']
+    lines = ["{:<12} ".format('case') +
+             " ".join("{:>10}".format(size) for size in sizes)]
+    for name, _ in CASES:
+        lines.append("{:<12} ".format(name) +
+                     " ".join("{:>9.5f}s".format(timing)
+                              for timing in result[name]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark regular expressions against adversarial "
+                    "inputs."
+    )
+    parser.add_argument('-s', '--sizes', nargs='+', type=int,
+                        default=[10000, 20000, 40000, 80000],
+                        help="Input sizes in characters (default: "
+                             "%(default)s)")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="Timed runs per case and size (default: "
+                             "%(default)s)")
+    args = parser.parse_args(argv)
+
+    result = run(args.sizes, args.repeat)
+    print(format_result(result), file=sys.stderr)
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic source files for every handler.
+
+Each generator takes a target size in bytes and returns a source file of
+roughly that size, built by repeating a handful of representative entries
+(plain strings, plurals, comments, nested structures etc). For the binary
+formats (DOCX, IDML) the size refers to the uncompressed XML payload. The
+output is deterministic for a given size so that results are comparable
+between runs.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import io
+import random
+import zipfile
+from importlib import import_module
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+    "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo "
+    "consequat duis aute irure in reprehenderit voluptate velit esse cillum "
+    "fugiat nulla pariatur excepteur sint occaecat cupidatat non proident "
+    "sunt culpa qui officia deserunt mollit anim id est laborum"
+).split()
+
+
+class Corpus(object):
+    """ Ties a handler to the generator of its synthetic source files.
+
+        :param str name: the handler's `name`
+        :param str handler_path: 'module:ClassName' of the handler, imported
+            lazily so that a missing optional dependency only affects its own
+            format
+        :param generate: callable that accepts a size in bytes and returns the
+            source content
+        :param setup: optional callable that prepares a fresh handler instance
+            before parsing/compiling (eg to set plural rules)
+    """
+
+    def __init__(self, name, handler_path, generate, setup=None):
+        self.name = name
+        self.handler_path = handler_path
+        self.generate = generate
+        self.setup = setup
+
+    @property
+    def handler_class(self):
+        module_path, class_name = self.handler_path.split(':')
+        return getattr(import_module(module_path), class_name)
+
+    def get_handler(self):
+        handler = self.handler_class()
+        if self.setup is not None:
+            self.setup(handler)
+        return handler
+
+
+def _sentence(rnd, length=8):
+    words = [rnd.choice(WORDS) for _ in range(length)]
+    words[0] = words[0].capitalize()
+    return " ".join(words)
+
+
+def _fill(size, head, tail, unit):
+    """ Call `unit(index)` until the concatenated output reaches `size`
+        characters; at least one unit is always generated.
+    """
+
+    parts = [head]
+    total = len(head) + len(tail)
+    index = 0
+    while index == 0 or total < size:
+        part = unit(index)
+        parts.append(part)
+        total += len(part)
+        index += 1
+    parts.append(tail)
+    return "".join(parts)
+
+
+def _zip(members):
+    """ Pack a list of `(name, text)` pairs into a zip archive in memory. The
+        first member is stored uncompressed, as UCF requires for `mimetype`.
+    """
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index, (name, text) in enumerate(members):
+            compression = zipfile.ZIP_STORED if index == 0 else \
+                zipfile.ZIP_DEFLATED
+            archive.writestr(zipfile.ZipInfo(name), text.encode('utf-8'),
+                             compress_type=compression)
+    return out.getvalue()
+
+
+""" JSON family """
+
+
+def generate_keyvaluejson(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        separator = "," if i else ""
+        if i % 10 == 9:
+            value = ("{{cnt, plural, one {{{} {{cnt}} file}} "
+                     "other {{{} {{cnt}} files}}}}".
+                     format(_sentence(rnd, 4), _sentence(rnd, 4)))
+            return '{}\n    "plural_{}": "{}"'.format(separator, i, value)
+        elif i % 7 == 6:
+            return ('{}\n    "group_{}": {{\n        "title": "{}",\n'
+                    '        "items": ["{}", "{}", 3, true]\n    }}'.
+                    format(separator, i, _sentence(rnd), _sentence(rnd, 3),
+                           _sentence(rnd, 3)))
+        return '{}\n    "key_{}": "{}"'.format(separator, i, _sentence(rnd))
+
+    return _fill(size, "{", "\n}\n", unit)
+
+
+def generate_structured_json(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        separator = "," if i else ""
+        if i % 10 == 9:
+            string = ("{{cnt, plural, one {{{} {{cnt}} file}} "
+                      "other {{{} {{cnt}} files}}}}".
+                      format(_sentence(rnd, 4), _sentence(rnd, 4)))
+        else:
+            string = _sentence(rnd)
+        entry = ('{{\n        "string": "{}",\n'
+                 '        "developer_comment": "{}",\n'
+                 '        "character_limit": 100,\n'
+                 '        "context": "ctx_{}"\n    }}'.
+                 format(string, _sentence(rnd, 5), i % 3))
+        if i % 7 == 6:
+            return '{}\n    "group_{}": {{"nested_{}": {}}}'.format(
+                separator, i, i, entry
+            )
+        return '{}\n    "key_{}": {}'.format(separator, i, entry)
+
+    return _fill(size, "{", "\n}\n", unit)
+
+
+def generate_chrome(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        separator = "," if i else ""
+        if i % 10 == 9:
+            message = ("{{cnt, plural, one {{{} {{cnt}} file}} "
+                       "other {{{} {{cnt}} files}}}}".
+                       format(_sentence(rnd, 4), _sentence(rnd, 4)))
+        else:
+            message = _sentence(rnd)
+        return ('{}\n    "key_{}": {{\n        "message": "{}",\n'
+                '        "description": "{}"\n    }}'.
+                format(separator, i, message, _sentence(rnd, 5)))
+
+    return _fill(size, "{", "\n}\n", unit)
+
+
+""" XML family """
+
+
+def generate_android(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        if i % 10 == 9:
+            return ('    <plurals name="plural_{}">\n'
+                    '        <item quantity="one">{} %d file</item>\n'
+                    '        <item quantity="other">{} %d files</item>\n'
+                    '    </plurals>\n'.
+                    format(i, _sentence(rnd, 4), _sentence(rnd, 4)))
+        elif i % 7 == 6:
+            return ('    <string-array name="array_{}">\n'
+                    '        <item>{}</item>\n'
+                    '        <item>{}</item>\n'
+                    '        <item>{}</item>\n'
+                    '    </string-array>\n'.
+                    format(i, _sentence(rnd, 3), _sentence(rnd, 3),
+                           _sentence(rnd, 3)))
+        elif i % 5 == 4:
+            return ('    <!-- {} -->\n'
+                    '    <string name="key_{}">{} <b>{}</b></string>\n'.
+                    format(_sentence(rnd, 5), i, _sentence(rnd),
+                           _sentence(rnd, 2)))
+        return '    <string name="key_{}">{}</string>\n'.format(
+            i, _sentence(rnd)
+        )
+
+    return _fill(size,
+                 '<?xml version="1.0" encoding="utf-8"?>\n<resources>\n',
+                 '</resources>\n',
+                 unit)
+
+
+def generate_stringsdict(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        return (
+            '        <key>key_{i}</key>\n'
+            '        <dict>\n'
+            '            <key>NSStringLocalizedFormatKey</key>\n'
+            '            <string>{prefix} %#@items@</string>\n'
+            '            <key>items</key>\n'
+            '            <dict>\n'
+            '                <key>NSStringFormatSpecTypeKey</key>\n'
+            '                <string>NSStringPluralRuleType</string>\n'
+            '                <key>NSStringFormatValueTypeKey</key>\n'
+            '                <string>d</string>\n'
+            '                <key>one</key>\n'
+            '                <string>{one} %d item</string>\n'
+            '                <key>other</key>\n'
+            '                <string>{other} %d items</string>\n'
+            '            </dict>\n'
+            '        </dict>\n'
+        ).format(i=i, prefix=_sentence(rnd, 3), one=_sentence(rnd, 4),
+                 other=_sentence(rnd, 4))
+
+    return _fill(
+        size,
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" '
+        '"http://www.apple.com/DTDs/PropertyList-1.0.dtd">\n'
+        '<plist version="1.0">\n    <dict>\n',
+        '    </dict>\n</plist>\n',
+        unit
+    )
+
+
+def generate_custom_xml(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        strings = []
+        for j in range(5):
+            if j == 4:
+                strings.append(
+                    '        <string key="key_{}_{}">\n'
+                    '            <base>{}</base>\n'
+                    '            <variant context="male">{}</variant>\n'
+                    '            <variant context="female">{}</variant>\n'
+                    '        </string>\n'.
+                    format(i, j, _sentence(rnd), _sentence(rnd),
+                           _sentence(rnd))
+                )
+            else:
+                strings.append(
+                    '        <string key="key_{}_{}">\n'
+                    '            <base>{}</base>\n'
+                    '        </string>\n'.format(i, j, _sentence(rnd))
+                )
+        return '    <section name="group_{}">\n{}    </section>\n'.format(
+            i, "".join(strings)
+        )
+
+    return _fill(size,
+                 '<?xml version="1.0" encoding="UTF-8"?>\n<strings>\n',
+                 '</strings>\n',
+                 unit)
+
+
+""" Other text formats """
+
+
+def generate_po(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        if i % 10 == 9:
+            return ('#: src/file_{i}.c:{i}\n'
+                    'msgid "{one} {i}"\nmsgid_plural "{other} {i}"\n'
+                    'msgstr[0] "{one} {i}"\nmsgstr[1] "{other} {i}"\n\n'.
+                    format(i=i, one=_sentence(rnd, 4),
+                           other=_sentence(rnd, 4)))
+        string = "{} {}".format(_sentence(rnd), i)
+        return ('#. {}\n#: src/file_{}.c:{}\nmsgctxt "ctx_{}"\n'
+                'msgid "{}"\nmsgstr "{}"\n\n'.
+                format(_sentence(rnd, 4), i, i, i % 3, string, string))
+
+    return _fill(size,
+                 '# Synthetic benchmark file\nmsgid ""\nmsgstr ""\n'
+                 '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+                 '"Language: en\\n"\n'
+                 '"Plural-Forms: nplurals=2; plural=(n != 1);\\n"\n\n',
+                 '',
+                 unit)
+
+
+def generate_srt(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        seconds = i * 3
+        return ('{}\n{:02}:{:02}:{:02},000 --> {:02}:{:02}:{:02},500\n'
+                '{}\n{}\n\n'.
+                format(i + 1,
+                       seconds // 3600, seconds // 60 % 60, seconds % 60,
+                       (seconds + 2) // 3600, (seconds + 2) // 60 % 60,
+                       (seconds + 2) % 60,
+                       _sentence(rnd, 6), _sentence(rnd, 5)))
+
+    return _fill(size, '', '', unit)
+
+
+def _yaml_unit(rnd, i, indent):
+    if i % 10 == 9:
+        return ('{0}plural_{1}:\n{0}  one: {2}\n{0}  other: {3}\n'.
+                format(indent, i, _sentence(rnd, 4), _sentence(rnd, 4)))
+    elif i % 7 == 6:
+        return ('{0}group_{1}:\n'
+                '{0}  # {2}\n'
+                '{0}  title: "{3}"\n'
+                '{0}  items:\n{0}    - {4}\n{0}    - {5}\n'
+                '{0}  body: |\n{0}    {6}\n{0}    {7}\n'.
+                format(indent, i, _sentence(rnd, 4), _sentence(rnd),
+                       _sentence(rnd, 3), _sentence(rnd, 3), _sentence(rnd),
+                       _sentence(rnd)))
+    return '{}key_{}: {}\n'.format(indent, i, _sentence(rnd))
+
+
+def generate_yaml(size):
+    rnd = random.Random(size)
+    return _fill(size, '', '', lambda i: _yaml_unit(rnd, i, ''))
+
+
+def generate_yaml_i18n(size):
+    rnd = random.Random(size)
+    return _fill(size, 'en:\n', '', lambda i: _yaml_unit(rnd, i, '  '))
+
+
+def generate_plaintext(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        if i % 5 == 4:
+            return "\n"
+        return "{}.\n".format(_sentence(rnd, 12))
+
+    return _fill(size, '', '', unit)
+
+
+def generate_markdown(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        if i % 6 == 0:
+            return "## {} {}\n\n".format(_sentence(rnd, 4), i)
+        elif i % 6 == 1:
+            return "{} [{}](https://example.com/{}).\n\n".format(
+                _sentence(rnd, 12), _sentence(rnd, 2), i
+            )
+        elif i % 6 == 2:
+            return "* {}\n* {}\n* {}\n\n".format(
+                _sentence(rnd, 5), _sentence(rnd, 5), _sentence(rnd, 5)
+            )
+        elif i % 6 == 3:
+            return "> {} {}\n\n".format(_sentence(rnd, 8), i)
+        elif i % 6 == 4:
+            return "```\ncode_{} = '{}'\n```\n\n".format(i, _sentence(rnd, 3))
+        return "{} {}.\n\n".format(_sentence(rnd, 15), i)
+
+    return _fill(size,
+                 '---\ntitle: Synthetic benchmark document\n'
+                 'description: {}\n---\n\n'.format(_sentence(rnd)),
+                 '',
+                 unit)
+
+
+""" Binary formats """
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'content-types"><Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" '
+    'ContentType="application/xml"/><Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.'
+    'wordprocessingml.document.main+xml"/></Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships"><Relationship Id="rId1" Type="http://schemas.'
+    'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+DOCX_DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+    'wordprocessingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships"><w:body>'
+)
+DOCX_DOCUMENT_TAIL = '<w:sectPr/></w:body></w:document>'
+DOCX_HYPERLINK_REL = (
+    '<Relationship Id="rId{index}" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/hyperlink" '
+    'Target="https://example.com/{index}" TargetMode="External"/>'
+)
+
+
+def generate_docx(size):
+    rnd = random.Random(size)
+    hyperlinks = []
+
+    def unit(i):
+        runs = [
+            '<w:r><w:t xml:space="preserve">{} </w:t></w:r>'.format(
+                _sentence(rnd, 10)
+            ),
+            '<w:r><w:rPr><w:b/></w:rPr><w:t>{}</w:t></w:r>'.format(
+                _sentence(rnd, 3)
+            ),
+        ]
+        if i % 5 == 4:
+            index = len(hyperlinks) + 100
+            hyperlinks.append(DOCX_HYPERLINK_REL.format(index=index))
+            runs.append(
+                '<w:hyperlink r:id="rId{}"><w:r><w:t xml:space="preserve"> '
+                '{}</w:t></w:r></w:hyperlink>'.format(index, _sentence(rnd, 2))
+            )
+        runs.append('<w:r><w:t xml:space="preserve"> {}.</w:t></w:r>'.format(
+            _sentence(rnd, 6)
+        ))
+        return '<w:p>{}</w:p>'.format(''.join(runs))
+
+    document = _fill(size, DOCX_DOCUMENT_HEAD, DOCX_DOCUMENT_TAIL, unit)
+    document_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">{}</Relationships>'.format(''.join(hyperlinks))
+    )
+    return _zip([
+        ('[Content_Types].xml', DOCX_CONTENT_TYPES),
+        ('_rels/.rels', DOCX_RELS),
+        ('word/document.xml', document),
+        ('word/_rels/document.xml.rels', document_rels),
+    ])
+
+
+IDML_STORY_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<idPkg:Story xmlns:idPkg="http://ns.adobe.com/AdobeInDesign/idml/1.0/'
+    'packaging" DOMVersion="12.0">\n\t<Story Self="{story_id}">\n'
+)
+IDML_STORY_TAIL = '\t</Story>\n</idPkg:Story>\n'
+# Number of paragraphs per generated story
+IDML_STORY_LENGTH = 50
+
+
+def generate_idml(size):
+    rnd = random.Random(size)
+
+    def unit(i):
+        return (
+            '\t\t<ParagraphStyleRange AppliedParagraphStyle="ParagraphStyle/'
+            '$ID/NormalParagraphStyle">\n'
+            '\t\t\t<CharacterStyleRange AppliedCharacterStyle="CharacterStyle/'
+            '$ID/[No character style]">\n'
+            '\t\t\t\t<Content>{}</Content>\n\t\t\t\t<Br/>\n'
+            '\t\t\t\t<Content>{} &amp; {}</Content>\n'
+            '\t\t\t</CharacterStyleRange>\n\t\t</ParagraphStyleRange>\n'
+        ).format(_sentence(rnd, 10), _sentence(rnd, 3), _sentence(rnd, 3))
+
+    paragraphs = _fill(size, '', '', unit)
+    lines = paragraphs.split('\t\t<ParagraphStyleRange')[1:]
+    stories = []
+    for start in range(0, len(lines), IDML_STORY_LENGTH):
+        story_id = "u{:x}".format(0x100 + len(stories))
+        body = ''.join('\t\t<ParagraphStyleRange' + line
+                       for line in lines[start:start + IDML_STORY_LENGTH])
+        stories.append((
+            story_id,
+            IDML_STORY_HEAD.format(story_id=story_id) + body + IDML_STORY_TAIL
+        ))
+
+    designmap = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Document xmlns:idPkg="http://ns.adobe.com/AdobeInDesign/idml/1.0/'
+        'packaging" DOMVersion="12.0" Self="d" StoryList="{}">\n{}'
+        '</Document>\n'.format(
+            ' '.join(story_id for story_id, _ in stories),
+            ''.join('\t<idPkg:Story src="Stories/Story_{}.xml" />\n'.
+                    format(story_id) for story_id, _ in stories)
+        )
+    )
+    members = [
+        ('mimetype', 'application/vnd.adobe.indesign-idml-package'),
+        ('META-INF/container.xml',
+         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" '
+         'version="1.0"><rootfiles><rootfile full-path="designmap.xml" '
+         'media-type="text/xml" /></rootfiles></container>'),
+        ('designmap.xml', designmap),
+    ]
+    members.extend(('Stories/Story_{}.xml'.format(story_id), story)
+                   for story_id, story in stories)
+    return _zip(members)
+
+
+def _setup_yaml_i18n(handler):
+    handler.set_plural_rules([1, 5])
+    handler.set_lang_code('en')
+
+
+CORPORA = [
+    Corpus("KEYVALUEJSON", "openformats.formats.json:JsonHandler",
+           generate_keyvaluejson),
+    Corpus("STRUCTURED_JSON", "openformats.formats.json:StructuredJsonHandler",
+           generate_structured_json),
+    Corpus("CHROME", "openformats.formats.json:ChromeI18nHandler",
+           generate_chrome),
+    Corpus("CHROME_V3", "openformats.formats.json:ChromeI18nHandlerV3",
+           generate_chrome),
+    Corpus("ANDROID", "openformats.formats.android:AndroidHandler",
+           generate_android),
+    Corpus("BETA_ANDROID", "openformats.formats.beta_android:BetaAndroidHandler",
+           generate_android),
+    Corpus("STRINGSDICT", "openformats.formats.stringsdict:StringsDictHandler",
+           generate_stringsdict),
+    Corpus("CUSTOM_XML",
+           "openformats.formats.customizable_xml:CustomizableXMLHandler",
+           generate_custom_xml),
+    Corpus("PO", "openformats.formats.po:PoHandler", generate_po),
+    Corpus("SRT", "openformats.formats.srt:SrtHandler", generate_srt),
+    Corpus("Yaml", "openformats.formats.yaml:YamlHandler", generate_yaml),
+    Corpus("Yaml (Internationalization)",
+           "openformats.formats.yaml:I18nYamlHandler", generate_yaml_i18n,
+           setup=_setup_yaml_i18n),
+    Corpus("Plaintext", "openformats.formats.plaintext:PlaintextHandler",
+           generate_plaintext),
+    Corpus("Github_Markdown",
+           "openformats.formats.github_markdown:GithubMarkdownHandler",
+           generate_markdown),
+    Corpus("Github_Markdown_v2",
+           "openformats.formats.github_markdown_v2:GithubMarkdownHandlerV2",
+           generate_markdown),
+    Corpus("DOCX", "openformats.formats.docx:DocxHandler", generate_docx),
+    Corpus("InDesign", "openformats.formats.indesign:InDesignHandler",
+           generate_idml),
+]
+
+
+def get_corpus(name):
+    for corpus in CORPORA:
+        if corpus.name == name:
+            return corpus
+    raise KeyError(name)
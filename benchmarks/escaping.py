@@ -0,0 +1,109 @@
+"""
+Time the `escape`/`unescape` functions of the JSON handlers against a
+synthetic stringset, one string at a time and in bulk. Run with::
+
+    python -m benchmarks.escaping --count 100000
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import json
+import random
+import sys
+from timeit import default_timer
+
+from benchmarks.corpora import _sentence
+from openformats.formats.json import JsonHandler
+
+# Appended to some of the strings so that both the fast path (nothing to
+# escape) and the actual escaping are exercised
+SPECIALS = ('', '', '', '"quoted"', '\n', 'back\\slash', '\ttab', 'caf\xe9')
+
+
+def generate_strings(count, seed=0):
+    """ Return `count` deterministic strings, every 10th of them pluralized
+        (a dict of plural rules to strings).
+    """
+
+    rnd = random.Random(seed)
+    strings = []
+    for index in range(count):
+        string = _sentence(rnd) + rnd.choice(SPECIALS)
+        if index % 10 == 9:
+            string = {1: string, 5: string + ' ' + _sentence(rnd, 2)}
+        strings.append(string)
+    return strings
+
+
+def _best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def _one_by_one(func, strings):
+    def run():
+        for string in strings:
+            if isinstance(string, dict):
+                for value in string.values():
+                    func(value)
+            else:
+                func(string)
+    return run
+
+
+def run(count=100000, repeat=3, handler_class=JsonHandler):
+    """ Benchmark `escape` and `unescape` of `handler_class` on `count`
+        strings, calling them once per string and through `escape_many`/
+        `unescape_many`.
+
+        :return: a JSON serializable dictionary with the minimum timings
+    """
+
+    strings = generate_strings(count)
+    escaped = handler_class.escape_many(strings)
+    result = {'format': handler_class.name, 'count': count}
+    for name, func, many, payload in (
+            ('escape', handler_class.escape, handler_class.escape_many,
+             strings),
+            ('unescape', handler_class.unescape, handler_class.unescape_many,
+             escaped)):
+        result[name] = {
+            'one_by_one': _best_of(_one_by_one(func, payload), repeat),
+            'many': _best_of(lambda: many(payload), repeat),
+        }
+    return result
+
+
+def format_result(result):
+    return "\n".join(
+        "{:<14} {:<9} {:>7} strings  one by one {:>8.4f}s  many {:>8.4f}s".
+        format(result['format'], name, result['count'],
+               result[name]['one_by_one'], result[name]['many'])
+        for name in ('escape', 'unescape')
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark escaping/unescaping of JSON strings."
+    )
+    parser.add_argument('-c', '--count', type=int, default=100000,
+                        help="Number of strings (default: %(default)s)")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="Timed runs per function (default: "
+                             "%(default)s)")
+    args = parser.parse_args(argv)
+
+    result = run(args.count, args.repeat)
+    print(format_result(result), file=sys.stderr)
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Time `parse` and `compile` of every handler against its synthetic corpus.
+
+Timings are taken without memory tracing; peak memory is measured in a
+separate, traced run of each phase because `tracemalloc` slows the
+interpreter down considerably.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import re
+import sys
+from timeit import default_timer
+
+import six
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover, python 2
+    tracemalloc = None
+
+from benchmarks.corpora import CORPORA, get_corpus
+
+DEFAULT_SIZES = ("1KB", "100KB", "1MB")
+SIZE_PAT = re.compile(r'^\s*(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[KMG]?B?)\s*$',
+                      re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2,
+              'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+
+def parse_size(size):
+    """ Convert a human readable size ('1KB', '10MB', '512') to bytes. """
+
+    match = SIZE_PAT.match(size)
+    if not match:
+        raise ValueError("Invalid size: '{}'".format(size))
+    return int(float(match.group('number')) *
+               SIZE_UNITS[match.group('unit').upper()])
+
+
+def drop_strings(stringset, drop):
+    """ Remove every n-th string so that the compilers' section-removal code
+        is exercised; `drop` is the fraction of strings to remove.
+    """
+
+    if not drop:
+        return list(stringset)
+    step = max(int(round(1 / drop)), 1)
+    return [string for index, string in enumerate(stringset)
+            if index % step != step - 1]
+
+
+def _measure(func, traced):
+    if traced:
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    start = default_timer()
+    func()
+    return default_timer() - start
+
+
+def run_case(corpus, size, repeat=3, drop=0.0):
+    """ Benchmark one handler against one synthetic file.
+
+        :param Corpus corpus: the handler/generator pair
+        :param int size: the target size of the source file in bytes
+        :param int repeat: how many timed runs of each phase to perform
+        :param float drop: fraction of strings removed before compiling
+        :return: a JSON serializable dictionary with the results
+    """
+
+    content = corpus.generate(size)
+    if (corpus.handler_class.PROCESSES_BINARY and
+            isinstance(content, six.text_type)):
+        content = content.encode('utf-8')
+    result = {
+        'format': corpus.name,
+        'size': size,
+        'bytes': len(content if isinstance(content, six.binary_type)
+                     else content.encode('utf-8')),
+        'drop': drop,
+    }
+
+    # Parsing mutates the handler and, for PO, compiling mutates the template,
+    # so every run starts from a fresh handler and a fresh parse
+    state = {}
+
+    def parse():
+        state['template'], state['stringset'] = \
+            corpus.get_handler().parse(content)
+
+    def compile():
+        corpus.get_handler().compile(state['template'], state['to_compile'])
+
+    for phase, func in (('parse', parse), ('compile', compile)):
+        timings = []
+        for _ in range(repeat):
+            if phase == 'compile':
+                parse()
+                state['to_compile'] = drop_strings(state['stringset'], drop)
+            timings.append(_measure(func, traced=False))
+        result[phase] = {
+            'min': min(timings),
+            'mean': sum(timings) / len(timings),
+            'peak_memory': None,
+        }
+        if tracemalloc is not None:
+            if phase == 'compile':
+                parse()
+                state['to_compile'] = drop_strings(state['stringset'], drop)
+            result[phase]['peak_memory'] = _measure(func, traced=True)
+
+    result['strings'] = len(state['stringset'])
+    return result
+
+
+def run(formats=None, sizes=DEFAULT_SIZES, repeat=3, drop=0.0,
+        stream=sys.stderr):
+    """ Benchmark the requested formats (all by default) at every size. A
+        format whose handler cannot be imported or fails is reported with an
+        'error' entry instead of aborting the whole run.
+    """
+
+    corpora = [get_corpus(name) for name in formats] if formats else CORPORA
+    results = []
+    for corpus in corpora:
+        for size in sizes:
+            try:
+                result = run_case(corpus, parse_size(size), repeat, drop)
+            except Exception as e:
+                result = {'format': corpus.name, 'size': parse_size(size),
+                          'error': u"{}: {}".format(type(e).__name__, e)}
+            results.append(result)
+            if stream is not None:
+                print(format_result(result), file=stream)
+    return {
+        'openformats_version': _get_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': datetime.datetime.utcnow().isoformat(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold=1.2):
+    """ Return the (format, size, phase, ratio) tuples for which the minimum
+        time in `results` is more than `threshold` times the one in
+        `baseline`.
+    """
+
+    previous = {(result['format'], result['size']): result
+                for result in baseline['results'] if 'error' not in result}
+    regressions = []
+    for result in results['results']:
+        old = previous.get((result['format'], result['size']))
+        if 'error' in result or old is None:
+            continue
+        for phase in ('parse', 'compile'):
+            if not old[phase]['min']:
+                continue
+            ratio = result[phase]['min'] / old[phase]['min']
+            if ratio > threshold:
+                regressions.append((result['format'], result['size'], phase,
+                                    ratio))
+    return regressions
+
+
+def format_result(result):
+    if 'error' in result:
+        return u"{:<28} {:>10}  ERROR {}".format(result['format'],
+                                                 result['size'],
+                                                 result['error'])
+
+    def _memory(phase):
+        peak = result[phase]['peak_memory']
+        return "-" if peak is None else "{:.1f}MB".format(peak / 1024. ** 2)
+
+    return (u"{:<28} {:>10} {:>7} strings  parse {:>9.4f}s {:>9}  "
+            u"compile {:>9.4f}s {:>9}".format(
+                result['format'], result['bytes'], result['strings'],
+                result['parse']['min'], _memory('parse'),
+                result['compile']['min'], _memory('compile')))
+
+
+def _get_version():
+    try:
+        from openformats import __version__
+    except Exception:
+        return None
+    return __version__
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark parsing and compiling of synthetic files."
+    )
+    parser.add_argument('-f', '--formats', nargs='+', metavar='FORMAT',
+                        choices=[corpus.name for corpus in CORPORA],
+                        help="Handler names to benchmark (default: all)")
+    parser.add_argument('-s', '--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="Source file sizes, eg 1KB 10MB (default: "
+                             "%(default)s)")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="Timed runs per phase (default: %(default)s)")
+    parser.add_argument('-d', '--drop', type=float, default=0.0,
+                        help="Fraction of strings to remove before "
+                             "compiling (default: %(default)s)")
+    parser.add_argument('-o', '--output',
+                        help="Write the JSON results to this file instead of "
+                             "stdout")
+    parser.add_argument('-b', '--baseline',
+                        help="JSON results of a previous run to compare "
+                             "against; exits with 1 on regressions")
+    parser.add_argument('-t', '--threshold', type=float, default=1.2,
+                        help="Slowdown ratio that counts as a regression "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = run(args.formats, args.sizes, args.repeat, args.drop)
+    dumped = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with io.open(args.output, 'w', encoding='utf-8') as f:
+            f.write(six.text_type(dumped))
+    else:
+        print(dumped)
+
+    if args.baseline:
+        with io.open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for format_name, size, phase, ratio in regressions:
+            print(u"REGRESSION {} {} {}: {:.2f}x slower".
+                  format(format_name, size, phase, ratio), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
@@ -30,8 +30,9 @@ class AndroidHandler(Handler):
     EXTRACTS_RAW = True
 
     SPECIFIER = re.compile(ensure_unicode(
-        r'%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*(?:\d+)?'
-        r'(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?(?P<type>[diufFeEgGxXaAoscpn%])))'
+        r'%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*'
+        r'(?:[1-9]\d*)?(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?'
+        r'(?P<type>[diufFeEgGxXaAoscpn%])))'
     ))
 
     # Where to start parsing the file
@@ -361,40 +362,48 @@ class AndroidHandler(Handler):
     """ Compile Methods """
 
     def compile(self, template, stringset, is_source=True, language_info=None,
-                **kwargs):
-        resources_tag_position = template.index(self.PARSE_START)
+                ordered=True, **kwargs):
+        """Compile the template against the stringset.
+
+        By default the stringset is expected to be in the order the strings
+        appear in the template, as returned by `parse`; the first string
+        that doesn't match the next placeholder and all the strings after it
+        are left out. With `ordered=False` the strings are looked up by their
+        placeholder instead, so the stringset can be in any order and have
+        gaps.
+        """
+
+        compile_plan = kwargs.get('compile_plan')
+        if (compile_plan is None or
+                not self._is_valid_compile_plan(compile_plan, template)):
+            compile_plan = self.get_compile_plan(template)
+        resources_tag_position = compile_plan['resources_tag_position']
 
         self.transcriber = Transcriber(template[resources_tag_position:])
         source = self.transcriber.source
 
-        parsed = DumbXml(source)
-
         # Check against 'tools:locale' attribute
-        if language_info is not None and 'tools:locale' in parsed.attrib:
-            value_position, value = next((
-                (value_position, value)
-                for _, key, value_position, value in parsed.attributes
-                if key == 'tools:locale'
-            ))
+        if language_info is not None and compile_plan['locale'] is not None:
+            value_position, value = compile_plan['locale']
             self.transcriber.copy_until(value_position)
             self.transcriber.add(language_info['code'])
             self.transcriber.skip(len(value))
 
         # This is needed in case the first tag is skipped to retain
         # the file's formating
-        first_tag_position = parsed.text_position + len(parsed.text)
-        self.transcriber.copy_until(first_tag_position)
-
-        children_iterator = parsed.find_children(
-            self.STRING,
-            self.STRING_ARRAY,
-            self.STRING_PLURAL
-        )
+        self.transcriber.copy_until(compile_plan['first_tag_position'])
 
         self.is_source = is_source
-        self.stringset = iter(stringset)
+        if ordered:
+            self.strings_by_replacement = None
+            self.stringset = iter(stringset)
+        else:
+            self.strings_by_replacement = {
+                string.template_replacement: string for string in stringset
+            }
+            self.stringset = iter(())
         self.next_string = self._get_next_string()
-        for child in children_iterator:
+        for child in compile_plan['children']:
             self._compile_child(child)
 
         self.transcriber.copy_until(len(source))
@@ -403,21 +412,73 @@ class AndroidHandler(Handler):
 
         return compiled
 
+    def get_compile_plan(self, template):
+        resources_tag_position = template.index(self.PARSE_START)
+        source = Transcriber(template[resources_tag_position:]).source
+        parsed = DumbXml(source)
+
+        locale = None
+        if 'tools:locale' in parsed.attrib:
+            locale = next((
+                [value_position, value]
+                for _, key, value_position, value in parsed.attributes
+                if key == 'tools:locale'
+            ))
+
+        children_iterator = parsed.find_children(
+            self.STRING,
+            self.STRING_ARRAY,
+            self.STRING_PLURAL
+        )
+
+        return self._create_compile_plan(
+            template,
+            resources_tag_position=resources_tag_position,
+            locale=locale,
+            first_tag_position=parsed.text_position + len(parsed.text),
+            children=[self._plan_tag(child) for child in children_iterator],
+        )
+
+    def _plan_tag(self, tag):
+        """Record the properties of a tag that compiling needs in a dict, so
+            that the template doesn't have to be parsed again. Only positions
+            are recorded; the text, content and tail of the tag are read from
+            the template with `_get_text`, `_get_content` and `_get_tail`.
+        """
+        text = tag.text
+        tag_plan = {
+            'tag': tag.tag,
+            'ignore': self._should_ignore(tag),
+            'start': tag.start,
+            'end': tag.end,
+            'text_position': tag.text_position,
+            'text_end': (None if text is None
+                         else tag.text_position + len(text)),
+            'content_end': tag.content_end,
+            'tail_position': tag.tail_position,
+        }
+        if tag.tag in (self.STRING_ARRAY, self.STRING_PLURAL):
+            tag_plan['items'] = [
+                self._plan_tag(item)
+                for item in tag.find_children(self.STRING_ITEM)
+            ]
+        return tag_plan
+
     def _compile_child(self, child):
         """Do basic checks on the child and assigns the appropriate method to
             handle it based on the child's tag.
         """
 
-        if not self._should_ignore(child):
-            if child.tag == self.STRING:
+        if not child['ignore']:
+            if child['tag'] == self.STRING:
                 self._compile_string(child)
-            elif child.tag == self.STRING_ARRAY:
+            elif child['tag'] == self.STRING_ARRAY:
                 self._compile_string_array(child)
-            elif child.tag == self.STRING_PLURAL:
+            elif child['tag'] == self.STRING_PLURAL:
                 self._compile_string_plural(child)
         else:
             if self.is_source:
-                self.transcriber.copy_until(child.end)
+                self.transcriber.copy_until(child['end'])
             else:
                 self._skip_tag(child)
 
@@ -427,16 +488,17 @@ class AndroidHandler(Handler):
         It will compile the tag if matching string exists. Otherwise it will
         skip it.
         """
-        if self._should_compile(child):
-            self.transcriber.copy_until(child.text_position)
-            self.transcriber.add(self.next_string.string)
-            self.transcriber.skip_until(child.content_end)
-            self.transcriber.copy_until(child.tail_position)
+        string = self._get_string(child)
+        if string is not None:
+            self.transcriber.copy_until(child['text_position'])
+            self.transcriber.add(string.string)
+            self.transcriber.skip_until(child['content_end'])
+            self.transcriber.copy_until(child['tail_position'])
             self.transcriber.mark_section_start()
-            self.transcriber.copy_until(child.end)
+            self.transcriber.copy_until(child['end'])
             self.transcriber.mark_section_end()
             self.next_string = self._get_next_string()
-        elif not child.text:
+        elif not self._get_text(child):
             # In the case of a string-array we don't want to skip an
             # empty array element that was initially empty.
             pass
@@ -454,11 +516,11 @@ class AndroidHandler(Handler):
         :NOTE: If the `string-array` was empty to begin with it will leave it
                 as it is.
         """
-        item_iterator = list(child.find_children(self.STRING_ITEM))
+        item_iterator = child['items']
 
         # If placeholder (has no children) skip
         if len(item_iterator) == 0:
-            self.transcriber.copy_until(child.end)
+            self.transcriber.copy_until(child['end'])
             return
 
         # Check if any string matches array items
@@ -470,13 +532,13 @@ class AndroidHandler(Handler):
 
         if has_match:
             # Make sure you include the <string-array> tag
-            self.transcriber.copy_until(item_iterator[0].start)
+            self.transcriber.copy_until(item_iterator[0]['start'])
             # Compile found item nodes. Remove the rest.
             for item_tag in item_iterator:
                 self._compile_string(item_tag)
             self.transcriber.remove_section()
-            self.transcriber.add(item_iterator[-1].tail)
-            self.transcriber.copy_until(child.end)
+            self.transcriber.add(self._get_tail(item_iterator[-1]))
+            self.transcriber.copy_until(child['end'])
         else:
             # Remove the `string-array` tag
             self._skip_tag(child)
@@ -491,14 +553,15 @@ class AndroidHandler(Handler):
                 it as it is.
         """
         # If placeholder (has empty children) skip
-        if len(list(child.find_children(self.STRING_ITEM))):
+        if len(child['items']):
             return
 
-        if self._should_compile(child):
-            self.transcriber.copy_until(child.text_position)
+        string = self._get_string(child)
+        if string is not None:
+            self.transcriber.copy_until(child['text_position'])
 
-            splited_content = child.content.split(
-                self.next_string.template_replacement
+            splited_content = self._get_content(child).split(
+                string.template_replacement
             )
             start = splited_content[0]
             end = splited_content[1]
@@ -508,15 +571,15 @@ class AndroidHandler(Handler):
                 start = start.replace(end, '', 1)
                 self.transcriber.add(end)
 
-            for rule, string in six.iteritems(self.next_string.string):
+            for rule, value in six.iteritems(string.string):
                 self.transcriber.add(
                     start +
                     self.PLURAL_TEMPLATE.format(
-                        rule=self.get_rule_string(rule), string=string
+                        rule=self.get_rule_string(rule), string=value
                     ) + end
                 )
-            self.transcriber.skip_until(child.content_end)
-            self.transcriber.copy_until(child.end)
+            self.transcriber.skip_until(child['content_end'])
+            self.transcriber.copy_until(child['end'])
             self.next_string = self._get_next_string()
         else:
             self._skip_tag(child)
@@ -527,18 +590,47 @@ class AndroidHandler(Handler):
         :param child: The child to check if it should be compiled.
         :returns: True if the child should be compiled else False.
         """
-        child_content = child.content and child.content.strip() or ''
-        return (
-            self.next_string is not None and
-            self.next_string.template_replacement == child_content
-        )
+        return self._get_string(child) is not None
+
+    def _get_string(self, child):
+        """Finds the string whose placeholder is the content of the child.
+
+        :param child: The child to find the string of.
+        :returns: An openstring object or None if there is no matching
+                    string.
+        """
+        child_content = self._get_content(child)
+        child_content = child_content and child_content.strip() or ''
+        if self.strings_by_replacement is not None:
+            return self.strings_by_replacement.get(child_content)
+        if (self.next_string is not None and
+                self.next_string.template_replacement == child_content):
+            return self.next_string
+        return None
+
+    def _get_text(self, tag):
+        """The text of a planned tag (up until its first child tag)"""
+        if tag['text_end'] is None:
+            return None
+        return self.transcriber.source[tag['text_position']:tag['text_end']]
+
+    def _get_content(self, tag):
+        """All the contents of a planned tag"""
+        if tag['content_end'] is None:
+            return None
+        return self.transcriber.source[tag['text_position']:
+                                       tag['content_end']]
+
+    def _get_tail(self, tag):
+        """The text that follows a planned tag"""
+        return self.transcriber.source[tag['tail_position']:tag['end']]
 
     def _skip_tag(self, tag):
         """Skips a tag from the compilation.
 
         :param tag: The tag to be skipped.
         """
-        self.transcriber.skip_until(tag.end)
+        self.transcriber.skip_until(tag['end'])
 
     def _get_next_string(self):
         """Gets the next string from stringset itterable.
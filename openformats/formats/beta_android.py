@@ -25,8 +25,9 @@ class BetaAndroidHandler(Handler):
     EXTRACTS_RAW = False
 
     SPECIFIER = re.compile(
-        r'%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*(?:\d+)?'
-        r'(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?(?P<type>[diufFeEgGxXaAoscpn%])))'
+        r'%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*'
+        r'(?:[1-9]\d*)?(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?'
+        r'(?P<type>[diufFeEgGxXaAoscpn%])))'
     )
 
     def parse(self, content, **kwargs):
@@ -43,27 +44,27 @@ class BetaAndroidHandler(Handler):
 
         resources_tag = DumbXml(source)
         last_comment = ""
-        for tag, offset in resources_tag.find(("string-array", "string",
-                                               "plurals", DumbXml.COMMENT)):
+        for tag in resources_tag.find(("string-array", "string", "plurals",
+                                       DumbXml.COMMENT)):
             if self._should_ignore(tag):
                 last_comment = ""
                 continue
             if tag.name == DumbXml.COMMENT:
                 last_comment = tag.inner
-                self.transcriber.copy_until(offset + len(tag.content))
+                self.transcriber.copy_until(tag.end)
             elif tag.name == "string":
-                string = self._handle_string_tag(tag, offset, last_comment)
+                string = self._handle_string_tag(tag, last_comment)
                 last_comment = ""
                 if string is not None:
                     stringset.append(string)
             elif tag.name == "string-array":
-                for string in self._handle_string_array_tag(tag, offset,
+                for string in self._handle_string_array_tag(tag,
                                                             last_comment):
                     if string is not None:
                         stringset.append(string)
                 last_comment = ""
             elif tag.name == "plurals":
-                string = self._handle_plurals_tag(tag, offset, last_comment)
+                string = self._handle_plurals_tag(tag, last_comment)
                 if string is not None:
                     stringset.append(string)
                 last_comment = ""
@@ -77,7 +78,7 @@ class BetaAndroidHandler(Handler):
 
         return template, stringset
 
-    def _handle_string_tag(self, tag, offset, comment):
+    def _handle_string_tag(self, tag, comment):
         string = None
         if tag.inner.strip() != "":
             context = tag.attrs.get('product', "")
@@ -88,33 +89,29 @@ class BetaAndroidHandler(Handler):
 
         # ... <string name="foo">Hello ....
         #                        ^
-        self.transcriber.copy_until(offset + tag.inner_offset)
+        self.transcriber.copy_until(tag.inner_start)
 
         # ... ing name="foo">Hello world</stri...
         #                               ^
         if string is not None:
             self.transcriber.add(string.template_replacement)
-            self.transcriber.skip(len(tag.inner))
+            self.transcriber.skip_until(tag.inner_end)
         else:
-            self.transcriber.copy_until(offset + tag.inner_offset +
-                                        len(tag.inner))
+            self.transcriber.copy_until(tag.inner_end)
 
         # ...ello World</string>
         #                       ^
-        self.transcriber.copy_until(offset + len(tag.content))
+        self.transcriber.copy_until(tag.end)
 
         return string
 
-    def _handle_string_array_tag(self, string_array_tag, string_array_offset,
-                                 comment):
+    def _handle_string_array_tag(self, string_array_tag, comment):
         # ...ing-array>   <item>H...
         #              ^
-        self.transcriber.copy_until(string_array_offset +
-                                    string_array_tag.inner_offset)
+        self.transcriber.copy_until(string_array_tag.inner_start)
 
         context = string_array_tag.attrs.get('product', "")
-        for index, (item_tag, item_offset) in enumerate(
-                string_array_tag.find('item')):
+        for index, item_tag in enumerate(string_array_tag.find('item')):
             string = None
             if item_tag.inner.strip() != "":
                 string = OpenString(
@@ -129,47 +126,41 @@ class BetaAndroidHandler(Handler):
 
             # ... <item>Hello...
             #           ^
-            self.transcriber.copy_until(string_array_offset + item_offset +
-                                        item_tag.inner_offset)
+            self.transcriber.copy_until(item_tag.inner_start)
 
             # ...ello world</item>...
             #              ^
             if string is not None:
                 self.transcriber.add(string.template_replacement)
-                self.transcriber.skip(len(item_tag.inner))
+                self.transcriber.skip_until(item_tag.inner_end)
             else:
-                self.transcriber.copy_until(string_array_offset + item_offset +
-                                            item_tag.inner_offset)
+                self.transcriber.copy_until(item_tag.inner_start)
 
             # orld</item>   <it...
             #            ^
-            self.transcriber.copy_until(
-                string_array_offset + item_offset + item_tag.inner_offset +
-                len(item_tag.content)
-            )
+            self.transcriber.copy_until(item_tag.end)
 
         # </item>  </string-array>
         #                         ^
-        self.transcriber.copy_until(string_array_offset +
-                                    len(string_array_tag.content))
+        self.transcriber.copy_until(string_array_tag.end)
 
-    def _handle_plurals_tag(self, plurals_tag, plurals_offset, comment):
+    def _handle_plurals_tag(self, plurals_tag, comment):
         # <plurals name="foo">   <item>Hello ...
         #                     ^
-        self.transcriber.copy_until(plurals_offset + plurals_tag.inner_offset)
+        self.transcriber.copy_until(plurals_tag.inner_start)
 
-        first_item_offset = None
+        first_item_tag = None
         strings = {}
-        for item_tag, item_offset in plurals_tag.find('item'):
+        for item_tag in plurals_tag.find('item'):
             if item_tag.inner.strip() == "":
                 strings = None
                 break
 
-            first_item_offset = first_item_offset or item_offset
+            first_item_tag = first_item_tag or item_tag
 
             rule = self.get_rule_number(item_tag.attrs['quantity'])
             strings[rule] = item_tag.inner
-        last_item_tag, last_item_offset = item_tag, item_offset
+        last_item_tag = item_tag
 
         if strings is not None:
             context = plurals_tag.attrs.get('product', "")
@@ -181,21 +172,19 @@ class BetaAndroidHandler(Handler):
 
             # <plurals name="foo">   <item>Hello ...
             #                        ^
-            self.transcriber.copy_until(plurals_offset + first_item_offset)
+            self.transcriber.copy_until(first_item_tag.start)
 
             # ...</item>   </plurals>...
             #           ^
             self.transcriber.add(string.template_replacement)
-            self.transcriber.skip(last_item_offset +
-                                  len(last_item_tag.content) -
-                                  first_item_offset)
+            self.transcriber.skip_until(last_item_tag.end)
 
         else:
             string = None
 
         # ...</plurals> ...
         #              ^
-        self.transcriber.copy_until(plurals_offset + len(plurals_tag.content))
+        self.transcriber.copy_until(plurals_tag.end)
 
         return string
 
@@ -220,40 +209,30 @@ class BetaAndroidHandler(Handler):
 
         resources_tag = DumbXml(self.source)
 
-        for tag, offset in resources_tag.find(("string", "string-array",
-                                               "plurals")):
+        for tag in resources_tag.find(("string", "string-array", "plurals")):
             if self._should_ignore(tag):
+                if tag.name == "string-array":
+                    self._remove_empty_string_array(tag)
                 continue
             if tag.name == "string":
-                self._compile_string(tag, offset)
+                self._compile_string(tag)
             elif tag.name == "string-array":
-                self._compile_string_array(tag, offset)
+                self._compile_string_array(tag)
             elif tag.name == "plurals":
-                self._compile_plurals(tag, offset)
+                self._compile_plurals(tag)
         self.transcriber.copy_until(len(self.source))
+        destination = self.transcriber.get_destination()
 
-        # Lets do another pass to clear empty <string-array>s
-        self.transcriber = Transcriber(self.transcriber.get_destination())
-        self.source = self.transcriber.source
-        resources_tag = DumbXml(self.source)
-        for string_array_tag, string_array_offset in resources_tag.find(
-                "string-array"):
-            if (string_array_tag.inner and
-                    len(list(string_array_tag.find("item"))) == 0):
-                self.transcriber.copy_until(string_array_offset)
-                self.transcriber.skip(len(string_array_tag.content))
-        self.transcriber.copy_until(len(self.source))
-
-        compiled = template[:resources_tag_position] +\
-            self.transcriber.get_destination()
-
+        # Let go of the transcribed chunks before putting the whole
+        # document together
         self._stringset = None
         self._stringset_index = None
         self.transcriber = None
+        self.source = None
 
-        return compiled
+        return template[:resources_tag_position] + destination
 
-    def _compile_string(self, string_tag, string_offset):
+    def _compile_string(self, string_tag):
         try:
             next_string = self._stringset[self._stringset_index]
         except IndexError:
@@ -263,22 +242,22 @@ class BetaAndroidHandler(Handler):
             # found one to replace
             self._stringset_index += 1
 
-            self.transcriber.copy_until(string_offset +
-                                        string_tag.inner_offset)
+            self.transcriber.copy_until(string_tag.inner_start)
             self.transcriber.add(next_string.string)
-            self.transcriber.skip(len(string_tag.inner))
-            self.transcriber.copy_until(string_offset +
-                                        len(string_tag.content))
+            self.transcriber.skip_until(string_tag.inner_end)
+            self.transcriber.copy_until(string_tag.end)
 
         else:
             # didn't find it, must remove by skipping it
-            self.transcriber.copy_until(string_offset)
-            self.transcriber.skip(len(string_tag.content))
-
-    def _compile_string_array(self, string_array_tag, string_array_offset):
-        self.transcriber.copy_until(string_array_offset +
-                                    string_array_tag.inner_offset)
-        for item_tag, item_offset in string_array_tag.find("item"):
+            self.transcriber.copy_until(string_tag.start)
+            self.transcriber.skip_until(string_tag.end)
+
+    def _compile_string_array(self, string_array_tag):
+        self.transcriber.copy_until(string_array_tag.start)
+        self.transcriber.mark_section_start()
+        self.transcriber.copy_until(string_array_tag.inner_start)
+        has_items = False
+        for item_tag in string_array_tag.find("item"):
             try:
                 next_string = self._stringset[self._stringset_index]
             except IndexError:
@@ -287,22 +266,36 @@ class BetaAndroidHandler(Handler):
                     next_string.template_replacement == item_tag.inner):
                 # found one to replace
                 self._stringset_index += 1
+                has_items = True
 
-                self.transcriber.copy_until(string_array_offset + item_offset +
-                                            item_tag.inner_offset)
+                self.transcriber.copy_until(item_tag.inner_start)
                 self.transcriber.add(next_string.string)
-                self.transcriber.skip(len(item_tag.inner))
-                self.transcriber.copy_until(string_array_offset + item_offset +
-                                            len(item_tag.content))
+                self.transcriber.skip_until(item_tag.inner_end)
+                self.transcriber.copy_until(item_tag.end)
 
             else:
                 # didn't find it, must remove by skipping it
-                self.transcriber.copy_until(string_array_offset + item_offset)
-                self.transcriber.skip(len(item_tag.content))
-        self.transcriber.copy_until(string_array_offset +
-                                    len(string_array_tag.content))
+                self.transcriber.copy_until(item_tag.start)
+                self.transcriber.skip_until(item_tag.end)
+        self.transcriber.copy_until(string_array_tag.end)
+        self.transcriber.mark_section_end()
+
+        if string_array_tag.inner and not has_items:
+            # All items were removed, remove the <string-array> as well,
+            # unless it was empty to begin with
+            self.transcriber.remove_section()
+
+    def _remove_empty_string_array(self, string_array_tag):
+        """Remove a <string-array> that is skipped by the compiler if it has
+        no items, unless it is completely empty; it is removed just like the
+        arrays that lose all their items.
+        """
+        if (string_array_tag.inner and
+                next(string_array_tag.find("item"), None) is None):
+            self.transcriber.copy_until(string_array_tag.start)
+            self.transcriber.skip_until(string_array_tag.end)
 
-    def _compile_plurals(self, plurals_tag, plurals_offset):
+    def _compile_plurals(self, plurals_tag):
         try:
             next_string = self._stringset[self._stringset_index]
         except IndexError:
@@ -316,15 +309,19 @@ class BetaAndroidHandler(Handler):
             is_multiline = True
             indent_length = tail_length = 0
             try:
-                hash_position = plurals_offset + plurals_tag.inner_offset +\
-                    plurals_tag.inner.index(next_string.template_replacement)
-                indent_length = self.source[hash_position::-1].\
-                    index('\n') - 1
+                hash_position = self.source.index(
+                    next_string.template_replacement,
+                    plurals_tag.inner_start, plurals_tag.inner_end
+                )
+                line_start = self.source.rindex('\n', 0,
+                                                hash_position + 1) + 1
+                indent_length = hash_position - line_start
                 indent = self.source[hash_position -
                                      indent_length:hash_position]
                 end_of_hash = (hash_position +
                                len(next_string.template_replacement))
-                tail_length = self.source[end_of_hash:].index('\n')
+                tail_length = (self.source.index('\n', end_of_hash) -
+                               end_of_hash)
                 tail = self.source[end_of_hash:end_of_hash + tail_length]
             except ValueError:
                 is_multiline = False
@@ -363,11 +360,9 @@ class BetaAndroidHandler(Handler):
                                       tail_length)
 
             # finish up by copying until the end of </plurals>
-            self.transcriber.copy_until(plurals_offset +
-                                        len(plurals_tag.content))
+            self.transcriber.copy_until(plurals_tag.end)
 
         else:
             # didn't find it, must remove by skipping it
-            self.transcriber.copy_until(plurals_offset)
-            self.transcriber.skip_until(plurals_offset +
-                                        len(plurals_tag.content))
+            self.transcriber.copy_until(plurals_tag.start)
+            self.transcriber.skip_until(plurals_tag.end)
@@ -1,17 +1,285 @@
 import itertools
-import os
-import tempfile
-import uuid
+import posixpath
 import six
 import io
 import re
-import shutil
 
-from bs4 import BeautifulSoup
-from zipfile import ZipFile, ZIP_DEFLATED
+from lxml import etree
+from zipfile import ZipFile
 
 from openformats.strings import OpenString
 from openformats.handlers import Handler
+from openformats.utils.zip import rewrite_zip
+
+WORD_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+XML_DECLARATION = u'<?xml version="1.0" encoding="utf-8"?>\n'
+# Text that consists only of these characters is collapsed
+XML_WHITESPACE = u' \n\t\x0c\r'
+
+
+def _collapse_whitespace(text):
+    if text is None or text.strip(XML_WHITESPACE):
+        return text
+    return u'\n' if u'\n' in text else u' '
+
+
+def _escape(text):
+    return text.replace(u'&', u'&amp;').replace(u'<', u'&lt;').\
+        replace(u'>', u'&gt;')
+
+
+def _quote_attribute(value):
+    value = _escape(value)
+    if u'"' not in value:
+        return u'"{}"'.format(value)
+    if u"'" not in value:
+        return u"'{}'".format(value)
+    return u'"{}"'.format(value.replace(u'"', u'&quot;'))
+
+
+def _remove(element):
+    """ Remove an element from its parent, keeping the text that follows it
+        in place.
+    """
+    parent = element.getparent()
+    if element.tail:
+        previous = element.getprevious()
+        if previous is None:
+            parent.text = (parent.text or u'') + element.tail
+        else:
+            previous.tail = (previous.tail or u'') + element.tail
+    parent.remove(element)
+
+
+@six.python_2_unicode_compatible
+class DocxXml(object):
+    """
+    An lxml tree of an XML part of a .docx file
+
+    Templates used to be produced with BeautifulSoup's 'xml' builder, so the
+    tree is normalized and serialized exactly the way BeautifulSoup did it,
+    and templates of both kinds stay interchangeable:
+        * text that consists only of whitespace is collapsed to a newline, if
+          it contains one, or to a single space
+        * attributes and namespace declarations are sorted by name
+        * elements and attributes get the prefix that was declared last
+          for their namespace
+        * elements without any content are self-closing
+        * the XML declaration is replaced by
+          `<?xml version="1.0" encoding="utf-8"?>`
+        * entities are never resolved, not even those the document declares
+          itself; references to them are dropped
+    """
+    def __init__(self, content):
+        # The namespace declarations of each element, in document order
+        self.__declarations = {}
+        declarations = []
+        events = etree.iterparse(
+            io.BytesIO(content.encode('utf-8')), events=('start-ns', 'start'),
+            encoding='utf-8', recover=True, strip_cdata=False,
+            resolve_entities=False, no_network=True
+        )
+        for event, value in events:
+            if event == 'start-ns':
+                declarations.append(value)
+            elif declarations:
+                self.__declarations[value] = declarations
+                declarations = []
+        self.root = events.root
+        self.__doctype = self.__get_doctype(
+            self.root.getroottree().docinfo.internalDTD
+        )
+
+        for entity in list(self.root.iter(etree.Entity)):
+            _remove(entity)
+
+        for node in itertools.chain(self.root.iter(),
+                                    self.root.itersiblings(preceding=True),
+                                    self.root.itersiblings()):
+            if node.tag is etree.Comment or \
+                    isinstance(node.tag, six.string_types):
+                text = node.text
+                collapsed = _collapse_whitespace(text)
+                if collapsed is not text:
+                    node.text = collapsed
+            tail = node.tail
+            collapsed = _collapse_whitespace(tail)
+            if collapsed is not tail:
+                node.tail = collapsed
+
+    @staticmethod
+    def __get_doctype(dtd):
+        if dtd is None:
+            return None
+        doctype = dtd.name
+        if dtd.external_id:
+            doctype += u' PUBLIC "{}"'.format(dtd.external_id)
+            if dtd.system_url:
+                doctype += u' "{}"'.format(dtd.system_url)
+        elif dtd.system_url:
+            doctype += u' SYSTEM "{}"'.format(dtd.system_url)
+        return u'<!DOCTYPE {}>'.format(doctype)
+
+    def __str__(self):
+        chunks = [XML_DECLARATION]
+        write = chunks.append
+        if self.__doctype:
+            write(self.__doctype + u'\n')
+        siblings = list(self.root.itersiblings(preceding=True))
+        for node in reversed(siblings):
+            self.__write(node, None, None, write)
+        self.__write(self.root, {XML_NAMESPACE: u'xml'}, {}, write)
+        for node in self.root.itersiblings():
+            self.__write(node, None, None, write)
+        return u''.join(chunks)
+
+    def __write(self, node, prefixes, names, write):
+        tag = node.tag
+        if tag is etree.Comment:
+            write(u'<!--{}-->'.format(node.text))
+            return
+        if tag is etree.PI:
+            write(u'<?{} {}?>'.format(node.target, node.text or u''))
+            return
+
+        attributes = []
+        declarations = self.__declarations.get(node)
+        if declarations:
+            prefixes, names = dict(prefixes), {}
+            for prefix, namespace in declarations:
+                prefixes[namespace] = prefix
+                attributes.append(
+                    (u'xmlns:' + prefix if prefix else u'xmlns', namespace)
+                )
+        for key, value in node.items():
+            name = names.get(key)
+            if name is None:
+                name = names[key] = self.__get_name(key, prefixes)
+            attributes.append((name, value))
+        attributes.sort()
+        name = names.get(tag)
+        if name is None:
+            name = names[tag] = self.__get_name(tag, prefixes)
+
+        opening = u''.join([u'<', name] + [
+            u' {}={}'.format(key, _quote_attribute(value))
+            for key, value in attributes
+        ])
+        if node.text is None and len(node) == 0:
+            write(opening + u'/>')
+            return
+        write(opening + u'>')
+        if node.text:
+            write(_escape(node.text))
+        for child in node:
+            self.__write(child, prefixes, names, write)
+            if child.tail:
+                write(_escape(child.tail))
+        write(u'</{}>'.format(name))
+
+    @staticmethod
+    def __get_name(tag, prefixes):
+        if not tag.startswith('{'):
+            return tag
+        namespace, name = tag[1:].split('}', 1)
+        prefix = prefixes.get(namespace)
+        return u'{}:{}'.format(prefix, name) if prefix else name
+
+    def get_tag(self, prefix, name):
+        """ Return the lxml tag of the `prefix:name` elements """
+        namespace = self.root.nsmap.get(prefix)
+        if namespace is None and prefix == 'w':
+            namespace = WORD_NAMESPACE
+        return '{{{}}}{}'.format(namespace, name)
+
+    def index(self, attribute):
+        """
+        Return a dict from the values of `attribute` to the first element
+        that has each value. The first element without the attribute is
+        indexed under None.
+        """
+        index = {}
+        for element in self.root.iter(etree.Element):
+            index.setdefault(element.get(attribute), element)
+        return index
+
+    @staticmethod
+    def get_text(element):
+        """ Return the text in an element, without its comments """
+        if len(element) == 0:
+            return element.text or u''
+        return u''.join(element.xpath('.//text()'))
+
+
+class TranslationStrings(object):
+    """
+    A parser target that collects the strings of a translation like
+    BeautifulSoup's `find_all(text=True)` would, comments and processing
+    instructions included. Each string comes with the `href` of the closest
+    element around it that has one.
+
+    A parser target sees malformed markup the same way BeautifulSoup did, so
+    translations with broken tags are split exactly as before:
+
+        >>> TranslationStrings().parse(u'<tx href="a">b</tx> c')
+        [(u'b', u'a'), (u' c', None)]
+
+    The same instance, and parser, can be used for many translations.
+    """
+    def __init__(self):
+        self.__parser = etree.XMLParser(target=self, recover=True,
+                                        strip_cdata=False,
+                                        resolve_entities=False,
+                                        no_network=True)
+        self.__reset()
+
+    def __reset(self):
+        self.__strings = []
+        self.__data = []
+        self.__hrefs = [None]
+
+    def parse(self, translation):
+        try:
+            self.__parser.feed(u'<wrapper>{}</wrapper>'.format(translation))
+            return self.__parser.close()
+        except etree.XMLSyntaxError:
+            self.__reset()
+            return []
+
+    def start(self, tag, attributes, nsmap=None):
+        self.__flush()
+        href = attributes.get('href')
+        self.__hrefs.append(self.__hrefs[-1] if href is None else href)
+
+    def end(self, tag):
+        self.__flush()
+        self.__hrefs.pop()
+
+    def data(self, data):
+        self.__data.append(data)
+
+    def comment(self, text):
+        self.__flush()
+        self.__data.append(text)
+        self.__flush()
+
+    def pi(self, target, data=None):
+        self.__flush()
+        self.__data.append(u'{} {}'.format(target, data or u''))
+        self.__flush()
+
+    def close(self):
+        self.__flush()
+        strings = self.__strings
+        self.__reset()
+        return strings
+
+    def __flush(self):
+        if self.__data:
+            self.__strings.append((_collapse_whitespace(u''.join(self.__data)),
+                                 self.__hrefs[-1]))
+            self.__data = []
 
 
 class DocxFile(object):
@@ -83,85 +351,61 @@ class DocxFile(object):
     ```
     """
     def __init__(self, content):
-        self.__tmp_folder = "{}/{}".format(
-            tempfile.gettempdir(), uuid.uuid4().hex
-        )
-        os.mkdir(self.__tmp_folder)
-
-        docx_path = '{}/{}.docx'.format(self.__tmp_folder, 'in')
-        with io.open(docx_path, 'wb') as f:
-            f.write(content)
-
-        with ZipFile(docx_path, 'r') as z:
-            z.extractall(self.__tmp_folder)
-
-        self.__filelist = z.namelist()
-
-        os.remove(docx_path)
+        self.__content = content
+        self.__zipfile = ZipFile(io.BytesIO(content), 'r')
+        # The members that were modified, by name
+        self.__replacements = {}
 
-        base_rels_path = '{}/{}'.format(self.__tmp_folder, '_rels/.rels')
-        with io.open(base_rels_path, 'r') as f:
-            base_rels = f.read()
+        base_rels = DocxXml(self.__read_text('_rels/.rels'))
 
         document_relative_path = next(
-            relationship for relationship in BeautifulSoup(base_rels, 'xml').find_all(
-                attrs={'Target': True}
-            ) if relationship.attrs.get('Type').endswith('/officeDocument')
-        ).attrs['Target']
+            relationship for relationship in base_rels.root.iter(etree.Element)
+            if relationship.get('Target') is not None and
+            relationship.get('Type').endswith('/officeDocument')
+        ).get('Target').lstrip('/')
 
-        self.__document_path = '{}/{}'.format(
-            self.__tmp_folder, document_relative_path
-        )
+        self.__document_path = document_relative_path
         self.__document = None
 
-        document_folder, document_file = os.path.split(document_relative_path)
-        self.__document_rels_path = '{}/{}/_rels/{}.rels'.format(
-            self.__tmp_folder, document_folder, document_file
+        document_folder, document_file = posixpath.split(document_relative_path)
+        self.__document_rels_path = posixpath.join(
+            document_folder, '_rels', '{}.rels'.format(document_file)
         )
         self.__document_rels = None
 
+    def __read_text(self, filename):
+        # Decode like a file opened in text mode would, newlines included
+        return io.TextIOWrapper(io.BytesIO(self.__zipfile.read(filename)),
+                                encoding='utf-8').read()
+
     def get_document(self):
         if self.__document is None:
-            with io.open(self.__document_path, 'r') as f:
-                self.__document = f.read()
+            self.__document = self.__read_text(self.__document_path)
 
         return self.__document
 
     def set_document(self, document):
         self.__document = document
-
-        with io.open(self.__document_path, 'w') as f:
-            f.write(document)
+        self.__replacements[self.__document_path] = document.encode('utf-8')
 
     def get_document_rels(self):
         if self.__document_rels is None:
-            with io.open(self.__document_rels_path, 'r') as f:
-                self.__document_rels = f.read()
+            self.__document_rels = self.__read_text(self.__document_rels_path)
 
         return self.__document_rels
 
     def set_document_rels(self, document_rels):
         self.__document_rels = document_rels
-
-        with io.open(self.__document_rels_path, 'w') as f:
-            f.write(document_rels)
+        self.__replacements[self.__document_rels_path] = \
+            document_rels.encode('utf-8')
 
     def compress(self):
-        docx_path = '{}/{}.docx'.format(self.__tmp_folder, 'out')
-
-        with ZipFile(docx_path, "w", compression=ZIP_DEFLATED) as z:
-            for filename in self.__filelist:
-                z.write(os.path.join(self.__tmp_folder, filename), filename)
-
-        with io.open(docx_path, 'rb') as f:
-            result = f.read()
-
-        os.remove(docx_path)
-
-        return result
+        # Only the modified members are compressed again
+        return rewrite_zip(self.__content, self.__replacements)
 
     def delete(self):
-        shutil.rmtree(self.__tmp_folder)
+        # Everything is kept in memory, there is nothing to clean up
+        pass
 
 
 class DocxHandler(Handler):
@@ -170,28 +414,35 @@ class DocxHandler(Handler):
     name = "DOCX"
 
     @classmethod
-    def get_hyperlink_url(cls, element, document_rels):
-        run_parent = element.find_parent('w:r').parent
-
-        if run_parent.name == 'hyperlink':
-            rel = document_rels.find(
-                attrs={"Id": run_parent.attrs.get('r:id')}
-            )
-            if rel and rel.attrs.get('TargetMode') == 'External':
-                return rel.attrs['Target']
+    def get_hyperlink_relationship(cls, element, relationships):
+        run = next(element.iterancestors(
+            '{{{}}}r'.format(etree.QName(element).namespace)
+        ), None)
+        run_parent = run.getparent() if run is not None else None
+
+        if run_parent is not None and \
+                etree.QName(run_parent).localname == 'hyperlink':
+            rel = relationships.get(run_parent.get(
+                '{{{}}}id'.format(run_parent.nsmap.get('r'))
+            ))
+            if rel is not None and rel.get('TargetMode') == 'External':
+                return rel
 
         return None
 
     @classmethod
-    def set_hyperlink_url(cls, element, document_rels, url):
-        run_parent = element.find_parent('w:r').parent
+    def get_hyperlink_url(cls, element, relationships):
+        rel = cls.get_hyperlink_relationship(element, relationships)
+        if rel is not None:
+            return rel.get('Target')
 
-        if run_parent.name == 'hyperlink':
-            rel = document_rels.find(
-                attrs={"Id": run_parent.attrs.get('r:id')}
-            )
-            if rel and rel.attrs['TargetMode'] == 'External':
-                rel.attrs['Target'] = url
+        return None
+
+    @classmethod
+    def set_hyperlink_url(cls, element, relationships, url):
+        rel = cls.get_hyperlink_relationship(element, relationships)
+        if rel is not None:
+            rel.set('Target', url)
 
     def parse(self, content, **kwargs):
         """
@@ -209,14 +460,17 @@ class DocxHandler(Handler):
         """
         docx = DocxFile(content)
 
-        soup = BeautifulSoup(docx.get_document(), 'xml')
-        rels_soup = BeautifulSoup(docx.get_document_rels(), 'xml')
+        document = DocxXml(docx.get_document())
+        document_rels = DocxXml(docx.get_document_rels())
+        # Relationships by id, for the hyperlinks
+        relationships = document_rels.index('Id')
+        text_tag = document.get_tag('w', 't')
 
         stringset = []
         order = itertools.count()
-        for paragraph in soup.find_all('w:p'):
+        for paragraph in document.root.iter(document.get_tag('w', 'p')):
             paragraph_text = []
-            text_elements =  paragraph.find_all('w:t')
+            text_elements = list(paragraph.iter(text_tag))
             if not text_elements:
                 continue
 
@@ -225,7 +479,7 @@ class DocxHandler(Handler):
             open_hyperlink = None
             leading_spaces = 0
             for index, text_element in enumerate(text_elements):
-                text = text_element.text
+                text = document.get_text(text_element)
                 # skip text elements that contain no text
                 # and prepend leading whitespace to the next string
                 if not text.strip():
@@ -236,7 +490,7 @@ class DocxHandler(Handler):
                     leading_spaces = 0
 
                 hyperlink_url = self.get_hyperlink_url(
-                    text_element, rels_soup
+                    text_element, relationships
                 )
 
                 if all([
@@ -291,12 +545,11 @@ class DocxHandler(Handler):
             )
 
             stringset.append(open_string)
-            paragraph.attrs['txid'] = open_string.string_hash
+            paragraph.set('txid', open_string.string_hash)
 
-        docx.set_document(six.text_type(soup))
+        docx.set_document(six.text_type(document))
 
         template = docx.compress()
-        docx.delete()
         return template, stringset
 
     def compile(self, template, stringset, **kwargs):
@@ -304,15 +557,20 @@ class DocxHandler(Handler):
             string.string_hash: string for string in stringset
         }
         docx = DocxFile(template)
-        soup = BeautifulSoup(docx.get_document(), 'xml')
-        rels_soup = BeautifulSoup(docx.get_document_rels(), 'xml')
-
-        for paragraph in soup.find_all('w:p'):
-            text_elements =  paragraph.find_all('w:t')
+        document = DocxXml(docx.get_document())
+        document_rels = DocxXml(docx.get_document_rels())
+        # Relationships by id, for the hyperlinks
+        relationships = document_rels.index('Id')
+        text_tag = document.get_tag('w', 't')
+        hyperlink_tag = document.get_tag('w', 'hyperlink')
+        translation_strings = TranslationStrings()
+
+        for paragraph in list(document.root.iter(document.get_tag('w', 'p'))):
+            text_elements = list(paragraph.iter(text_tag))
             if not text_elements:
                 continue
 
-            txid = paragraph.attrs.get('txid')
+            txid = paragraph.get('txid')
 
             if not txid:
                 continue
@@ -322,14 +580,12 @@ class DocxHandler(Handler):
 
             translation = stringset[txid].string
 
-            translation_soup = BeautifulSoup(
-                u'<wrapper>{}</wrapper>'.format(translation), 'xml'
-            ).find_all(text=True)
+            translation_parts = translation_strings.parse(translation)
 
             leading_spaces = 0
 
             for index, text_element in enumerate(text_elements):
-                text = six.text_type(text_element.text)
+                text = document.get_text(text_element)
                 # detect text elements that contain no text
                 # and remove leading whitespace from the next string 
                 if not text.strip():
@@ -337,19 +593,25 @@ class DocxHandler(Handler):
                     continue
                 else:
                     hyperlink_url = self.get_hyperlink_url(
-                        text_element, rels_soup
+                        text_element, relationships
                     )
                     # the text parts of the translation are less that the
                     # text parts of the document, so we will just remove
                     # any excessing part from the document
-                    if len(translation_soup) == 0:
-                        if hyperlink_url:
-                            text_element.find_parent('w:hyperlink').decompose()
+                    if len(translation_parts) == 0:
+                        hyperlink = next(
+                            text_element.iterancestors(hyperlink_tag), None
+                        )
+                        if hyperlink_url and hyperlink is not None:
+                            _remove(hyperlink)
+                            # its remaining text elements are left empty
+                            for element in hyperlink.iter(text_tag):
+                                element.text = None
+                                del element[:]
                         else:
-                            text_element.decompose()
+                            _remove(text_element)
                         continue
-                    translation_part = translation_soup.pop(0)
-                    translation = six.text_type(translation_part)
+                    translation, href = translation_parts.pop(0)
                     if not translation[:leading_spaces].strip():
                         translation = translation[leading_spaces:]
                     leading_spaces = 0
@@ -358,10 +620,9 @@ class DocxHandler(Handler):
                 # the text parts of the translation are more that the
                 # text parts of the document, so we will compress the 
                 # remaining translation parts into one string
-                if index == len(text_elements) - 1 and len(translation_soup) > 0:
-                    translation = "".join(
-                        [translation] +
-                        [six.text_type(t) for t in translation_soup]
+                if index == len(text_elements) - 1 and len(translation_parts) > 0:
+                    translation = u"".join(
+                        [translation] + [t for t, _ in translation_parts]
                     )
 
                
@@ -369,17 +630,14 @@ class DocxHandler(Handler):
                     # attempt to find a parent containing `href` attribute
                     # in order to extract the potential modified url.
                     self.set_hyperlink_url(
-                        text_element, rels_soup,
-                        getattr(translation_part.find_parent(
-                            attrs={'href': True}
-                        ), 'attrs', {}).get('href', hyperlink_url)
+                        text_element, relationships,
+                        hyperlink_url if href is None else href
                     )
-                text_element.clear()
-                text_element.insert(0, translation)
-        
-        docx.set_document(six.text_type(soup))
-        docx.set_document_rels(six.text_type(rels_soup))
+                del text_element[:]
+                text_element.text = translation
+
+        docx.set_document(six.text_type(document))
+        docx.set_document_rels(six.text_type(document_rels))
 
         result = docx.compress()
-        docx.delete()
         return result
\ No newline at end of file
@@ -12,6 +12,69 @@ from ..strings import OpenString
 from ..utils.compilers import OrderedCompilerMixin
 from ..utils.newlines import find_newline_type, force_newline_type
 
+WHITESPACE_PAT = re.compile(ensure_unicode(r'\s*'))
+YAML_SEPARATOR = ensure_unicode('\n---')
+
+
+def split_yaml_header(content):
+    """
+    Find the YAML front matter at the beginning of `content`.
+
+    This returns exactly what matching
+    `^(---\\s+)([\\s\\S]*?[^`]\\s*)(\\n---\\s+)(?!-)` against `content` would
+    return as its 3 groups, or None if there is no front matter. A regular
+    expression like this one needs quadratic time on long runs of whitespace,
+    which is why the separators are looked up with a single forward scan
+    instead.
+
+    :param content: the markdown content
+    :return: a (opening, header, separator) tuple or None
+    """
+    if not content.startswith('---'):
+        return None
+    header_start = WHITESPACE_PAT.match(content, 3).end()
+    if header_start == 3:
+        return None
+
+    # The header ends with a non-backtick character and whitespace that ends
+    # in the newline of a `\n---<whitespace>` separator. If there is more
+    # whitespace before that newline, the header can always end in it so only
+    # a backtick right before the newline disqualifies a separator
+    position = content.find(YAML_SEPARATOR, header_start + 1)
+    while position != -1:
+        separator_end = _find_yaml_separator_end(content, position)
+        if separator_end is not None and content[position - 1] != '`':
+            return (content[:header_start],
+                    content[header_start:position],
+                    content[position:separator_end])
+        position = content.find(YAML_SEPARATOR, position + 1)
+
+    # Otherwise the header can only consist of the last whitespace character
+    # of the opening, given the opening is followed by the separator
+    position = header_start - 1
+    if header_start >= 6 and content[position] == '\n' and \
+            content.startswith('---', header_start):
+        separator_end = _find_yaml_separator_end(content, position)
+        if separator_end is not None:
+            return (content[:position - 1], content[position - 1:position],
+                    content[position:separator_end])
+    return None
+
+
+def _find_yaml_separator_end(content, position):
+    """
+    Return where the `\\n---\\s+(?!-)` separator found at `position` ends,
+    or None if the `\\n---` there is not followed by a valid one.
+    """
+    start = position + len(YAML_SEPARATOR)
+    end = WHITESPACE_PAT.match(content, start).end()
+    if end < len(content) and content[end] == '-':
+        # `\s+(?!-)` gives back the last whitespace character instead
+        end -= 1
+    if end <= start:
+        return None
+    return end
+
 
 def string_handler(token, template):
     """
@@ -199,14 +262,11 @@ class GithubMarkdownHandler(OrderedCompilerMixin, Handler):
         template = content
         stringset = []
 
-        yml_header = re.match(
-            ensure_unicode(r'^(---\s+)([\s\S]*?[^`])\s*(\n---\s+)(?!-)'),
-            content
-        )
+        yml_header = split_yaml_header(content)
         yaml_header_content = ''
         yaml_stringset = []
         if yml_header:
-            yaml_header_content = yml_header.group()
+            yaml_header_content = ''.join(yml_header)
             md_content = content[len(yaml_header_content):]
             yaml_stringset = self.yaml_parser(yaml_header_content)
         else:
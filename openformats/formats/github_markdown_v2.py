@@ -7,7 +7,9 @@ import six
 from mistune import Markdown
 from yaml.reader import Reader
 
-from openformats.formats.github_markdown import TxBlockLexer, string_handler
+from openformats.formats.github_markdown import (TxBlockLexer,
+                                                split_yaml_header,
+                                                string_handler)
 from openformats.formats.yaml import YamlHandler
 from openformats.utils.compat import ensure_unicode
 
@@ -45,6 +47,8 @@ class GithubMarkdownHandlerV2(OrderedCompilerMixin, Handler):
         # assume stringset is ordered within the template
         transcriber = Transcriber(template)
         template = transcriber.source
+        placeholders = self._get_placeholders(template,
+                                              kwargs.get('compile_plan'))
 
         for openstring in stringset:
             tr_string = openstring.string
@@ -52,7 +56,9 @@ class GithubMarkdownHandlerV2(OrderedCompilerMixin, Handler):
                 self._escape_invalid_chars(openstring)
                 tr_string = self._transform_yaml_string(openstring)
 
-            hash_position = template.index(openstring.template_replacement)
+            hash_position = self._find_placeholder(
+                template, placeholders, openstring.template_replacement
+            )
             transcriber.copy_until(hash_position)
             transcriber.add(tr_string)
             transcriber.skip(len(openstring.template_replacement))
@@ -75,18 +81,15 @@ class GithubMarkdownHandlerV2(OrderedCompilerMixin, Handler):
 
         stringset = []
 
-        yml_header = re.match(
-            ensure_unicode(r'^(---\s+)([\s\S]*?[^`]\s*)(\n---\s+)(?!-)'),
-            content
-        )
+        yml_header = split_yaml_header(content)
         yaml_header_content = ''
         yaml_stringset = []
         yaml_template = ''
         seperator = ''
 
         if yml_header:
-            yaml_header_content = ''.join(yml_header.group(1, 2))
-            seperator = yml_header.group(3)
+            opening, header, seperator = yml_header
+            yaml_header_content = opening + header
             md_content = content[len(yaml_header_content + seperator):]
             yaml_template, yaml_stringset = YamlHandler().parse(
                 yaml_header_content
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 import io
+import multiprocessing
 import re
 import unicodedata
 from itertools import count
@@ -12,6 +13,7 @@ from openformats.handlers import Handler
 from openformats.strings import OpenString
 from openformats.transcribers import Transcriber
 from openformats.utils.compat import ensure_unicode
+from openformats.utils.zip import rewrite_zip
 from ucf import UCF
 
 
@@ -35,42 +37,52 @@ class InDesignHandler(Handler):
     SPECIAL_CHARACTERS_REGEX = re.compile(
         ensure_unicode(r'<\?ACE \d+\?>|<Br/>;')
     )
+    HASH_REGEX = re.compile(ensure_unicode(r'[a-z,0-9]{32}_tr'))
 
     """ Parse Methods """
 
     def __init__(self, *args, **kwargs):
         self.order = count()
         self.stringset = []
+        # The strings to compile, by their template replacement
+        self.translations = {}
         super(InDesignHandler, self).__init__(*args, **kwargs)
 
-    def parse(self, content, **kwargs):
+    def parse(self, content, workers=None, pool=None, **kwargs):
         """ Parses .idml file content and returns the resource template and
             stringset.
             * Use UCF to unpack `content` to xml fragments
             * Parse all Story fragments to extract the translatable strings
               and replace them with a replacement hash
-            * Pack the fragments back to create the template
+            * Pack the modified fragments back into `content` to create the
+              template
             * Return the (template, stringset) tuple
+
+            The stories can be searched for strings in parallel, by a new
+            pool of `workers` processes or by an existing `pool` (see
+            `_map_stories`). The strings are still numbered in story order,
+            so the result is the same either way.
         """
 
         idml = UCF(io.BytesIO(content))
-        ordered_stories = self._get_ordered_stories(idml)
+        keys, stories = self._get_stories(idml)
+        replacements = {}
 
-        # Iterate over the contents of the IDML file
-        for key in ordered_stories:
-            try:
-                # No matter what, idml values are bytes
-                story_content = idml[key].decode('utf8')
-            except KeyError:
-                continue
-            story_content = self._find_and_replace(story_content)
+        story_parts = self._map_stories(
+            '_split_story', [(story.decode('utf-8'), ) for story in stories],
+            workers, pool
+        )
+        for key, story, parts in zip(keys, stories, story_parts):
+            story_content = self._replace_strings(parts)
 
             # Update the XML file to contain the template strings
-            idml[key] = story_content.encode('utf-8')
+            story_content = story_content.encode('utf-8')
+            if story_content != story:
+                replacements[key] = story_content
 
-        out = io.BytesIO()
-        idml.save(out)
-        template = out.getvalue()
+        # Members that were not modified are copied without being
+        # recompressed
+        template = rewrite_zip(content, replacements)
 
         return template, self.stringset
 
@@ -98,9 +110,64 @@ class InDesignHandler(Handler):
             k for k in six.iterkeys(idml)
             if k.startswith('Stories') or k == BACKING_STORY
         }
-        story_keys.extend(all_stories - set(story_keys))
+        story_keys.extend(sorted(all_stories - set(story_keys)))
         return story_keys
 
+    def _get_stories(self, idml):
+        """ Return the keys of the stories that exist in `idml`, in the
+        order of `_get_ordered_stories`, and their (bytes) contents.
+        """
+        keys, stories = [], []
+        for key in self._get_ordered_stories(idml):
+            try:
+                stories.append(idml[key])
+            except KeyError:
+                continue
+            keys.append(key)
+        return keys, stories
+
+    def _map_stories(self, method, arguments, workers=None, pool=None):
+        """ Call `method` once for every tuple in `arguments` and return
+        the results in the same order.
+
+        The calls are made in parallel if `_in_parallel` says so, either by
+        `pool`, anything with a `map(function, iterable)` method such as a
+        `multiprocessing.Pool` or a `concurrent.futures` executor, or by a
+        pool of `workers` processes that is started for this call only.
+        Starting the processes takes time, so callers that handle many files
+        should pass a pool they keep around instead. Each call is made on a
+        new handler, so the method must not touch the state of `self`.
+        """
+        if not self._in_parallel(len(arguments), workers, pool):
+            return [getattr(self, method)(*args) for args in arguments]
+        arguments = [(type(self), method, args) for args in arguments]
+        if pool is not None:
+            return list(pool.map(_call_handler, arguments))
+        pool = multiprocessing.Pool(workers)
+        try:
+            return pool.map(_call_handler, arguments)
+        finally:
+            pool.close()
+            pool.join()
+
+    @staticmethod
+    def _in_parallel(story_count, workers=None, pool=None):
+        """ Whether stories should be processed in parallel. A given `pool`
+        is always used, if there is more than one story. Otherwise the work
+        is done in the current process, rather than by `workers` new ones,
+        when:
+            * `workers` is less than 2
+            * there are fewer stories than `workers`, so the files are too
+              small to be worth starting the processes
+            * the current process is daemonic, eg a Celery worker or a process
+              of another pool, since those are not allowed to have children
+        """
+        if pool is not None:
+            return story_count > 1
+        return (workers is not None and workers > 1 and
+                story_count >= workers and
+                not multiprocessing.current_process().daemon)
+
     def _can_skip_content(self, string):
         """
         Checks if the contents of an XML files are translateable.
@@ -135,59 +202,75 @@ class InDesignHandler(Handler):
                 return True
         return False
 
-    def _find_and_replace(self, story_xml):
+    def _split_story(self, story_xml):
+        """ Splits a story around its translatable content. Returns a list
+        whose odd items are the strings and even items the XML between them.
         """
-        Finds all the translatable content in the given XML string
-        replaces it with the string_hash and returns the resulting
-        template while updating `self.stringset` in the process.
-        args:
-            story_xml (str): The xml content of a single Story of the IDML file
-        returns:
-            the input string with all translatable content replaced by the
-            md5 hash of the string.
-        """
-        template = re.sub(ensure_unicode(self.CONTENT_REGEX),
-                          self._replace,
-                          story_xml)
-        return template
-
-    def _replace(self, match):
-        """ Implements the logic used by `self.CONTENT_REGEX.sub(...)` to
-        replace strings with their template replacement and appends new strings
-        to `self.stringset`.
+        parts = []
+        position = 0
+        for match in re.finditer(ensure_unicode(self.CONTENT_REGEX),
+                                 story_xml):
+            if self._can_skip_content(match.group(2)):
+                continue
+            parts.append(story_xml[position:match.start(2)])
+            parts.append(match.group(2))
+            position = match.end(2)
+        parts.append(story_xml[position:])
+        return parts
+
+    def _replace_strings(self, parts):
+        """ Joins the parts returned by `_split_story` back together, with
+        the strings replaced by their template replacement, and appends the
+        strings to `self.stringset`.
         """
-        opening_tag, string, closing_tag = match.groups()
-
-        if self._can_skip_content(string):
-            return match.group()
-        order = next(self.order)
-        string_object = OpenString(six.text_type(order), string, order=order)
-        self.stringset.append(string_object)
-        return u"".join((opening_tag, string_object.template_replacement,
-                         closing_tag))
+        parts = list(parts)
+        for index in range(1, len(parts), 2):
+            order = next(self.order)
+            string_object = OpenString(six.text_type(order), parts[index],
+                                       order=order)
+            self.stringset.append(string_object)
+            parts[index] = string_object.template_replacement
+        return u"".join(parts)
 
     """ Compile Methods """
 
-    def compile(self, template, stringset, **kwargs):
+    def compile(self, template, stringset, workers=None, pool=None,
+                **kwargs):
+        """ The translations can be filled into the stories in parallel, by
+        a new pool of `workers` processes or by an existing `pool` (see
+        `_map_stories`).
+        """
         # The content is a binary IDML file
         idml = UCF(io.BytesIO(template))
-
-        self.stringset = list(stringset)
-
-        # Iterate over the contents of the IDML file
-        for key in self._get_ordered_stories(idml):
-            try:
-                story_content = idml[key]
-            except KeyError:
-                continue
-
-            # no matter what, idml values are bytes
-            story_content = idml[key].decode('utf-8')
-            idml[key] = self._compile_story(story_content).encode('utf-8')
-
-        out = io.BytesIO()
-        idml.save(out)
-        return out.getvalue()
+        keys, stories = self._get_stories(idml)
+
+        self.translations = {string.template_replacement: string
+                             for string in stringset}
+        replacements = {}
+
+        # no matter what, idml values are bytes
+        story_contents = [story.decode('utf-8') for story in stories]
+        if self._in_parallel(len(story_contents), workers, pool):
+            # Which translation every hash gets depends on the stories before
+            # it, so that is decided here and only the filling in is handed
+            # out
+            arguments = [
+                (story_content, [self._pop_translation(hash_) for hash_
+                                 in self.HASH_REGEX.findall(story_content)])
+                for story_content in story_contents
+            ]
+            story_contents = self._map_stories('_fill_story', arguments,
+                                               workers, pool)
+        else:
+            story_contents = [self._compile_story(story_content)
+                              for story_content in story_contents]
+
+        for key, story, story_content in zip(keys, stories, story_contents):
+            story_content = story_content.encode('utf-8')
+            if story_content != story:
+                replacements[key] = story_content
+
+        return rewrite_zip(template, replacements)
 
     def _compile_story(self, story_content):
         """ Handles the compilation of a single story
@@ -196,32 +279,38 @@ class InDesignHandler(Handler):
         returns:
             compiled_story: the compiled story content
         """
-        transcriber = Transcriber(story_content)
-        hash_regex = re.compile(ensure_unicode(r'[a-z,0-9]{32}_tr'))
-        found = True
-        while found:
-            try:
-                current_string = self.stringset.pop(0)
-                hash_position = story_content.index(
-                    current_string.template_replacement
-                )
-            except ValueError:
-                found = False
-                self.stringset.insert(0, current_string)
-            except IndexError:
-                break
-            else:
-                transcriber.copy_until(hash_position)
-                transcriber.add(self._escape_amps(current_string.string))
-                transcriber.skip(len(current_string.template_replacement))
-
-        # Update the XML file to contain the template strings
-        transcriber.copy_until(len(story_content))
-        compiled_story = transcriber.get_destination()
-        # in case there are any hashes that have not been replaced, replace
-        # them with an empty string
-        compiled_story = hash_regex.sub(u'', compiled_story)
-        return compiled_story
+        return self.HASH_REGEX.sub(self._translate, story_content)
+
+    def _translate(self, match):
+        """ Implements the logic used by `self.HASH_REGEX.sub(...)` to replace
+        a template replacement with its translation. Every translation is
+        used once; hashes that have no translation left are replaced with an
+        empty string.
+        """
+        return self._escape_translation(self._pop_translation(match.group()))
+
+    def _pop_translation(self, hash_):
+        """ Returns the translation of a template replacement, or None if it
+        has none left
+        """
+        string = self.translations.pop(hash_, None)
+        return None if string is None else string.string
+
+    def _fill_story(self, story_content, translations):
+        """ Replaces the template replacements of a story, in order, with
+        `translations`, as returned by `_pop_translation`
+        """
+        translations = iter(translations)
+        return self.HASH_REGEX.sub(
+            lambda match: self._escape_translation(next(translations)),
+            story_content
+        )
+
+    def _escape_translation(self, translation):
+        """ Escapes a translation returned by `_pop_translation` """
+        if translation is None:
+            return u''
+        return self._escape_amps(translation)
 
     @staticmethod
     def _escape_amps(string):
@@ -259,3 +348,11 @@ class InDesignHandler(Handler):
             transcriber.skip(1)
         transcriber.copy_to_end()
         return transcriber.get_destination()
+
+
+def _call_handler(arguments):
+    """ Calls a method on a new handler; used by the processes of
+    `InDesignHandler._map_stories`
+    """
+    handler_class, method, args = arguments
+    return getattr(handler_class(), method)(*args)
@@ -2,7 +2,6 @@
 
 from __future__ import absolute_import
 
-import csv
 import json
 import re
 from itertools import count
@@ -14,19 +13,13 @@ from ..handlers import Handler
 from ..strings import OpenString
 from ..transcribers import Transcriber
 from ..utils.icu import ICUCompiler, ICUParser
-from ..utils.json import DumbJson, escape, unescape
+from ..utils.json import (DumbJson, escape, escape_many, unescape,
+                          unescape_many)
 
-try:
-    from StringIO import StringIO
-except ImportError:
-    from io import StringIO
-
-
-def csv_reader_next(reader):
-    try:
-        return reader.next()
-    except AttributeError:
-        return next(reader)
+# Shared by all the JSON handlers, which don't support the `=N` plural syntax.
+# Plurals that are encountered again are not parsed again
+ICU_PARSER = ICUParser(allow_numeric_plural_values=False, cache_size=1024)
+ICU_COMPILER = ICUCompiler()
 
 
 class JsonHandler(Handler):
@@ -46,21 +39,33 @@ class JsonHandler(Handler):
     PLURAL_ARG = 'plural'
     PLURAL_KEYS_STR = ' '.join(six.iterkeys(Handler._RULES_ATOI))
 
-    def parse(self, content, **kwargs):
-        # Validate that content is JSON
-        self.validate_content(content)
+    # Containers record where they start and list items that are containers
+    # start at their opening bracket since version 2
+    COMPILE_PLAN_VERSION = 2
 
+    def parse(self, content, **kwargs):
         self.transcriber = Transcriber(content)
         source = self.transcriber.source
         self.stringset = []
         self.existing_keys = set()
 
+        # The content is validated as JSON while extracting the strings. In
+        # case of any error, the content is validated with the json module
+        # too, so that invalid JSON is always reported the same way, even if
+        # extracting tripped over it in some other way first
         try:
-            parsed = DumbJson(source)
+            parsed = DumbJson(source, strict=True)
+            self._order = count()
+            self._extract(parsed)
+        except ParseError:
+            self.validate_content(content)
+            raise
         except ValueError as e:
+            self.validate_content(content)
             raise ParseError(six.text_type(e))
-        self._order = count()
-        self._extract(parsed)
+        except Exception:
+            self.validate_content(content)
+            raise
         self.transcriber.copy_until(len(source))
 
         return self.transcriber.get_destination(), self.stringset
@@ -125,6 +130,14 @@ class JsonHandler(Handler):
                 if isinstance(item, (six.binary_type, six.text_type)):
                     if not item.strip():
                         continue
+                    if self.name == "STRUCTURED_JSON":
+                        self.transcriber.copy_until(item_position)
+                        raise ParseError(
+                            u"Strings must be in a JSON object, found one in "
+                            u"a list in line {}".format(
+                                self.transcriber.line_number
+                            )
+                        )
 
                     openstring = self._create_openstring(key, item,
                                                          item_position)
@@ -151,8 +164,7 @@ class JsonHandler(Handler):
         # e.g. a pluralized string.
         # If it cannot be parsed that way (returns None), parse it like
         # a regular string.
-        parser = ICUParser(allow_numeric_plural_values=False)
-        icu_string = parser.parse(key, value)
+        icu_string = ICU_PARSER.parse(key, value)
         if icu_string:
             return self._create_pluralized_string(icu_string, value_position)
 
@@ -208,139 +220,178 @@ class JsonHandler(Handler):
         return key
 
     def compile(self, template, stringset, **kwargs):
-        # Lets play on the template first, we need it to not include the hashes
-        # that aren't in the stringset. For that we will create a new stringset
-        # which will have the hashes themselves as strings and compile against
-        # that. The compilation process will remove any string sections that
-        # are absent from the stringset. Next we will call `_clean_empties`
-        # from the template to clear out any `...,  ,...` or `...{ ,...`
-        # sequences left. The result will be used as the actual template for
-        # the compilation process
-
-        stringset = list(stringset)
-
-        fake_stringset = [
-            OpenString(openstring.key,
-                       openstring.template_replacement,
-                       order=openstring.order,
-                       pluralized=openstring.pluralized)
-            for openstring in stringset
-        ]
-        new_template = self._replace_translations(
-            template, fake_stringset, False
-        )
-        new_template = self._clean_empties(new_template)
-
-        return self._replace_translations(new_template, stringset, True)
+        # Strings that are absent from the stringset are removed from the
+        # template together with a comma next to them, while the hashes of the
+        # rest are replaced with their translations, in a single pass over the
+        # template (see `_insert`)
 
-    def _replace_translations(self, template, stringset, is_real_stringset):
         self.transcriber = Transcriber(template)
         template = self.transcriber.source
 
-        self.stringset = stringset
+        self.stringset = list(stringset)
         self.stringset_index = 0
 
-        parsed = DumbJson(template)
-        self._insert(parsed, is_real_stringset)
+        compile_plan = kwargs.get('compile_plan')
+        if (compile_plan is not None and
+                self._is_valid_compile_plan(compile_plan, template)):
+            root = compile_plan['root']
+        else:
+            root = self._plan_container(DumbJson(template))
+        self._insert(root)
 
         self.transcriber.copy_until(len(template))
         return self.transcriber.get_destination()
 
-    def _insert(self, parsed, is_real_stringset):
-        if parsed.type == dict:
-            return self._insert_from_dict(parsed, is_real_stringset)
-        elif parsed.type == list:
-            return self._insert_from_list(parsed, is_real_stringset)
+    def get_compile_plan(self, template):
+        template = Transcriber(template).source
+        return self._create_compile_plan(
+            template, root=self._plan_container(DumbJson(template))
+        )
 
-    def _insert_item(self, value, value_position, is_real_stringset):
-        at_least_one = False
+    def _plan_container(self, parsed):
+        """ Flatten a DumbJson container into the nested lists that `_insert`
+            works on, so that they can be reused (and serialized) instead of
+            tokenizing the template again:
 
-        if isinstance(value, (six.binary_type, six.text_type)):
-            string = self._get_next_string()
-            string_exists = string is not None
-
-            templ_replacement = string.template_replacement \
-                if string_exists else None
+                [type, start, end, [[item_start, value_position, value], ...]]
 
-            # Pluralized string
-            if string_exists and string.pluralized \
-                    and templ_replacement in value:
-                at_least_one = True
-                self._insert_plural_string(
-                    value, value_position, string, is_real_stringset
-                )
+            where `type` is 'dict' or 'list', `item_start` is where the key
+            (or the list item) starts and `value` is either a string, another
+            container or None for the rest of the JSON types.
+        """
 
-            # Regular string
-            elif string_exists and value == templ_replacement:
-                at_least_one = True
-                self._insert_regular_string(
-                    value, value_position, string, is_real_stringset
-                )
+        items = []
+        if parsed.type == dict:
+            for _, key_position, value, value_position in parsed:
+                items.append([key_position - 1, value_position,
+                              self._plan_value(value)])
+            return ['dict', parsed.start, parsed.end, items]
+        else:
+            for value, value_position in parsed:
+                item_start = value_position
+                if isinstance(value, (six.binary_type, six.text_type)):
+                    # Include the opening quote
+                    item_start -= 1
+                items.append([item_start, value_position,
+                              self._plan_value(value)])
+            return ['list', parsed.start, parsed.end, items]
+
+    def _plan_value(self, value):
+        if isinstance(value, (six.binary_type, six.text_type)):
+            return value
+        elif isinstance(value, DumbJson):
+            return self._plan_container(value)
+        return None
 
-            else:
-                # Anything else: just remove the current section
-                self._copy_until_and_remove_section(
-                    value_position + len(value) + 1
-                )
+    def _insert(self, container):
+        """ Replace the hashes of a container's items with translations. Items
+            whose strings are missing from the stringset are removed along
+            with one of the commas around them, so that the result is still
+            valid JSON:
 
-        elif isinstance(value, DumbJson):
-            items_still_left = self._insert(value, is_real_stringset)
+                '{"a": "b", "c": "d", "e": "f"}' ->
+                    '{"c": "d", "e": "f"}'  # "a" removed: the comma after it
+                    '{"a": "b", "e": "f"}'  # "c" removed: the comma before it
+                    '{"a": "b", "c": "d"}'  # "e" removed: the comma before it
 
-            if not items_still_left:
-                self._copy_until_and_remove_section(value.end + 1)
-            else:
-                at_least_one = True
+            When the last items are removed, so is the whitespace up to the
+            closing bracket, the same as the `_clean_empties` pass that this
+            replaced:
 
-        else:
-            # 'value' is a python value allowed by JSON (integer,
-            # boolean, null), skip it
-            at_least_one = True
+                '[\n  "a",\n  "b"\n]' -> '[\n  "a"]'  # "b" removed
 
-        return at_least_one
+            Returns whether at least one item was kept.
+        """
 
-    def _insert_from_dict(self, parsed, is_real_stringset):
+        source = self.transcriber.source
         at_least_one = False
 
-        for key, key_position, value, value_position in parsed:
-
-            self.transcriber.copy_until(key_position - 1)
+        _, start, end, items = container
+        for index, (item_start, value_position, value) in enumerate(items):
+            is_last = index == len(items) - 1
+
+            # Mark where the section that will be removed, if the item isn't
+            # kept, starts
+            if at_least_one:
+                # At the comma before the item
+                section_start = source.rindex(',', start, item_start)
+            elif is_last:
+                # At the item itself; everything before it was removed
+                section_start = item_start
+            elif index == 0:
+                # Right after the container's opening bracket
+                section_start = start + 1
+            else:
+                # Right after the comma before the item, since the items
+                # before it have already been removed up to there
+                section_start = source.rindex(',', start, item_start) + 1
+            self.transcriber.copy_until(section_start)
             self.transcriber.mark_section_start()
 
-            tmp_at_least_one = self._insert_item(
-                value, value_position, is_real_stringset
-            )
-
-            if tmp_at_least_one:
+            if self._insert_item(value, value_position):
                 at_least_one = True
+                continue
+
+            # The item isn't kept, find where its section ends
+            if isinstance(value, list):
+                _, _, value_end, _ = value
+            else:
+                value_end = value_position + len(value)
+            if is_last and at_least_one:
+                # Right before the closing bracket, whitespace included
+                section_end = end
+            elif is_last:
+                # Right after the item
+                section_end = value_end + 1
+            elif at_least_one:
+                # Right before the comma after the item
+                section_end = source.index(',', value_end + 1)
+            else:
+                # Right after the comma after the item
+                section_end = source.index(',', value_end + 1) + 1
+            self._copy_until_and_remove_section(section_end)
 
         return at_least_one
 
-    def _insert_from_list(self, parsed, is_real_stringset):
-        at_least_one = False
+    def _insert_item(self, value, value_position):
+        """ Insert the translation of a string or fill in an embedded
+            container. Returns whether the item should be kept.
+        """
 
-        for value, value_position in parsed:
-            self.transcriber.copy_until(value_position - 1)
-            self.transcriber.mark_section_start()
+        if isinstance(value, (six.binary_type, six.text_type)):
+            string = self._get_next_string()
+            if string is None:
+                return False
+            templ_replacement = string.template_replacement
 
-            tmp_at_least_one = self._insert_item(
-                value, value_position, is_real_stringset
-            )
+            # Pluralized string
+            if string.pluralized and templ_replacement in value:
+                self._insert_plural_string(value, value_position, string)
+                return True
 
-            if tmp_at_least_one:
-                at_least_one = True
+            # Regular string
+            elif value == templ_replacement:
+                self._insert_regular_string(value, value_position, string)
+                return True
 
-        return at_least_one
+            # Anything else: the item should be removed
+            return False
+
+        elif isinstance(value, list):
+            # An embedded container
+            return self._insert(value)
+
+        else:
+            # 'value' is a python value allowed by JSON (integer,
+            # boolean, null), keep it
+            return True
 
-    def _insert_plural_string(self, value, value_position, string,
-                              is_real_stringset):
+    def _insert_plural_string(self, value, value_position, string):
         templ_replacement = string.template_replacement
         replacement_pos = value.find(templ_replacement)
 
-        if is_real_stringset:
-            replacement = ICUCompiler().serialize_strings(string.string,
-                                                          delimiter=' ')
-        else:
-            replacement = templ_replacement
+        replacement = ICU_COMPILER.serialize_strings(string.string,
+                                                     delimiter=' ')
 
         self.transcriber.copy_until(
             value_position + replacement_pos
@@ -353,8 +404,7 @@ class JsonHandler(Handler):
         )
         self.stringset_index += 1
 
-    def _insert_regular_string(self, value, value_position, string,
-                               is_real_stringset):
+    def _insert_regular_string(self, value, value_position, string):
         self.transcriber.copy_until(value_position)
         self.transcriber.add(string.string)
         self.transcriber.skip(len(value))
@@ -380,55 +430,6 @@ class JsonHandler(Handler):
         except ValueError as e:
             raise ParseError(six.text_type(e))
 
-    def _clean_empties(self, compiled):
-        """ If sections were removed, clean leftover commas, brackets etc.
-
-            Eg:
-                '{"a": "b", ,"c": "d"}' -> '{"a": "b", "c": "d"}'
-                '{, "a": "b", "c": "d"}' -> '{"a": "b", "c": "d"}'
-                '["a", , "b"]' -> '["a", "b"]'
-        """
-        while True:
-            # First key-value of a dict was removed
-            match = re.search(r'{\s*,', compiled)
-            if match:
-                compiled = u"{}{{{}".format(compiled[:match.start()],
-                                            compiled[match.end():])
-                continue
-
-            # Last key-value of a dict was removed
-            match = re.search(r',\s*}', compiled)
-            if match:
-                compiled = u"{}}}{}".format(compiled[:match.start()],
-                                            compiled[match.end():])
-                continue
-
-            # First item of a list was removed
-            match = re.search(r'\[\s*,', compiled)
-            if match:
-                compiled = u"{}[{}".format(compiled[:match.start()],
-                                           compiled[match.end():])
-                continue
-
-            # Last item of a list was removed
-            match = re.search(r',\s*\]', compiled)
-            if match:
-                compiled = u"{}]{}".format(compiled[:match.start()],
-                                           compiled[match.end():])
-                continue
-
-            # Intermediate key-value of a dict or list was removed
-            match = re.search(r',\s*,', compiled)
-            if match:
-                compiled = u"{},{}".format(compiled[:match.start()],
-                                           compiled[match.end():])
-                continue
-
-            # No substitutions happened, break
-            break
-
-        return compiled
-
     def _get_next_string(self):
         try:
             return self.stringset[self.stringset_index]
@@ -443,6 +444,14 @@ class JsonHandler(Handler):
     def unescape(string):
         return unescape(string)
 
+    @staticmethod
+    def escape_many(strings):
+        return escape_many(strings)
+
+    @staticmethod
+    def unescape_many(strings):
+        return unescape_many(strings)
+
 
 class StructuredJsonHandler(JsonHandler):
     """Handler that preserves certain keys for internal usage, while
@@ -488,6 +497,11 @@ class StructuredJsonHandler(JsonHandler):
     STRUCTURE_FIELDS = {CONTEXT_KEY, DEVELOPER_COMMENT_KEY,
                         CHARACTER_LIMIT_KEY}
 
+    def parse(self, content, **kwargs):
+        # Maps the key of every extracted string to its string structure
+        self.string_structures = {}
+        return super(StructuredJsonHandler, self).parse(content, **kwargs)
+
     def _create_openstring(self, key, payload_dict):
         """Return a new OpenString based on the given key and payload_dict
         and update the transcriber accordingly based on the provided position.
@@ -497,82 +511,73 @@ class StructuredJsonHandler(JsonHandler):
         :param DumbJson payload_dict: the string and metadata
         :return: an OpenString or None
         """
+        string_position = self._index_string_structure(key, payload_dict)
+        string_value = self._get_string_structure(key)[self.STRING_KEY]
         # First attempt to parse this as a special node,
         # e.g. a pluralized string.
         # If it cannot be parsed that way (returns None), parse it like
         # a regular string.
-        parser = ICUParser(allow_numeric_plural_values=False)
-        (string_value, _), = payload_dict.find_children(self.STRING_KEY)
-        icu_string = parser.parse(key, string_value)
+        icu_string = ICU_PARSER.parse(key, string_value)
         if icu_string:
-            return self._create_pluralized_string(icu_string, payload_dict)
+            return self._create_pluralized_string(icu_string, string_position)
 
         return self._create_regular_string(
-            key, payload_dict
+            key, string_value, string_position
         )
 
-    def _create_pluralized_string(self, icu_string, payload_dict):
+    def _create_pluralized_string(self, icu_string, value_position):
         """Create a pluralized string based on the given information.
 
         Also updates the transcriber accordingly.
 
         :param ICUString icu_string: The ICUString object that will generate
             the pluralized string
-        "param DumbJson payload_dict: the string and metadata
+        :param int value_position: where the string starts in the source
         :return: an OpenString object
         :rtype: OpenString
         """
-        (_, string_position), = payload_dict.find_children(self.STRING_KEY)
-        payload_dict = json.loads(
-            payload_dict.source[payload_dict.start:payload_dict.end+1])
-        comment_value = payload_dict.get(self.DEVELOPER_COMMENT_KEY)
-        limit_value = payload_dict.get(self.CHARACTER_LIMIT_KEY)
-        context_value = payload_dict.get(self.CONTEXT_KEY)
+        structure = self._get_string_structure(icu_string.key)
 
         openstring = OpenString(
             icu_string.key,
             icu_string.strings_by_rule,
             pluralized=icu_string.pluralized,
             order=next(self._order),
-            developer_comment=comment_value or '',
-            character_limit=limit_value,
-            context=context_value or ''
+            developer_comment=structure[self.DEVELOPER_COMMENT_KEY] or '',
+            character_limit=structure[self.CHARACTER_LIMIT_KEY],
+            context=structure[self.CONTEXT_KEY] or ''
         )
 
         current_pos = icu_string.current_position
         string_to_replace = icu_string.string_to_replace
 
-        self.transcriber.copy_until(string_position + current_pos)
+        self.transcriber.copy_until(value_position + current_pos)
         self.transcriber.add(openstring.template_replacement)
         self.transcriber.skip(len(string_to_replace))
 
         return openstring
 
-    def _create_regular_string(self, key, payload_dict):
+    def _create_regular_string(self, key, value, value_position):
         """
         Return a new OpenString based on the given key and value
         and update the transcriber accordingly.
 
         :param key: the string key
         :param value: the translation string
+        :param int value_position: where the string starts in the source
         :return: an OpenString or None
         """
-        (string_value, string_position), = payload_dict.find_children(self.STRING_KEY)
-        payload_dict = json.loads(
-            payload_dict.source[payload_dict.start:payload_dict.end+1])
-        comment_value = payload_dict.get(self.DEVELOPER_COMMENT_KEY)
-        limit_value = payload_dict.get(self.CHARACTER_LIMIT_KEY)
-        context_value = payload_dict.get(self.CONTEXT_KEY)
+        structure = self._get_string_structure(key)
 
         openstring = OpenString(
-            key, string_value, order=next(self._order),
-            developer_comment=comment_value or '',
-            character_limit=limit_value,
-            context=context_value or ''
+            key, value, order=next(self._order),
+            developer_comment=structure[self.DEVELOPER_COMMENT_KEY] or '',
+            character_limit=structure[self.CHARACTER_LIMIT_KEY],
+            context=structure[self.CONTEXT_KEY] or ''
         )
-        self.transcriber.copy_until(string_position)
+        self.transcriber.copy_until(value_position)
         self.transcriber.add(openstring.template_replacement)
-        self.transcriber.skip(len(string_value))
+        self.transcriber.skip(len(value))
 
         return openstring
 
@@ -599,8 +604,43 @@ class StructuredJsonHandler(JsonHandler):
         # when calculating the length of the STRING_KEY, for the "." character
         return key[:-(len(self.STRING_KEY)+1)]
 
+    def _index_string_structure(self, key, payload_dict):
+        """Read the string and the metadata of a payload in a single pass
+        and save them, so that `_get_string_structure` can look them up by
+        key later on.
+
+        Only the string is kept as it appears in the source (escaped), the
+        metadata are decoded like the json module would.
+
+        :param str key: the key of the string, as found by `_extract`
+        :param DumbJson payload_dict: the string and metadata
+        :return: the position of the string in the source
+        :rtype: int
+        """
+        structure = {field: OpenString.DEFAULTS[field]
+                     for field in self.STRUCTURE_FIELDS}
+        string_position = None
+        for field, _, value, value_position in payload_dict:
+            if field == self.STRING_KEY:
+                structure[field] = value
+                string_position = value_position
+            elif field in self.STRUCTURE_FIELDS:
+                structure[field] = self._decode_value(value)
+        self.string_structures[key] = structure
+        return string_position
+
+    @staticmethod
+    def _decode_value(value):
+        """Decode a value yielded by DumbJson into its Python equivalent."""
+        if isinstance(value, DumbJson):
+            return json.loads(value.source[value.start:value.end + 1])
+        if (isinstance(value, (six.binary_type, six.text_type)) and
+                DumbJson.BACKSLASH in value):
+            return json.loads(u'"{}"'.format(value))
+        return value
+
     def _get_string_structure(self, key):
-        """Given a key, find its corresponding value in a nested JSON object.
+        """Given a key, find its corresponding string structure.
 
         Example:
         If our JSON file has the following structure,
@@ -620,62 +660,14 @@ class StructuredJsonHandler(JsonHandler):
             "character_limit": None
         }
 
-        :param str key: the key to search against
-        :return: a dictionary with the string structure
-        :rtype: dict
-        """
-        json_dict = self._get_value_for_key(key)
-        return {field: json_dict[field]
-                if field in json_dict
-                else OpenString.DEFAULTS[field]
-                for field in self.STRUCTURE_FIELDS
-                }
-
-    def _get_value_for_key(self, key):
-        """Given a key, find its value in a nested JSON object.
-
-        Key will always have the format `key.[another_key[..]]`
-        As an example, given the key 'key.another_key.string'
-        and our JSON object has the following structure:
-        {'key':{
-            'another_key':{
-                'string': 'This is a text',
-                'developer_comment': 'These are the developer notes'
-            }
-          }
-        }
-        We should return the following dictionary:
-        {
-            'string': 'This is a text',
-            'developer_comment': 'These are the developer notes'
-        }
+        The structures are indexed while the strings are extracted, so this
+        only works for keys of strings that have already been extracted.
 
         :param str key: the key to search against
-        :return: a dictionary with the value for the given key
+        :return: a dictionary with the string structure
         :rtype: dict
         """
-        # Go through all parts of the composite key
-        keys = csv_reader_next(
-            csv.reader(
-                StringIO(key), delimiter='.', escapechar="\\"
-            )
-        )
-        json_dict = self.json_dict
-        for k in keys:
-            json_dict = json_dict[k]
-        return json_dict
-
-    def validate_content(self, content):
-        """Validate that a given string is valid JSON file.
-
-        :param str content: the content to parse
-        :raise ParseError: if the content is not valid JSON format
-        """
-        try:
-            # Save the JSON dict for later use
-            self.json_dict = json.loads(content)
-        except ValueError as e:
-            raise ParseError(six.text_type(e))
+        return self.string_structures[key]
 
     def _copy_until_and_remove_section(self, pos):
         """
@@ -693,19 +685,23 @@ class ChromeI18nHandler(JsonHandler):
 
     name = "CHROME"
     STRING_KEY = "message"
+    DESCRIPTION_KEY = "description"
 
-    def compile(self, template, stringset, **kwargs):
-        """Compile a template back to a stringset.
+    def parse(self, content, **kwargs):
+        self.nesting_level = 0
+        self.description = ''
+        return super(ChromeI18nHandler, self).parse(content, **kwargs)
 
-        :param str template: the template string
-        :param stringset: generator that holds a list of OpenString objects
-        :return: the compiled template
-        :rtype: str
-        """
-        stringset = list(stringset)
-        return self._replace_translations(
-            template, stringset, is_real_stringset=True
-        )
+    def _extract(self, parsed, nest=None):
+        if self.nesting_level == 1:
+            # `parsed` is the value of a top-level key, find its description
+            # before extracting the strings in it
+            self.description = self._get_description(parsed)
+        self.nesting_level += 1
+        super(ChromeI18nHandler, self)._extract(parsed, nest)
+        self.nesting_level -= 1
+        if self.nesting_level == 1:
+            self.description = ''
 
     def _create_regular_string(self, key, value, value_position):
         """
@@ -722,12 +718,11 @@ class ChromeI18nHandler(JsonHandler):
         # test.description etc)
         if not key.endswith(self.STRING_KEY):
             return None
-        # Check if the given key has a description field
-        description = self._get_description(key)
-        # Create an OpenString object with the description as the developer
-        # comment
+        # Create an OpenString object with the description of the top-level
+        # object as the developer comment
         openstring = OpenString(
-            key, value, order=next(self._order), developer_comment=description
+            key, value, order=next(self._order),
+            developer_comment=self.description
         )
         self.transcriber.copy_until(value_position)
         self.transcriber.add(openstring.template_replacement)
@@ -735,18 +730,25 @@ class ChromeI18nHandler(JsonHandler):
 
         return openstring
 
-    def _get_description(self, key):
-        """Return the 'description' child for a given key
+    def _get_description(self, parsed):
+        """Return the 'description' child of a top-level object
 
-        :param str key: the key to search against
-        :return: the description string
+        :param DumbJson parsed: the value of a top-level key
+        :return: the (unescaped) description or '' if there isn't one
         :rtype: str
         """
-        key_split = key.split('.')
-        try:
-            return self.json_dict[key_split[0]]['description']
-        except KeyError:
+        if parsed.type != dict:
+            return ''
+        (description, _), = parsed.find_children(self.DESCRIPTION_KEY)
+        if description is None:
             return ''
+        if isinstance(description, (six.binary_type, six.text_type)):
+            return self.unescape(description)
+        if isinstance(description, DumbJson):
+            return json.loads(
+                parsed.source[description.start:description.end + 1]
+            )
+        return description
 
     def _copy_until_and_remove_section(self, pos):
         """
@@ -758,18 +760,6 @@ class ChromeI18nHandler(JsonHandler):
         # Unlike the JSON format, do not remove the remaining section of the
         # template
 
-    def validate_content(self, content):
-        """Validate that a given string is valid Chromei18n file.
-
-        :param str content: the content to parse
-        :raise ParseError: if the content is not valid JSON format
-        """
-        try:
-            # Save the JSON dict for later use
-            self.json_dict = json.loads(content)
-        except ValueError as e:
-            raise ParseError(six.text_type(e))
-
 
 class ChromeI18nHandlerV3(Handler):
     """ New version of chrome-json handler.
@@ -804,14 +794,30 @@ class ChromeI18nHandlerV3(Handler):
     extension = "json"
 
     def parse(self, content, **kwargs):
-        icu_parser = ICUParser(allow_numeric_plural_values=False)
+        # The content is validated as JSON while extracting the strings. In
+        # case of an error, the content is validated with the json module
+        # too, so that invalid JSON is always reported the same way
+        try:
+            return self._parse(content)
+        except ParseError:
+            self.validate_content(content)
+            raise
+        except ValueError as e:
+            self.validate_content(content)
+            raise ParseError(six.text_type(e))
 
-        # Sanity checks
+    def validate_content(self, content):
+        """Validate that a given string is valid JSON format.
+
+        :param str content: the content to parse
+        :raise ParseError: if the content is not valid JSON format
+        """
         try:
             json.loads(content)
         except ValueError as e:
             raise ParseError(six.text_type(e))
 
+    def _parse(self, content):
         # Useful objects
         transcriber = Transcriber(content)
         source = transcriber.source
@@ -819,11 +825,8 @@ class ChromeI18nHandlerV3(Handler):
         existing_keys = set()
         _order = count()
 
-        # Sanity checks vol2
-        try:
-            parsed = DumbJson(source)
-        except ValueError as e:
-            raise ParseError(six.text_type(e))
+        # Sanity checks
+        parsed = DumbJson(source, strict=True)
         if parsed.type != dict:
             raise ParseError(u"Source file must be a JSON object")
 
@@ -850,7 +853,7 @@ class ChromeI18nHandlerV3(Handler):
                 description = None
 
             # Extract string
-            icu_string = icu_parser.parse(outer_key, message)
+            icu_string = ICU_PARSER.parse(outer_key, message)
             if icu_string:
                 # Pluralized
                 openstring = OpenString(icu_string.key,
@@ -878,34 +881,28 @@ class ChromeI18nHandlerV3(Handler):
         return transcriber.get_destination(), stringset
 
     def compile(self, template, stringset, **kwargs):
-        icu_compiler = ICUCompiler()
-
         # Useful objects
         transcriber = Transcriber(template)
         source = transcriber.source
         stringset_iter = iter(stringset)
         openstring = next(stringset_iter, None)
-        parsed = DumbJson(source)
+        compile_plan = kwargs.get('compile_plan')
+        if (compile_plan is not None and
+                self._is_valid_compile_plan(compile_plan, source)):
+            items = compile_plan['items']
+        else:
+            items = self._plan_items(source)
 
         # Main loop
-        for (outer_key,
-             outer_key_position, outer_value, outer_value_position) in parsed:
+        for (outer_key, section_start, outer_value_end,
+             message_hash, message_position) in items:
             # Mark section start in case we want to delete this section
-            transcriber.copy_until(outer_key_position - 1)
+            transcriber.copy_until(section_start)
             transcriber.mark_section_start()
 
-            # Not something we extracted a string from, skip
-            if not isinstance(outer_value, DumbJson):
-                continue
-            if outer_value.type != dict:
-                continue
-
-            # Find message
-            (message_hash, message_position), = outer_value.\
-                find_children('message')
-
-            # Message not found, skip
-            if not isinstance(message_hash, six.string_types):
+            # Not something we extracted a string from or message not found,
+            # skip
+            if message_hash is None:
                 continue
 
             # We have found a message
@@ -921,7 +918,7 @@ class ChromeI18nHandlerV3(Handler):
                     #          ^                       ^
                     #          |                       |
                     #        start                    end
-                    delete_until = source.index(',', outer_value.end) + 1
+                    delete_until = source.index(',', outer_value_end) + 1
 
                 except ValueError:
                     # If this is the last key-value pair, delete up to (not
@@ -930,7 +927,7 @@ class ChromeI18nHandlerV3(Handler):
                     #          ^                      ^
                     #          |                      |
                     #        start                   end
-                    delete_until = source.index('}', outer_value.end)
+                    delete_until = source.index('}', outer_value_end)
                 transcriber.copy_until(delete_until + 1)
                 transcriber.mark_section_end()
                 transcriber.remove_section()
@@ -957,7 +954,7 @@ class ChromeI18nHandlerV3(Handler):
                     openstring.template_replacement
                 )
                 transcriber.copy_until(message_position + replacement_position)
-                transcriber.add(icu_compiler.serialize_strings(
+                transcriber.add(ICU_COMPILER.serialize_strings(
                     openstring.string, delimiter=' '
                 ))
                 transcriber.skip(len(openstring.template_replacement))
@@ -976,6 +973,35 @@ class ChromeI18nHandlerV3(Handler):
 
         return compiled
 
+    def get_compile_plan(self, template):
+        template = Transcriber(template).source
+        return self._create_compile_plan(template,
+                                         items=self._plan_items(template))
+
+    def _plan_items(self, source):
+        """ Return a [key, section_start, value_end, message_hash,
+            message_position] list for every top-level key of the template;
+            the last three are None if the value has no message.
+        """
+
+        items = []
+        for outer_key, outer_key_position, outer_value, _ in DumbJson(source):
+            item = [outer_key, outer_key_position - 1, None, None, None]
+            items.append(item)
+
+            # Not something we extracted a string from
+            if not isinstance(outer_value, DumbJson):
+                continue
+            if outer_value.type != dict:
+                continue
+
+            # Find message
+            (message_hash, message_position), = outer_value.\
+                find_children('message')
+            if isinstance(message_hash, six.string_types):
+                item[2:] = [outer_value.end, message_hash, message_position]
+        return items
+
     @staticmethod
     def escape(string):
         return escape(string)
@@ -983,3 +1009,11 @@ class ChromeI18nHandlerV3(Handler):
     @staticmethod
     def unescape(string):
         return unescape(string)
+
+    @staticmethod
+    def escape_many(strings):
+        return escape_many(strings)
+
+    @staticmethod
+    def unescape_many(strings):
+        return unescape_many(strings)
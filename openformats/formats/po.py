@@ -24,8 +24,9 @@ class PoHandler(Handler):
     FUZZY_FLAG = 'fuzzy'
     EXTRACTS_RAW = False
     SPECIFIER = re.compile(
-        '%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*(?:\d+)?'
-        '(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?(?P<type>[diufFeEgGxXaAoscpn%])))'
+        '%((?:(?P<ord>\d+)\$|\((?P<key>\w+)\))?(?P<fullvar>[+#\- 0]*'
+        '(?:[1-9]\d*)?(?:\.\d+)?(hh\|h\|l\|ll|j|z|t|L)?'
+        '(?P<type>[diufFeEgGxXaAoscpn%])))'
     )
 
     def parse(self, content, is_source=False):
@@ -321,6 +322,39 @@ class PoHandler(Handler):
 
         return PoHandler.pofile_to_str(po)
 
+    def compile_many(self, template, stringsets, **kwargs):
+        """Parse the template with polib only once and compile it against
+        each stringset in turn.
+
+        `compile` edits the parsed entries in place, so their template
+        replacements are restored (and the removed entries are put back)
+        before moving on to the next stringset.
+        """
+        if isinstance(stringsets, dict):
+            stringsets = six.iteritems(stringsets)
+
+        if isinstance(template, polib.POFile):
+            po = template
+        else:
+            po = polib.pofile(template)
+
+        entries = list(po)
+        replacements = [(entry.msgstr, entry.msgstr_plural)
+                        for entry in entries]
+        try:
+            for language, stringset in stringsets:
+                self._restore_entries(po, entries, replacements)
+                yield language, self.compile(po, stringset)
+        finally:
+            self._restore_entries(po, entries, replacements)
+
+    @staticmethod
+    def _restore_entries(po, entries, replacements):
+        po[:] = entries
+        for entry, (msgstr, msgstr_plural) in zip(entries, replacements):
+            entry.msgstr = msgstr
+            entry.msgstr_plural = msgstr_plural
+
     def _compile_entry(self, entry, next_string):
         """Compiles the current non pluralized entry.
         If the current entry's matches the openstring compiles the string if
@@ -43,6 +43,8 @@ class YamlHandler(Handler):
 
     language_code = None
 
+    PLACEHOLDER_PAT = re.compile(ensure_unicode(r'[0-9a-f]{32}_(?:tr|pl)'))
+
     def parse(self, content, **kwargs):
         """ Parses the given YAML content to create stringset and template
 
@@ -124,12 +126,29 @@ class YamlHandler(Handler):
         Returns:
             A unicode, dumped YAML content.
         """
-        self.indent = self._get_indent(template)
+        compile_plan = kwargs.get('compile_plan')
+        if (compile_plan is None or
+                not self._is_valid_compile_plan(compile_plan, template)):
+            compile_plan = self.get_compile_plan(template)
+        self.indent = compile_plan['indent']
         if self.should_use_template:
-            return self._compile_from_template(template, stringset)
+            return self._compile_from_template(
+                template, stringset, compile_plan['placeholders']
+            )
         else:
             return self._compile_without_template(stringset)
 
+    def get_compile_plan(self, template):
+        source = Transcriber(template).source
+        placeholders = {}
+        for match in self.PLACEHOLDER_PAT.finditer(source):
+            placeholders.setdefault(match.group(), match.start())
+        return self._create_compile_plan(
+            template,
+            indent=self._get_indent(template),
+            placeholders=placeholders,
+        )
+
     def _load_yaml(self, content, loader):
         """
         Loads a YAML stream and returns a dictionary
@@ -381,15 +400,19 @@ class YamlHandler(Handler):
         emitter.stream.close()
         return translation
 
-    def _compile_from_template(self, template, stringset, **kwargs):
+    def _compile_from_template(self, template, stringset, placeholders=None):
         """ Compiles translation file from template
 
         Iterates over the stringset and for each strings replaces
         template replacement in the template with the actual translation.
+        `placeholders` maps template replacements to their positions in the
+        template; strings missing from it are searched for in the template.
 
         Returns:
             The compiled file content.
         """
+        if placeholders is None:
+            placeholders = {}
         transcriber = Transcriber(template)
         template = transcriber.source
 
@@ -398,7 +421,10 @@ class YamlHandler(Handler):
                 translation = self._compile_pluralized(string)
             else:
                 translation = self._write_styled_literal(string)
-            hash_position = template.index(string.template_replacement)
+            try:
+                hash_position = placeholders[string.template_replacement]
+            except KeyError:
+                hash_position = template.index(string.template_replacement)
             transcriber.copy_until(hash_position)
             # The context contains custom tags. If it exists, we must prepend
             # it and apply a space afterwards so it doesn't get merged with the
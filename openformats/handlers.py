@@ -1,3 +1,5 @@
+import hashlib
+
 import six
 
 from openformats.exceptions import RuleError
@@ -29,6 +31,10 @@ class Handler(object):
 
     _RULES_ITOA = {value: key for key, value in six.iteritems(_RULES_ATOI)}
 
+    # Bump this whenever the structure of a handler's compile plan changes so
+    # that plans persisted by older versions are ignored
+    COMPILE_PLAN_VERSION = 1
+
     _RULE_ERROR_MSG = (
         '{attempted} is not a valid rule value. Valid choices are {valid}'
     )
@@ -97,3 +103,73 @@ class Handler(object):
         """
 
         raise NotImplementedError('Abstract method')  # pragma: no cover
+
+    def get_compile_plan(self, template):
+        """
+        Tokenizes the template once and returns a "compile plan": a
+        JSON-serializable structure with everything `compile` needs to know
+        about the template's layout (placeholder positions, section
+        boundaries etc). The plan can be stored next to the template and
+        passed to `compile` as the `compile_plan` keyword argument, so that
+        compiling the same template into many languages doesn't tokenize it
+        every time:
+
+            >>> template, stringset = handler.parse(content)
+            >>> plan = handler.get_compile_plan(template)
+            >>> handler.compile(template, stringset, compile_plan=plan)
+
+        Handlers that don't support compile plans return None. Plans that
+        were created by a different handler, by an older version of the
+        handler or for a different template are ignored by `compile`.
+        """
+
+        return None
+
+    def compile_many(self, template, stringsets, **kwargs):
+        """
+        Compiles the same template against many stringsets, typically one per
+        target language. `stringsets` is either a dict or an iterable of
+        `(language, stringset)` pairs. The template is tokenized only once and
+        the compiled files are yielded lazily as `(language, compiled)` pairs,
+        so that only one of them needs to be kept in memory at a time:
+
+            >>> for language, compiled in handler.compile_many(
+            ...         template, {'el': el_stringset, 'fr': fr_stringset}):
+            ...     save(language, compiled)
+
+        Any extra keyword arguments are passed to every `compile` call.
+        Handlers that support compile plans get the template's plan passed
+        along with them; the rest are compiled one by one as usual.
+        """
+
+        if isinstance(stringsets, dict):
+            stringsets = six.iteritems(stringsets)
+
+        compile_plan = kwargs.pop('compile_plan', None)
+        if compile_plan is None:
+            compile_plan = self.get_compile_plan(template)
+        if compile_plan is not None:
+            kwargs['compile_plan'] = compile_plan
+
+        for language, stringset in stringsets:
+            yield language, self.compile(template, stringset, **kwargs)
+
+    def _create_compile_plan(self, template, **kwargs):
+        plan = {'handler': self.name,
+                'version': self.COMPILE_PLAN_VERSION,
+                'digest': self._get_template_digest(template)}
+        plan.update(kwargs)
+        return plan
+
+    def _is_valid_compile_plan(self, compile_plan, template):
+        return (compile_plan is not None and
+                compile_plan.get('handler') == self.name and
+                compile_plan.get('version') == self.COMPILE_PLAN_VERSION and
+                compile_plan.get('digest') ==
+                self._get_template_digest(template))
+
+    @staticmethod
+    def _get_template_digest(template):
+        if isinstance(template, six.text_type):
+            template = template.encode('utf-8')
+        return hashlib.md5(template).hexdigest()
@@ -557,6 +557,60 @@ class AndroidTestCase(CommonFormatTestMixin, unittest.TestCase):
             ''')
         )
 
+    def test_compile_unordered_stringset(self):
+        source = strip_leading_spaces(u'''
+            <resources>
+                <string name="a">hello</string>
+                <string-array name="b">
+                    <item>one</item>
+                    <item>two</item>
+                </string-array>
+                <plurals name="c">
+                    <item quantity="one">file</item>
+                    <item quantity="other">files</item>
+                </plurals>
+                <string name="d">goodbye</string>
+            </resources>
+        ''')
+        template, stringset = self.handler.parse(source)
+
+        # Out of order strings are left out unless ordering is optional
+        compiled = self.handler.compile(template, stringset[::-1])
+        self.assertEqual(compiled, strip_leading_spaces(u'''
+            <resources>
+                <string name="d">goodbye</string>
+            </resources>
+        '''))
+        compiled = self.handler.compile(template, stringset[::-1],
+                                        ordered=False)
+        self.assertEqual(compiled, source)
+
+    def test_compile_unordered_stringset_with_gaps(self):
+        source = strip_leading_spaces(u'''
+            <resources>
+                <string name="a">hello</string>
+                <string-array name="b">
+                    <item>one</item>
+                    <item>two</item>
+                </string-array>
+                <string name="c">goodbye</string>
+            </resources>
+        ''')
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(
+            template, [stringset[3], stringset[2], stringset[0]],
+            ordered=False
+        )
+        self.assertEqual(compiled, strip_leading_spaces(u'''
+            <resources>
+                <string name="a">hello</string>
+                <string-array name="b">
+                    <item>two</item>
+                </string-array>
+                <string name="c">goodbye</string>
+            </resources>
+        '''))
+
     def test_compile_removes_missing_string_arrays(self):
         source = strip_leading_spaces('''
             <resources>
@@ -252,6 +252,52 @@ class AndroidTestCase(CommonFormatTestMixin, unittest.TestCase):
             </resources>
         '''))
 
+    def test_missing_translated_string_arrays_not_indented_removed(self):
+        random_key = generate_random_string()
+        random_strings = [generate_random_string() for _ in range(2)]
+        source = (u'<resources><string-array name="{key}"><item>{first}'
+                  '</item></string-array><string name="{key}_b">{second}'
+                  '</string></resources>').format(key=random_key,
+                                                  first=random_strings[0],
+                                                  second=random_strings[1])
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, stringset[1:])
+        self.assertEqual(compiled, (u'<resources><string name="{key}_b">'
+                                    '{second}</string></resources>').format(
+            key=random_key, second=random_strings[1]
+        ))
+
+    def test_empty_string_array_kept(self):
+        source = strip_leading_spaces(u'''
+            <resources>
+                <string-array name="a"></string-array>
+            </resources>
+        ''')
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, stringset)
+        self.assertEqual(stringset, [])
+        self.assertEqual(compiled, source)
+
+    def test_skipped_string_array_without_items_removed(self):
+        source = strip_leading_spaces(u'''
+            <resources>
+                <string-array name="a" translatable="false">
+                </string-array>
+                <string name="b">hello</string>
+            </resources>
+        ''')
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, stringset)
+        self.assertEqual(compiled, strip_leading_spaces(u'''
+            <resources>
+
+                <string name="b">hello</string>
+            </resources>
+        '''))
+
     def test_compile_plurals_not_indented(self):
         random_key = generate_random_string()
         random_singular = generate_random_string()
@@ -270,3 +316,35 @@ class AndroidTestCase(CommonFormatTestMixin, unittest.TestCase):
 
         self.assertEqual(stringset[0].__dict__, random_openstring.__dict__)
         self.assertEqual(compiled, source)
+
+    def test_string_array_items_with_attributes(self):
+        random_name = generate_random_string()
+        random_strings = [generate_random_string() for _ in range(2)]
+        random_openstrings = [
+            OpenString('{}[{}]'.format(random_name, index), string,
+                       order=index)
+            for index, string in enumerate(random_strings)
+        ]
+        source_python_template = strip_leading_spaces(u'''
+            <resources>
+                <string-array name="{key}">
+                    <item tools:ignore="MissingTranslation">{first}</item>
+                    <item>{second}</item>
+                </string-array>
+            </resources>
+        ''')
+        source = source_python_template.format(key=random_name,
+                                               first=random_strings[0],
+                                               second=random_strings[1])
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, random_openstrings)
+
+        self.assertEqual(template, source_python_template.format(
+            key=random_name,
+            first=random_openstrings[0].template_replacement,
+            second=random_openstrings[1].template_replacement
+        ))
+        self.assertEqual([string.__dict__ for string in stringset],
+                         [string.__dict__ for string in random_openstrings])
+        self.assertEqual(compiled, source)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import unittest
-import json
 
 from openformats.formats.json import ChromeI18nHandler
 
@@ -42,8 +41,6 @@ class ChromeI18nTestCase(CommonFormatTestMixin, unittest.TestCase):
         )
         # Check developer comment is empty
         self.assertEqual(stringset[0].developer_comment, "")
-        # Check the JSON dict lives in memory and contains the whole source
-        self.assertEqual(json.loads(source), self.handler.json_dict)
 
     def test_with_description(self):
         source = '{"a":{"message":"%s","description":"desc"}}'
@@ -54,6 +51,23 @@ class ChromeI18nTestCase(CommonFormatTestMixin, unittest.TestCase):
         # Check that description has been assigned to the correct field
         self.assertEqual(stringset[0].developer_comment, "desc")
 
+    def test_with_escaped_description(self):
+        source = '{"a":{"message":"%s","description":"\\"d\\u00e9sc\\""}}'
+        template, stringset = self.handler.parse(source % self.random_string)
+
+        self.assertEqual(template, source % self.random_hash)
+        self.assertEqual(stringset[0].developer_comment, u'"d\u00e9sc"')
+
+    def test_description_of_nested_strings(self):
+        source = ('{"a":{"b":{"message":"%s"},"description":"desc"},'
+                  '"c":{"message":"%s"}}')
+        template, stringset = self.handler.parse(
+            source % (self.random_string, self.random_string)
+        )
+
+        self.assertEqual([string.developer_comment for string in stringset],
+                         ["desc", ""])
+
     def test_with_template(self):
         source = '{"a":{"message":"%s","description":"desc","garbage":"text"}}'
         template, stringset = self.handler.parse(source % self.random_string)
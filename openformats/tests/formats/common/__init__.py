@@ -1,4 +1,6 @@
+import copy
 import fnmatch
+import json
 import six
 from io import open
 
@@ -83,6 +85,65 @@ class CommonFormatTestMixin(object):
         translated_content = self.handler.compile(self.tmpl, translated_strset)
         self.assertEqual(translated_content, self.data["1_el"])
 
+    def test_compile_with_compile_plan(self):
+        """Test that compiling with a (persisted) compile plan gives the same
+        result as compiling without one."""
+        compile_plan = self.handler.get_compile_plan(self.tmpl)
+        if compile_plan is None:
+            self.skipTest("handler has no compile plan")
+        compile_plan = json.loads(json.dumps(compile_plan))
+
+        translated_strset = translate_stringset(self.strset)
+        translated_content = self.handler.compile(
+            self.tmpl, translated_strset, compile_plan=compile_plan
+        )
+        self.assertEqual(translated_content, self.data["1_el"])
+
+        missing_strset = self.strset[::2]
+        self.assertEqual(
+            self.handler.compile(self.tmpl, missing_strset,
+                                 compile_plan=compile_plan),
+            self.handler.compile(self.tmpl, missing_strset)
+        )
+
+    def test_compile_ignores_stale_compile_plan(self):
+        compile_plan = self.handler.get_compile_plan(self.tmpl)
+        if compile_plan is None:
+            self.skipTest("handler has no compile plan")
+
+        # A different template of the same length
+        other_template = self.tmpl[1:] + self.tmpl[:1]
+        if other_template != self.tmpl:
+            self.assertFalse(self.handler._is_valid_compile_plan(
+                compile_plan, other_template
+            ))
+
+        compile_plan['digest'] = compile_plan['digest'][::-1]
+        self.assertEqual(
+            self.handler.compile(self.tmpl, self.strset,
+                                 compile_plan=compile_plan),
+            self.handler.compile(self.tmpl, self.strset)
+        )
+
+    def test_compile_many(self):
+        """Test that compiling many stringsets at once gives the same results
+        as compiling each one of them separately."""
+        stringsets = [('en', self.strset),
+                      ('el', translate_stringset(copy.deepcopy(self.strset)))]
+        expected = [
+            (language, self.handler.compile(copy.deepcopy(self.tmpl),
+                                            stringset))
+            for language, stringset in stringsets
+        ]
+
+        self.assertEqual(
+            list(self.handler.compile_many(self.tmpl, stringsets)), expected
+        )
+        self.assertEqual(
+            list(self.handler.compile_many(self.tmpl, dict(stringsets))),
+            list(dict(expected).items())
+        )
+
     def _test_parse_error(self, source, error_msg, parse_kwargs=None):
         """
         Test that trying to parse 'source' raises an error with a message
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
+import io
 import unittest
+from zipfile import ZipFile
 
-from openformats.formats.docx import DocxFile, DocxHandler
+import six
+
+from openformats.formats.docx import (DocxFile, DocxHandler, DocxXml,
+                                      TranslationStrings)
 from openformats.strings import OpenString
 
 
@@ -48,6 +53,29 @@ class DocxTestCase(unittest.TestCase):
         )
 
 
+    def test_entities_are_not_resolved(self):
+        path = '{}/entities.docx'.format(self.TESTFILE_BASE)
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        handler = DocxHandler()
+        template, stringset = handler.parse(content)
+
+        self.assertEqual(len(stringset), 1)
+        self.assertEqual(
+            stringset[0].string,
+            u'<tx>Hello  world </tx>'
+            u'<tx href="https://www.transifex.com/">this is a link</tx>'
+        )
+        document = ZipFile(io.BytesIO(template)).read('word/document.xml')
+        self.assertNotIn(b'Secret', document)
+        self.assertNotIn(b'Internal', document)
+
+        content = handler.compile(template, stringset)
+        document = ZipFile(io.BytesIO(content)).read('word/document.xml')
+        self.assertNotIn(b'Secret', document)
+        self.assertIn(b'Hello  world ', document)
+
     def test_docx_file(self):
         path = '{}/hello_world.docx'.format(self.TESTFILE_BASE)
         with open(path, 'rb') as f:
@@ -71,6 +99,72 @@ class DocxTestCase(unittest.TestCase):
         self.assertEqual(docx.get_document(), u'Modified Document')
         self.assertEqual(docx.get_document_rels(), u'Modified Document Rels')
 
+    def test_docx_file_keeps_other_members(self):
+        path = '{}/complex.docx'.format(self.TESTFILE_BASE)
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        docx = DocxFile(content)
+        docx.set_document(docx.get_document())
+        compressed = docx.compress()
+
+        with ZipFile(io.BytesIO(content)) as original, \
+                ZipFile(io.BytesIO(compressed)) as result:
+            self.assertEqual(original.namelist(), result.namelist())
+            for name in original.namelist():
+                if name != 'word/document.xml':
+                    self.assertEqual(original.read(name), result.read(name))
+
+    def test_docx_xml(self):
+        # Serialized like BeautifulSoup did, so older templates stay valid
+        document = DocxXml(
+            u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            u'<w:document xmlns:w="urn:w" xmlns:r="urn:r" z="1" a=\'"\'>\n'
+            u'  <w:body><w:p r:id="1" w:rsid="a&amp;b"><w:r><w:t>  </w:t>'
+            u'<w:t xml:space="preserve"> a &lt; b </w:t><w:br></w:br><!---->'
+            u'</w:r></w:p><x:ext xmlns:x="urn:x"><w:t> \n </w:t></x:ext>'
+            u'</w:body></w:document>'
+        )
+        self.assertEqual(
+            six.text_type(document),
+            u'<?xml version="1.0" encoding="utf-8"?>\n'
+            u'<w:document a=\'"\' xmlns:r="urn:r" xmlns:w="urn:w" z="1">\n'
+            u'<w:body><w:p r:id="1" w:rsid="a&amp;b"><w:r><w:t> </w:t>'
+            u'<w:t xml:space="preserve"> a &lt; b </w:t><w:br/><!-- -->'
+            u'</w:r></w:p><x:ext xmlns:x="urn:x"><w:t>\n</w:t></x:ext>'
+            u'</w:body></w:document>'
+        )
+        self.assertEqual(document.get_tag('w', 'p'), '{urn:w}p')
+
+    def test_docx_xml_index(self):
+        document_rels = DocxXml(
+            u'<Relationships xmlns="urn:r">'
+            u'<Relationship Id="rId1" Target="a"/>'
+            u'<Relationship Id="rId2" Target="b"/>'
+            u'<Relationship Id="rId1" Target="c"/>'
+            u'</Relationships>'
+        )
+        relationships = document_rels.index('Id')
+        self.assertEqual(relationships['rId1'].get('Target'), 'a')
+        self.assertEqual(relationships['rId2'].get('Target'), 'b')
+        self.assertIs(relationships[None], document_rels.root)
+
+    def test_translation_strings(self):
+        translation_strings = TranslationStrings()
+        self.assertEqual(
+            translation_strings.parse(
+                u'<tx>a</tx>  <tx href="https://a.com/">b <i>c</i></tx>'
+            ),
+            [(u'a', None), (u' ', None), (u'b ', u'https://a.com/'),
+             (u'c', u'https://a.com/')]
+        )
+        # Broken markup is split like before
+        self.assertEqual(translation_strings.parse(u'a < b <tx>c'),
+                         [(u'a ', None)])
+        self.assertEqual(translation_strings.parse(u'<<<'), [])
+        self.assertEqual(translation_strings.parse(u'a &amp; b'),
+                         [(u'a & b', None)])
+
     def test_simple_file(self):
         path = '{}/hello_world.docx'.format(self.TESTFILE_BASE)
         with open(path, 'rb') as f:
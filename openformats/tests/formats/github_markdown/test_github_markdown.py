@@ -1,7 +1,8 @@
 import unittest
 
 from openformats.tests.formats.common import CommonFormatTestMixin
-from openformats.formats.github_markdown import GithubMarkdownHandler
+from openformats.formats.github_markdown import (GithubMarkdownHandler,
+                                                split_yaml_header)
 
 
 class GithubMarkdownTestCase(CommonFormatTestMixin, unittest.TestCase):
@@ -14,3 +15,19 @@ class GithubMarkdownTestCase(CommonFormatTestMixin, unittest.TestCase):
         content_with_tab = self.handler.parse(content=u"# foo	bar")
         content_with_spaces = self.handler.parse(content=u"# foo    bar")
         self.assertEqual(content_with_tab[0], content_with_spaces[0])
+
+    def test_split_yaml_header(self):
+        self.assertEqual(split_yaml_header(u"---\ntitle: a\n---\n# b"),
+                         (u"---\n", u"title: a", u"\n---\n"))
+        # The header ends on the first separator that is not followed by
+        # another dash and has no backtick right before it
+        self.assertEqual(
+            split_yaml_header(u"---\na: `\n---\nb\n----\nc  \n--- \n-"),
+            (u"---\n", u"a: `\n---\nb\n----\nc  ", u"\n--- ")
+        )
+        # The opening's whitespace can make up an empty header
+        self.assertEqual(split_yaml_header(u"--- \n\n---\n"),
+                         (u"--- ", u"\n", u"\n---\n"))
+        for content in (u"# a\n---\nb\n---\n", u"---a\n---\n",
+                        u"---\na" + u" " * 100):
+            self.assertIsNone(split_yaml_header(content))
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 import unittest
 from io import open
+from multiprocessing.pool import ThreadPool
+
+from mock import patch
 
 from openformats.formats.indesign import InDesignHandler
 from openformats.strings import OpenString
@@ -10,6 +13,11 @@ class InDesignTestCase(unittest.TestCase):
     HANDLER_CLASS = InDesignHandler
     TESTFILE_BASE = "openformats/tests/formats/indesign/files"
 
+    @staticmethod
+    def _set_translations(handler, stringset):
+        handler.translations = {string.template_replacement: string
+                                for string in stringset}
+
     def test_parse_and_compile(self):
         """Test parsing to template and re-compiling to the initial file."""
 
@@ -47,6 +55,58 @@ class InDesignTestCase(unittest.TestCase):
         for string in stringset2:
             self.assertEqual(string.string[-3:], "_tr")
 
+    def test_parse_and_compile_with_workers(self):
+        """Test that workers give the same results as a single process."""
+
+        with open("%s/sample.idml" % self.TESTFILE_BASE, "rb") as _file:
+            _file_enc = _file.read()
+
+        template, stringset = self.HANDLER_CLASS().parse(_file_enc)
+        template2, stringset2 = self.HANDLER_CLASS().parse(_file_enc,
+                                                           workers=2)
+        self.assertEqual(template, template2)
+        self.assertEqual([(string.key, string.string, string.order)
+                          for string in stringset],
+                         [(string.key, string.string, string.order)
+                          for string in stringset2])
+
+        translations = [OpenString(string.key, u"ελ & " + string.string,
+                                   order=string.order)
+                        for string in stringset[::2]]
+        self.assertEqual(
+            self.HANDLER_CLASS().compile(template, translations),
+            self.HANDLER_CLASS().compile(template, translations, workers=2)
+        )
+
+        pool = ThreadPool(2)
+        try:
+            template3, _ = self.HANDLER_CLASS().parse(_file_enc, pool=pool)
+            compiled = self.HANDLER_CLASS().compile(template, translations,
+                                                    pool=pool)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(template, template3)
+        self.assertEqual(
+            self.HANDLER_CLASS().compile(template, translations), compiled
+        )
+
+    def test_in_parallel(self):
+        in_parallel = self.HANDLER_CLASS._in_parallel
+        self.assertFalse(in_parallel(10))
+        self.assertFalse(in_parallel(10, workers=1))
+        self.assertTrue(in_parallel(10, workers=2))
+        # Fewer stories than workers
+        self.assertFalse(in_parallel(3, workers=4))
+        self.assertTrue(in_parallel(2, pool=object()))
+        self.assertFalse(in_parallel(1, pool=object()))
+
+        # Daemonic processes can't have children
+        with patch('multiprocessing.current_process') as current_process:
+            current_process.return_value.daemon = True
+            self.assertFalse(in_parallel(10, workers=2))
+            self.assertTrue(in_parallel(10, pool=object()))
+
     def test_can_skip_content(self):
         """ Test cases when a string sould be skipped """
         handler = self.HANDLER_CLASS()
@@ -76,7 +136,7 @@ class InDesignTestCase(unittest.TestCase):
         for string in invalid_strings:
             self.assertTrue(handler._can_skip_content(string))
 
-    def test_find_and_replace_simple_story(self):
+    def test_split_and_replace_simple_story(self):
         handler = self.HANDLER_CLASS()
         simple_input = u"""
             <Story>
@@ -93,7 +153,11 @@ class InDesignTestCase(unittest.TestCase):
               <Content>  <?ACE 7?></Content>
             </Story>
         """
-        out = handler._find_and_replace(simple_input)
+        parts = handler._split_story(simple_input)
+        self.assertEqual(parts[1::2], [u"One string"])
+        self.assertEqual(u"".join(parts), simple_input)
+
+        out = handler._replace_strings(parts)
         self.assertEqual(out, simple_output)
         self.assertEqual(len(handler.stringset), 1)
 
@@ -115,10 +179,10 @@ class InDesignTestCase(unittest.TestCase):
             </Story>
         """
         handler = self.HANDLER_CLASS()
-        handler.stringset = [
+        self._set_translations(handler, [
             OpenString(u"0", u"Some string 1", order=0),
             OpenString(u"1", u"Some string 2", order=1),
-        ]
+        ])
 
         compiled_story = handler._compile_story(simple_story_template)
         self.assertEqual(compiled_story, simple_compiled_story)
@@ -141,9 +205,9 @@ class InDesignTestCase(unittest.TestCase):
             </Story>
         """
         handler = self.HANDLER_CLASS()
-        handler.stringset = [
+        self._set_translations(handler, [
             OpenString(u"0", u"Some string 1", order=0),
-        ]
+        ])
 
         compiled_story = handler._compile_story(simple_story_template)
         self.assertEqual(compiled_story, simple_compiled_story)
@@ -183,10 +247,10 @@ class InDesignTestCase(unittest.TestCase):
         """
         # strings #1 and #2 are missing from the stringset
         handler = self.HANDLER_CLASS()
-        handler.stringset = [
+        self._set_translations(handler, [
             OpenString(u"0", u"Some string 1", order=0),
             OpenString(u"3", u"Some string 2", order=3),
-        ]
+        ])
 
         first_compiled_story = handler._compile_story(
             first_story_template
@@ -197,6 +261,32 @@ class InDesignTestCase(unittest.TestCase):
         self.assertEqual(first_compiled_story, expected_first_compiled_story)
         self.assertEqual(second_compiled_story, expected_second_compiled_story)
 
+    def test_compile_story_strings_in_any_order(self):
+        story_template = u"""
+            <Story>
+              <Content>9a1c7ee2c7ce38d4bbbaf29ab9f2ac1e_tr</Content>
+              <Content>3afcdbfeb6ecfbdd0ba628696e3cc163_tr</Content>
+            </Story>
+        """
+        expected_compiled_story = u"""
+            <Story>
+              <Content>Some string 1</Content>
+              <Content>Some string 2</Content>
+            </Story>
+        """
+        handler = self.HANDLER_CLASS()
+        self._set_translations(handler, [
+            OpenString(u"1", u"Some string 2", order=1),
+            OpenString(u"2", u"Some other string", order=2),
+            OpenString(u"0", u"Some string 1", order=0),
+        ])
+
+        compiled_story = handler._compile_story(story_template)
+        self.assertEqual(compiled_story, expected_compiled_story)
+        # The string of another story is left for it
+        self.assertEqual(list(handler.translations),
+                         [OpenString(u"2", u"", order=2).template_replacement])
+
     def test_compile_story_with_amps(self):
         regular = OpenString('0', u"hello world", order=0)
         with_amp = OpenString('1', u"hello &world", order=1)
@@ -226,6 +316,8 @@ class InDesignTestCase(unittest.TestCase):
         )
 
         handler = self.HANDLER_CLASS()
-        handler.stringset = [regular, with_amp, with_amp_escaped, many_amps]
+        self._set_translations(
+            handler, [regular, with_amp, with_amp_escaped, many_amps]
+        )
         compiled_story = handler._compile_story(template)
         self.assertEqual(compiled_story, expected_compiled_story)
@@ -267,6 +267,18 @@ class JsonTestCase(CommonFormatTestMixin, unittest.TestCase):
 
         self.assertEqual(compiled, '["%s"]' % string1)
 
+    def test_skip_end_of_multiline_containers(self):
+        # The whitespace before the closing bracket goes with the removed
+        # items
+        source = (u'{\n  "a": [\n    "b",\n    2.5,\n    "c",\n    "d"\n  ],'
+                  u'\n  "e": "f",\n  "g": 2.5,\n  "h": "i"\n}')
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, stringset[:1] +
+                                        stringset[3:4])
+
+        self.assertEqual(compiled, u'{\n  "a": [\n    "b",\n    2.5],'
+                                   u'\n  "e": "f",\n  "g": 2.5}')
+
     def test_skip_middle_of_list(self):
         string1 = self.random_string
         string2 = generate_random_string()
@@ -281,6 +293,81 @@ class JsonTestCase(CommonFormatTestMixin, unittest.TestCase):
 
         self.assertEqual(compiled, '["%s", "%s"]' % (string1, string3))
 
+    def test_skip_nested_container_at_start_of_list(self):
+        string1 = self.random_string
+        string2 = generate_random_string()
+        openstring2 = OpenString('..1..', string2, order=1)
+
+        source = '[{"a": "%s"}, "%s"]' % (string1, string2)
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, [openstring2])
+
+        self.assertEqual(compiled, '[ "%s"]' % string2)
+
+    def test_translations_that_look_like_separators_are_kept(self):
+        string1 = self.random_string
+        openstring1 = OpenString('a', u'{ , }', order=0)
+
+        source = '{"a": "%s", "b": "%s"}' % (string1, generate_random_string())
+
+        template, stringset = self.handler.parse(source)
+        compiled = self.handler.compile(template, [openstring1])
+
+        self.assertEqual(compiled, '{"a": "{ , }"}')
+
+    def test_compile_removes_separators_of_missing_strings(self):
+        # singular_key, total_files, special_chars, gold_coins, something.else,
+        # something.is.going_on, something.is.wrong, custom_plural_value
+        strings = dict(enumerate(self.strset))
+        total_files = (u'"total_files": "{ item_count, plural, one {You have '
+                       u'{file_count} file.} other {You have {file_count} '
+                       u'files.} }"')
+        special_chars = (u'"special_chars": "{ cnt, plural, one {This is '
+                         u'Sam\'s book.} other {These are Sam\'s books.} }"')
+        gold_coins = (u'"gold_coins": "{ count, plural,\\n zero {The chest is '
+                      u'empty.} one {You have one gold coin.} other {You have '
+                      u'{cnt} gold coins.} \\n}"')
+        something = (u'"something": {\n    "is": {\n      "wrong": "{ sth, '
+                     u'plural, one {Something is wrong.} other {Somethings '
+                     u'are wrong.} }"\n    }\n  }')
+
+        compiled = self.handler.compile(
+            self.tmpl, [strings[index] for index in (1, 2, 3, 6)]
+        )
+        self.assertEqual(compiled, u'{\n  ' + u',\n  '.join(
+            [total_files, special_chars, gold_coins, something]
+        ) + u'}')
+
+        compiled = self.handler.compile(
+            self.tmpl, [strings[index] for index in (0, 1, 2, 3)]
+        )
+        self.assertEqual(compiled, u'{\n  ' + u',\n  '.join(
+            [u'"singular_key": "This is a regular string."', total_files,
+             special_chars, gold_coins]
+        ) + u'}')
+
+        compiled = self.handler.compile(
+            self.tmpl, [strings[index] for index in (0, 6)]
+        )
+        self.assertEqual(compiled, u'{\n  ' + u',\n  '.join(
+            [u'"singular_key": "This is a regular string."', something]
+        ) + u'}')
+
+    def test_compile_plan_of_other_template_is_ignored(self):
+        template1, _ = self.handler.parse('{"a": "hello", "bb": "world"}')
+        template2, stringset2 = self.handler.parse(
+            '{"aa": "hello", "b": "world"}'
+        )
+        self.assertEqual(len(template1), len(template2))
+
+        compile_plan = self.handler.get_compile_plan(template1)
+        self.assertEqual(
+            self.handler.compile(template2, stringset2,
+                                 compile_plan=compile_plan),
+            '{"aa": "hello", "b": "world"}'
+        )
+
     def test_invalid_json(self):
         try:
             self.handler.parse(u'jaosjf')
@@ -523,3 +523,15 @@ class PoTestCase(CommonFormatTestMixin, unittest.TestCase):
         source = "blyargh"
         with self.assertRaises(ParseError):
             self.handler.parse(source)
+
+    def test_compile_many_restores_removed_entries(self):
+        template, stringset = self.handler.parse(self.data["1_en"])
+        compiled = list(self.handler.compile_many(
+            template, [('partial', stringset[::2]), ('full', stringset)]
+        ))
+
+        _, fresh_stringset = self.handler.parse(self.data["1_en"])
+        self.assertEqual(compiled[1],
+                         ('full', self.handler.compile(self.data["1_tpl"],
+                                                       fresh_stringset)))
+        self.assertEqual(PoHandler.pofile_to_str(template), self.data["1_tpl"])
@@ -151,6 +151,26 @@ class StructuredJsonTestCase(CommonFormatTestMixin, unittest.TestCase):
                                "Was expecting whitespace or one of `[{` on "
                                "line 1, found `f` instead")
 
+    def test_strings_in_lists(self):
+        self._test_parse_error('["a"]',
+                               "Strings must be in a JSON object, found one "
+                               "in a list in line 1")
+        self._test_parse_error('[{"string": "a"},\n ["b"]]',
+                               "Strings must be in a JSON object, found one "
+                               "in a list in line 2")
+
+    def test_invalid_json_in_lists(self):
+        for source in ('["a"', '["a", ', '[{"string": "a"}, ["b"'):
+            with self.assertRaises(ParseError):
+                self.handler.parse(source)
+
+    def test_invalid_json_with_invalid_structure(self):
+        for source in ('{"a": {"string": "x", "context": {"q": 1}}',
+                       '{"a": {"string": "x", "context": 5}} x',
+                       '{"a": {"string": "x", "context": ["a"]}, "b": }'):
+            with self.assertRaises(ParseError):
+                self.handler.parse(source)
+
     def test_skipping_stuff_within_strings(self):
         source = '{"a": {"string":"b,  ,c"}}'
         template, stringset = self.handler.parse(source)
@@ -391,6 +411,18 @@ class StructuredJsonTestCase(CommonFormatTestMixin, unittest.TestCase):
         self.assertEqual(stringset[0].character_limit, None)
         self.assertEqual(stringset[0].context, "")
 
+    def test_openstring_structure_with_escaped_values(self):
+        _, stringset = self.handler.parse(
+            '{"a": {"context": "con\\"text\\"", "string":"%s", '
+            '"developer_comment": "d\\u00e9veloper\\ncomment"}}'
+            % self.random_string
+        )
+        self.assertEqual(len(stringset), 1)
+        self.assertEqual(stringset[0].string, self.random_string)
+        self.assertEqual(stringset[0].developer_comment,
+                         u"déveloper\ncomment")
+        self.assertEqual(stringset[0].context, 'con"text"')
+
     def test_pluralized_openstring_structure(self):
         _, stringset = self.handler.parse(
             '{"a": {"string":"%s", "developer_comment": "developer_comment",'
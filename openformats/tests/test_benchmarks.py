@@ -0,0 +1,88 @@
+import unittest
+
+from openformats.strings import OpenString
+
+try:
+    import benchmarks
+except ImportError:  # benchmarks/ is not installed along with openformats
+    benchmarks = None
+else:
+    from benchmarks import adversarial, escaping
+    from benchmarks.corpora import CORPORA, get_corpus
+    from benchmarks.runner import compare, drop_strings, parse_size, run_case
+
+
+@unittest.skipIf(benchmarks is None, "benchmarks package is not available")
+class BenchmarksTestCase(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("1KB"), 1024)
+        self.assertEqual(parse_size("1.5kb"), 1536)
+        self.assertEqual(parse_size("100MB"), 100 * 1024 * 1024)
+        self.assertRaises(ValueError, parse_size, "a lot")
+
+    def test_drop_strings(self):
+        stringset = [OpenString(str(i), "string {}".format(i), order=i)
+                     for i in range(10)]
+        self.assertEqual(drop_strings(stringset, 0), stringset)
+        remaining = drop_strings(stringset, 0.5)
+        self.assertEqual([string.key for string in remaining],
+                         ['0', '2', '4', '6', '8'])
+
+    def test_corpora_are_parsable(self):
+        missing = []
+        for corpus in CORPORA:
+            try:
+                corpus.handler_class
+            except ImportError:
+                # The handler's optional dependency is not installed
+                missing.append(corpus.name)
+                continue
+            content = corpus.generate(2048)
+            template, stringset = corpus.get_handler().parse(content)
+            self.assertTrue(stringset, corpus.name)
+            corpus.get_handler().compile(template, stringset)
+        if missing:
+            self.skipTest("missing dependencies of {}".format(
+                ", ".join(missing)
+            ))
+
+    def test_corpora_are_deterministic(self):
+        corpus = get_corpus("KEYVALUEJSON")
+        self.assertEqual(corpus.generate(4096), corpus.generate(4096))
+        self.assertTrue(len(corpus.generate(4096)) >= 4096)
+
+    def test_run_case(self):
+        result = run_case(get_corpus("SRT"), 1024, repeat=2, drop=0.5)
+        self.assertEqual(result['format'], "SRT")
+        self.assertTrue(result['bytes'] >= 1024)
+        self.assertTrue(result['strings'] > 0)
+        for phase in ('parse', 'compile'):
+            self.assertTrue(result[phase]['min'] <= result[phase]['mean'])
+
+    def test_compare(self):
+        def _results(parse_time):
+            return {'results': [{'format': "SRT", 'size': 1024,
+                                 'parse': {'min': parse_time},
+                                 'compile': {'min': 1.0}}]}
+
+        self.assertEqual(compare(_results(1.1), _results(1.0)), [])
+        self.assertEqual(compare(_results(2.0), _results(1.0)),
+                         [("SRT", 1024, 'parse', 2.0)])
+
+    def test_adversarial(self):
+        result = adversarial.run([200, 100], repeat=1)
+        self.assertEqual(result['sizes'], [100, 200])
+        for name, _ in adversarial.CASES:
+            self.assertEqual(len(result[name]), 2)
+            self.assertTrue(min(result[name]) >= 0)
+
+    def test_escaping(self):
+        strings = escaping.generate_strings(20)
+        self.assertEqual(len(strings), 20)
+        self.assertEqual(strings, escaping.generate_strings(20))
+
+        result = escaping.run(20, repeat=1)
+        self.assertEqual(result['count'], 20)
+        for name in ('escape', 'unescape'):
+            self.assertTrue(result[name]['many'] >= 0)
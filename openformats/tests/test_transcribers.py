@@ -0,0 +1,71 @@
+import unittest
+
+from openformats.transcribers import Transcriber
+
+
+class TranscriberSectionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = Transcriber(u"")
+
+    def _add(self, *chunks):
+        for chunk in chunks:
+            if chunk == "[":
+                self.transcriber.mark_section_start()
+            elif chunk == "]":
+                self.transcriber.mark_section_end()
+            else:
+                self.transcriber.add(chunk)
+
+    def test_remove_last_section(self):
+        self._add(u"a", "[", u"b", "]", u"c")
+        self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(), u"ac")
+
+    def test_remove_unclosed_section(self):
+        self._add(u"a", "[", u"b", u"c")
+        self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(), u"a")
+
+    def test_remove_outer_section_after_inner(self):
+        self._add(u"a", "[", u"b", "[", u"c", "]", u"d")
+        self.transcriber.remove_section()
+        self._add(u"e", "]", u"f")
+        self.assertEqual(self.transcriber.get_destination(), u"abdef")
+        self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(), u"af")
+
+    def test_remove_section_with_place(self):
+        self._add(u"a", "[", u"b", "]", "[", u"c", "]", u"d")
+        self.transcriber.remove_section(place=1)
+        self.assertEqual(self.transcriber.get_destination(), u"acd")
+        self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(), u"ad")
+
+    def test_removed_section_is_not_removed_again(self):
+        self._add(u"a", "[", u"b", "]", u"c", "[", u"d", "]")
+        self.transcriber.remove_section()
+        self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(), u"ac")
+
+    def test_remove_without_section(self):
+        self._add(u"a")
+        self.assertRaises(IndexError, self.transcriber.remove_section)
+
+    def test_many_sections(self):
+        for i in range(1000):
+            self._add("[", u"x", "]", u"y")
+            if i % 2:
+                self.transcriber.remove_section()
+        self.assertEqual(self.transcriber.get_destination(),
+                         u"xyy" * 500)
+
+
+class TranscriberLineNumberTestCase(unittest.TestCase):
+    def test_line_number(self):
+        transcriber = Transcriber(u"first\r\nsecond\r\nthird")
+        self.assertEqual(transcriber.line_number, 1)
+        transcriber.copy(len(u"first\n"))
+        self.assertEqual(transcriber.line_number, 2)
+        transcriber.skip_until(transcriber.source.index(u"third"))
+        self.assertEqual(transcriber.line_number, 3)
+        self.assertEqual(transcriber.newline_count, 2)
@@ -0,0 +1,30 @@
+import unittest
+
+from openformats.strings import OpenString
+from openformats.utils.compilers import OrderedCompilerMixin
+
+
+class OrderedCompilerMixinTestCase(unittest.TestCase):
+    def setUp(self):
+        self.compiler = OrderedCompilerMixin()
+        self.strings = [OpenString(str(i), u"string {}".format(i), order=i)
+                        for i in range(3)]
+        self.template = u"a {} b\n{}\nc {}".format(
+            *[string.template_replacement for string in self.strings]
+        )
+
+    def test_compile(self):
+        self.assertEqual(self.compiler.compile(self.template, self.strings),
+                         u"a string 0 b\nstring 1\nc string 2")
+
+    def test_missing_string_keeps_placeholder(self):
+        compiled = self.compiler.compile(self.template,
+                                         [self.strings[0], self.strings[2]])
+        self.assertEqual(compiled, u"a string 0 b\n{}\nc string 2".format(
+            self.strings[1].template_replacement
+        ))
+
+    def test_unknown_string(self):
+        string = OpenString("unknown", u"unknown", order=3)
+        self.assertRaises(ValueError, self.compiler.compile, self.template,
+                          [string])
@@ -2,6 +2,7 @@
 
 import unittest
 
+from openformats.exceptions import ParseError
 from openformats.strings import OpenString
 from openformats.utils.icu import (ICUCompiler, ICUParser, ICUString,
                                    normalize_plural_rule, PLURAL_FORMAT_NUMERIC,
@@ -112,6 +113,36 @@ class ICUParserTestCase(unittest.TestCase):
         icu_str = parser.parse('key', u'{count, plural, =1 {μπάλα} other {μπάλες}}')
         self.assertIsNone(icu_str)
 
+    def test_values_without_braces_are_not_parsed(self):
+        parser = ICUParser()
+        self.assertIsNone(parser.parse('key', u'plural, one other'))
+        self.assertIsNone(parser.parse('key', u'{cnt} tables'))
+
+    def test_cache(self):
+        parser = ICUParser(cache_size=2)
+        value = u'{count, plural, one {μπάλα} other {μπάλες}}'
+        first = parser.parse('first', value)
+        second = parser.parse('second', value)
+        self.assertEqual(first.key, 'first')
+        self.assertEqual(second.key, 'second')
+        self.assertIsNot(first, second)
+        for attr in ('string_info', 'current_position', 'string_to_replace'):
+            self.assertEqual(getattr(first, attr), getattr(second, attr))
+
+        # Only the `cache_size` most recently used values are kept
+        parser.parse('key', u'{count, plural, other {μπάλες}}')
+        parser.parse('key', value)
+        parser.parse('key', u'{count, select, other {μπάλες}}')
+        self.assertEqual(list(parser._cache),
+                         [value, u'{count, select, other {μπάλες}}'])
+
+    def test_cache_does_not_swallow_errors(self):
+        parser = ICUParser(cache_size=2)
+        value = u'{count, plural, foo {μπάλα} other {μπάλες}}'
+        for _ in range(2):
+            with self.assertRaises(ParseError):
+                parser.parse('key', value)
+
     def test_plural_rule_normalization(self):
         """The the conversions made by the normalize_plural_rule() function."""
         self.assertEqual(normalize_plural_rule('=0'), 'zero')
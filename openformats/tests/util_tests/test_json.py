@@ -1,6 +1,7 @@
 import unittest
 
-from openformats.utils.json import DumbJson
+from openformats.utils.json import (DumbJson, escape, escape_many, unescape,
+                                    unescape_many)
 
 
 class DumbJsonTestCase(unittest.TestCase):
@@ -88,6 +89,54 @@ class DumbJsonTestCase(unittest.TestCase):
         self._test_dfs('{"a": "hello world\\\\"}',
                        [('a', 2, 'hello world\\\\', 7)])
 
+    def test_escaped_quotes_in_keys(self):
+        self._test_dfs('{"a\\"b": "c", "d\\\\": "e"}',
+                       [('a\\"b', 2, 'c', 10), ('d\\\\', 15, 'e', 22)])
+
+    def test_whitespace_around_values(self):
+        self._test_dfs('[\n\t"a" ,\n\t1 ,\r\n\t[ ] ,\n\t{ "b" :\n"c" }\n]',
+                       [("a", 4), (1, 10), ([], 16),
+                        ([("b", 26, "c", 32)], 23)])
+
+    def test_unexpected_symbol(self):
+        with self.assertRaises(ValueError) as context:
+            list(DumbJson('{"a": "b",\n "c": "d" "e": "f"}'))
+        self.assertEqual(str(context.exception),
+                         "Was expecting whitespace or one of `,}` on line 2, "
+                         "found `\"` instead")
+
+    def test_unexpected_end(self):
+        with self.assertRaises(ValueError) as context:
+            list(DumbJson('{"a": "b",\n "c": "d"'))
+        self.assertEqual(str(context.exception),
+                         "Was expecting one of `,}` on line 2, found the end "
+                         "of the input instead")
+
+    # Strict mode
+    def test_strict_valid(self):
+        content = ('{"a": "b\\\\\\"\\/\\b\\f\\n\\r\\t\\u00e9", "c": [0, -0.5, '
+                   '10, 1e-5, true, null, {}],\r\n\t"d": {"e": "f"}}\n')
+        self.assertEqual(self._dfs(DumbJson(content, strict=True)),
+                         self._dfs(DumbJson(content)))
+
+    def test_strict_invalid(self):
+        for content in ('["a\\qb"]', '["a\\u00eg"]', '["a\tb"]', '[01]',
+                        '[-01]', '[1,\x0c2]', '["a"] "b"', '{"a": "b"}}',
+                        '["a]'):
+            with self.assertRaises(ValueError):
+                list(DumbJson(content, strict=True))
+
+    def test_strict_validates_embedded_containers(self):
+        with self.assertRaises(ValueError):
+            list(DumbJson('{"a": {"b": ["c\\d"]}}', strict=True))
+
+    def test_strict_trailing_content(self):
+        with self.assertRaises(ValueError) as context:
+            list(DumbJson('{"a": ["b"]}\n x', strict=True))
+        self.assertEqual(str(context.exception),
+                         "Was expecting only whitespace after the end of the "
+                         "JSON container on line 2, found `x` instead")
+
     # find_children
     def test_find_children(self):
         test_cases = [
@@ -106,6 +155,27 @@ class DumbJsonTestCase(unittest.TestCase):
             self.assertEqual(DumbJson(source).find_children(*keys),
                              expected_result)
 
+    # escape/unescape
+    def test_escape(self):
+        self.assertEqual(escape(u'plain'), u'plain')
+        self.assertEqual(escape(u'a"b\\c\b\f\n\r\t/\u00e9'),
+                         u'a\\"b\\\\c\\b\\f\\n\\r\\t/\u00e9')
+
+    def test_unescape(self):
+        self.assertEqual(unescape(u'plain'), u'plain')
+        self.assertEqual(unescape(u'a\\"b\\\\c\\/\\u00e9\\u00E9'),
+                         u'a"b\\c/\u00e9\u00e9')
+        # Unknown or incomplete escape sequences are left as they are
+        self.assertEqual(unescape(u'\\q\\u12\\u12g4\\'),
+                         u'\\q\\u12\\u12g4\\')
+        self.assertEqual(unescape(u'\\\\u00e9'), u'\\u00e9')
+
+    def test_escape_many(self):
+        strings = [u'a"b', {1: u'one\n', 5: u'other'}]
+        self.assertEqual(escape_many(strings),
+                         [u'a\\"b', {1: u'one\\n', 5: u'other'}])
+        self.assertEqual(unescape_many(escape_many(strings)), strings)
+
     # Utils
     def _test_dfs(self, content, against):
         dumb_json = DumbJson(content)
@@ -0,0 +1,25 @@
+import unittest
+
+from openformats.utils.newlines import NewlineIndex
+
+
+class NewlineIndexTestCase(unittest.TestCase):
+    def test_line_number(self):
+        index = NewlineIndex(u"a\nbc\n\nd")
+        self.assertEqual([index.line_number(i) for i in range(8)],
+                         [1, 1, 2, 2, 2, 3, 4, 4])
+        self.assertEqual(index.newline_count(7), 3)
+
+    def test_no_newlines(self):
+        index = NewlineIndex(u"abc")
+        self.assertEqual(index.line_number(3), 1)
+
+    def test_binary_source(self):
+        index = NewlineIndex(b"a\nb")
+        self.assertEqual(index.line_number(2), 2)
+
+    def test_index_is_built_lazily(self):
+        index = NewlineIndex(u"a\nb")
+        self.assertIsNone(index._positions)
+        index.line_number(2)
+        self.assertEqual(index._positions, [1])
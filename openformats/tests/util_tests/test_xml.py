@@ -27,6 +27,9 @@ class DumbXmlTestCase(unittest.TestCase):
             ('<a b="c>d" e="f"/>', 0, 'a',
              [(3, 'b', 6, "c>d"), (11, 'e', 14, "f")], {'b': "c>d", 'e': "f"},
              None, None, None, None, 18, '', 18),
+            ("<a b='c\"d' e = \"f'\"/>", 0, 'a',
+             [(3, 'b', 6, 'c"d'), (11, 'e ', 16, "f'")],
+             {'b': 'c"d', 'e ': "f'"}, None, None, None, None, 21, '', 21),
 
             # Comments
             ('<!---->', 0, NewDumbXml.COMMENT, [], {}, 4, '', '', 4, 7, '', 7),
@@ -69,6 +72,10 @@ class DumbXmlTestCase(unittest.TestCase):
                  ('<a/oiajod', "Opening tag 'a' not closed on line 1"),
                  ('<a>', "Tag 'a' not closed on line 1"),
                  ('<a>hello world', "Tag 'a' not closed on line 1"),
+                 ('<a>a<![CDATA[b</a>', "Tag 'a' not closed on line 1"),
+                 ('<a b', "Opening tag 'a' not closed on line 1"),
+                 ('<a b=', "Opening tag 'a' not closed on line 1"),
+                 ('<a b="c', "Opening tag 'a' not closed on line 1"),
                  ('<!---', "Comment not closed on line 1"),
                  ('<!--jafosijdfoas-', "Comment not closed on line 1"))
         for source, error_msg in cases:
@@ -181,6 +188,33 @@ class DumbXmlTestCase(unittest.TestCase):
                                         r'^{}$'.format(re.escape(error_msg))):
                 list(NewDumbXml(source))
 
+    def test_iter_errors_are_raised_lazily(self):
+        root = NewDumbXml('<a>1<b>2</b><c x="y">3<d/></c><e></f></a>')
+        children = root.find_children()
+        b = next(children)
+        self.assertEqual((b.tag, b.text, b.tail_position), ('b', '2', 12))
+        c = next(children)
+        self.assertEqual([inner.tag for inner in c], ['d'])
+        e = next(children)
+        self.assertEqual((e.tag, e.text), ('e', ''))
+        error_msg = "Closing tag 'f' does not match opening tag 'e' on line 1"
+        for func in (lambda: e.tail_position, lambda: next(children),
+                     lambda: root.tail):
+            with self.assertRaisesRegexp(DumbXmlSyntaxError,
+                                        r'^{}$'.format(re.escape(error_msg))):
+                func()
+
+    def test_children_share_the_index(self):
+        root = NewDumbXml('<a><b><c/></b><!-- d --><e/></a>')
+        first, second = list(root), list(root)
+        self.assertEqual([child.tag for child in first],
+                         ['b', NewDumbXml.COMMENT, 'e'])
+        self.assertEqual([child.element for child in first],
+                         [child.element for child in second])
+        for child in first + second + list(first[0]):
+            self.assertIs(child.index, root.index)
+        self.assertEqual(len(root.index.positions), 5)
+
     def test_inbetweens(self):
         root = NewDumbXml('<a>This<b/>is<c/>separated<d/>by<e/>tags</a>')
         collected = [root.text]
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+import zipfile
+
+from openformats.utils.zip import rewrite_zip
+
+
+class RewriteZipTestCase(unittest.TestCase):
+    def setUp(self):
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, 'w') as archive:
+            archive.writestr('mimetype', b'application/test',
+                             compress_type=zipfile.ZIP_STORED)
+            archive.writestr(zipfile.ZipInfo('a.xml', (2020, 1, 2, 3, 4, 6)),
+                             b'<a>hello</a>' * 10,
+                             compress_type=zipfile.ZIP_DEFLATED)
+            archive.writestr(u'β.bin', b'\x00\x01' * 100,
+                             compress_type=zipfile.ZIP_DEFLATED)
+            archive.comment = b'a comment'
+        self.content = out.getvalue()
+
+    def test_nothing_replaced(self):
+        result = rewrite_zip(self.content, {})
+        self._assert_members(result, [
+            ('mimetype', b'application/test'),
+            ('a.xml', b'<a>hello</a>' * 10),
+            (u'β.bin', b'\x00\x01' * 100),
+        ])
+        self.assertEqual(zipfile.ZipFile(io.BytesIO(result)).comment,
+                         b'a comment')
+
+    def test_replaced(self):
+        result = rewrite_zip(self.content, {'a.xml': b'<a>world</a>',
+                                            'mimetype': b'application/b'})
+        self._assert_members(result, [
+            ('mimetype', b'application/b'),
+            ('a.xml', b'<a>world</a>'),
+            (u'β.bin', b'\x00\x01' * 100),
+        ])
+
+        original = zipfile.ZipFile(io.BytesIO(self.content))
+        archive = zipfile.ZipFile(io.BytesIO(result))
+        for name in (u'mimetype', u'a.xml', u'β.bin'):
+            for attr in ('compress_type', 'date_time', 'external_attr',
+                         'create_system'):
+                self.assertEqual(getattr(archive.getinfo(name), attr),
+                                 getattr(original.getinfo(name), attr))
+        # Untouched members are not compressed again
+        self.assertEqual(archive.getinfo(u'β.bin').compress_size,
+                         original.getinfo(u'β.bin').compress_size)
+
+    def test_data_descriptors(self):
+        # Archives written to unseekable streams have data descriptors
+        class Unseekable(io.RawIOBase):
+            def __init__(self):
+                self.buffer = io.BytesIO()
+
+            def writable(self):
+                return True
+
+            def write(self, data):
+                return self.buffer.write(data)
+
+        out = Unseekable()
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('a.xml', b'<a>hello</a>')
+            archive.writestr('b.xml', b'<b>hello</b>')
+        content = out.buffer.getvalue()
+
+        result = rewrite_zip(content, {'b.xml': b'<b>world</b>'})
+        self._assert_members(result, [('a.xml', b'<a>hello</a>'),
+                                      ('b.xml', b'<b>world</b>')])
+
+    def test_missing_member(self):
+        with self.assertRaises(KeyError):
+            rewrite_zip(self.content, {'missing.xml': b''})
+
+    def _assert_members(self, content, members):
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(
+            [(info.filename, archive.read(info))
+             for info in archive.infolist()],
+            members
+        )
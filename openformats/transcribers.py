@@ -1,6 +1,9 @@
+from bisect import bisect_left, bisect_right
+
 import six
 
-from .utils.newlines import find_newline_type, force_newline_type
+from .utils.newlines import (NewlineIndex, find_newline_type,
+                             force_newline_type)
 
 
 class Transcriber(object):
@@ -80,27 +83,28 @@ class Transcriber(object):
         self.destination = []
         self.ptr = 0
 
-        self.newline_count = 0
+        # Positions of the section markers that are still present in
+        # 'destination', in ascending order, so that 'remove_section' doesn't
+        # have to search for them
+        self._section_starts = []
+        self._section_ends = []
 
         # Handle newlines
         self.newline_type = find_newline_type(self.source)
         if self.newline_type == 'DOS':
             self.source = force_newline_type(self.source, 'UNIX')
+        self.newline_index = NewlineIndex(self.source)
 
     def copy(self, offset):
         chunk = self.source[self.ptr:self.ptr + offset]
         self.destination.append(chunk)
         self.ptr += offset
 
-        self.newline_count += chunk.count('\n')
-
     def copy_until(self, end):
         chunk = self.source[self.ptr:end]
         self.destination.append(chunk)
         self.ptr = end
 
-        self.newline_count += chunk.count('\n')
-
     def copy_to_end(self):
         self.copy_until(len(self.source))
 
@@ -108,21 +112,17 @@ class Transcriber(object):
         self.destination.append(text)
 
     def skip(self, offset):
-        chunk = self.source[self.ptr:self.ptr + offset]
-        self.newline_count += chunk.count('\n')
-
         self.ptr += offset
 
     def skip_until(self, end):
-        chunk = self.source[self.ptr:end]
-        self.newline_count += chunk.count('\n')
-
         self.ptr = end
 
     def mark_section_start(self):
+        self._section_starts.append(len(self.destination))
         self.destination.append(self.SectionStart)
 
     def mark_section_end(self):
+        self._section_ends.append(len(self.destination))
         self.destination.append(self.SectionEnd)
 
     def remove_section(self, place=0):
@@ -190,32 +190,40 @@ class Transcriber(object):
 
             <asdf>
         """
-        section_start_position = self._find_last_section_start(place)
-        try:
-            section_end_position = self.destination.index(
-                self.SectionEnd, section_start_position
-            )
-        except ValueError:
+        # `place` counts section starts backwards from the last one
+        start_index = len(self._section_starts) - 1 - place
+        if start_index < 0:
+            raise IndexError("No section start to remove")
+        section_start_position = self._section_starts[start_index]
+
+        end_index = bisect_left(self._section_ends, section_start_position)
+        if end_index < len(self._section_ends):
+            section_end_position = self._section_ends[end_index]
+            del self._section_ends[end_index]
+        else:
             section_end_position = len(self.destination) - 1
+
         for i in six.moves.xrange(section_start_position,
                                   section_end_position + 1):
             self.destination[i] = None
 
-    def _find_last_section_start(self, place=0):
-        count = place
-        for i, segment in enumerate(self.destination[::-1], start=1):
-            if segment == self.SectionStart:
-                if count == 0:
-                    return len(self.destination) - i
-                else:
-                    count -= 1
+        # Forget the section starts that were removed along with the section
+        del self._section_starts[
+            start_index:bisect_right(self._section_starts,
+                                     section_end_position, start_index)
+        ]
+
+    @property
+    def newline_count(self):
+        return self.newline_index.newline_count(self.ptr)
 
     @property
     def line_number(self):
         r"""
-        The transcriber remembers how many newlines it has went over on the
+        The transcriber can tell how many newlines it has went over on the
         source, both when copying and skipping content. This allows you to
-        pinpoint the line-number a parse-error has occured. For example::
+        pinpoint the line-number a parse-error has occured. The newlines are
+        only located the first time this is asked for. For example::
 
             source:
                 first line
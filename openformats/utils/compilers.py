@@ -8,6 +8,7 @@ from openformats.utils.compat import ensure_unicode
 
 class OrderedCompilerMixin(object):
     SPACE_PAT = r'^\s*$'
+    PLACEHOLDER_PAT = r'[0-9a-f]{32}_(?:tr|pl)'
 
     def compile(self, template, stringset, **kwargs):
         # Fix regex encoding
@@ -16,9 +17,13 @@ class OrderedCompilerMixin(object):
         # assume stringset is ordered within the template
         transcriber = Transcriber(template)
         template = transcriber.source
+        placeholders = self._get_placeholders(template,
+                                              kwargs.get('compile_plan'))
 
         for string in stringset:
-            hash_position = template.index(string.template_replacement)
+            hash_position = self._find_placeholder(
+                template, placeholders, string.template_replacement
+            )
             if not string.pluralized:
                 transcriber.copy_until(hash_position)
                 transcriber.add(string.string)
@@ -26,16 +31,13 @@ class OrderedCompilerMixin(object):
             else:
                 # if the hash is on its own on a line with only spaces, we have
                 # to remember it's indent
-                indent_length = template[hash_position::-1].index('\n') - 1
+                hash_end = hash_position + len(string.template_replacement)
+                indent_length = (
+                    hash_position - template.rindex('\n', 0, hash_position) - 1
+                )
                 indent = template[hash_position - indent_length:hash_position]
-                tail_length = template[
-                    hash_position + len(string.template_replacement):
-                ].index('\n')
-                tail = template[
-                    hash_position + len(string.template_replacement):
-                    hash_position + len(string.template_replacement) +
-                    tail_length
-                ]
+                tail_length = template.index('\n', hash_end) - hash_end
+                tail = template[hash_end:hash_end + tail_length]
                 if (space_pattern.search(indent) and
                         space_pattern.search(tail)):
                     transcriber.copy_until(hash_position - indent_length)
@@ -62,3 +64,35 @@ class OrderedCompilerMixin(object):
         compiled = transcriber.get_destination()
 
         return compiled
+
+    def get_compile_plan(self, template):
+        template = Transcriber(template).source
+        return self._create_compile_plan(
+            template, placeholders=self._index_placeholders(template)
+        )
+
+    def _get_placeholders(self, template, compile_plan=None):
+        if (compile_plan is not None and
+                self._is_valid_compile_plan(compile_plan, template)):
+            return compile_plan['placeholders']
+        return self._index_placeholders(template)
+
+    def _index_placeholders(self, template):
+        """ Map every placeholder in the template to the position of its first
+            occurrence, so that strings can be located without searching the
+            template from its start every time.
+        """
+
+        placeholders = {}
+        pattern = re.compile(ensure_unicode(self.PLACEHOLDER_PAT))
+        for match in pattern.finditer(template):
+            placeholders.setdefault(match.group(), match.start())
+        return placeholders
+
+    @staticmethod
+    def _find_placeholder(template, placeholders, template_replacement):
+        try:
+            return placeholders[template_replacement]
+        except KeyError:
+            # Raises the same ValueError as before if it's not there
+            return template.index(template_replacement)
@@ -1,4 +1,7 @@
+import copy
 import re
+import threading
+from collections import OrderedDict
 
 import pyparsing
 import six
@@ -21,6 +24,49 @@ PLURAL_FORMAT_STRING = 0
 # Corresponds to the `<rule_str>` syntax, e.g. `one`
 PLURAL_FORMAT_NUMERIC = 1
 
+_NOT_CACHED = object()
+
+# Matches '{ <keyword>, <argument>, <serialized strings> }'. The whitespace
+# before <serialized strings> is matched atomically (the lookahead captures
+# all of it and the backreference consumes it without ever giving any of it
+# back), otherwise it overlaps with `.*` and values with a long run of
+# whitespace and no closing brace need quadratic time to be rejected
+ICU_PAT = re.compile(ensure_unicode(
+    r'\s*{\s*(?P<keyword>[A-Za-z-_\d]+)\s*,\s*(?P<argument>[A-Za-z_]+)\s*,'
+    r'(?=(?P<whitespace>\s*))(?P=whitespace)(?P<serialized_strings>.*)}\s*'
+))
+
+
+def _plural_item(rule):
+    """Return a pyparsing element that matches '<rule> {<content>}' and
+    returns the original text it matched. Nested braces ({}) inside
+    <content> are allowed.
+
+    Note:
+    Be sure to ignore single quotes ('), otherwise strings that include
+    one quote in one plural and another one in another plural, will be
+    parsed as pluralized but with less rules than they actually have.
+    (matching will actually include content from multiple rules combined,
+    instead of separating the content per rule). This seems like a
+    pyparsing bug. Any other character that could be a potential
+    separator doesn't seem cause any problem.
+    """
+    return pyparsing.originalTextFor(
+        rule +
+        pyparsing.nestedExpr('{', '}', ignoreExpr=pyparsing.Literal("'"))
+    )
+
+
+# The pyparsing grammars are built once, since that is a lot more expensive
+# than using them
+NUMERIC_PLURAL_ITEM = _plural_item(pyparsing.oneOf(NUMERIC_RULES))
+VALID_PLURAL_ITEM = _plural_item(pyparsing.oneOf(SUPPORTED_PLURAL_RULES))
+ANY_PLURAL_ITEM = (
+    pyparsing.Word('=' + pyparsing.alphanums) +
+    pyparsing.nestedExpr('{', '}', ignoreExpr=pyparsing.Literal("'"))
+)
+ANY_PLURAL_ITEM_TEXT = pyparsing.originalTextFor(ANY_PLURAL_ITEM)
+
 
 def normalize_plural_rule(rule_str):
     """Returns the equivalent rule name as 'one', 'two', etc.
@@ -154,7 +200,7 @@ class ICUParser(object):
 
     PLURAL_ARG = 'plural'
 
-    def __init__(self, allow_numeric_plural_values=True):
+    def __init__(self, allow_numeric_plural_values=True, cache_size=0):
         """Constructor.
 
         If you are planning to use the ICU parser for a file format
@@ -169,8 +215,16 @@ class ICUParser(object):
             the `=N` syntax will yield a valid pluralized ICUString,
             otherwise if there is such a syntax, and this parameter
             is False, a ParseError will be raised on parse()
+        :param int cache_size: if positive, remember the outcome of parsing
+            up to that many distinct values, evicting the least recently
+            used ones first, so that values that are encountered again
+            (eg the same plural under a different key or in another file)
+            are not parsed again
         """
         self.allow_numeric_plural_values = allow_numeric_plural_values
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def parse(self, key, value):
         """
@@ -197,16 +251,42 @@ class ICUParser(object):
         :raise ParseError: if the given string looks a lot like
             an ICU plural string but has an invalid structure
         """
-        matches = re.match(
-            ensure_unicode(
-                r'\s*{\s*([A-Za-z-_\d]+)\s*,\s*([A-Za-z_]+)\s*,\s*(.*)}\s*'
-            ),
-            value
-        )
+        # Most values are not ICU strings at all
+        if u'{' not in value:
+            return None
+
+        if self.cache_size <= 0:
+            return self._parse(key, value)
+
+        with self._cache_lock:
+            icu_string = self._cache.pop(value, _NOT_CACHED)
+            if icu_string is not _NOT_CACHED:
+                # Mark as the most recently used
+                self._cache[value] = icu_string
+        if icu_string is _NOT_CACHED:
+            icu_string = self._parse(key, value)
+            with self._cache_lock:
+                self._cache[value] = icu_string
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        if icu_string is None:
+            return None
+        # Callers may modify what they get back, so never hand out the cached
+        # object itself
+        icu_string = copy.copy(icu_string)
+        icu_string.key = key
+        icu_string.string_info = list(icu_string.string_info)
+        return icu_string
+
+    def _parse(self, key, value):
+        matches = ICU_PAT.match(value)
         if not matches:
             return None
 
-        keyword, argument, serialized_strings = matches.groups()
+        keyword, argument, serialized_strings = matches.group(
+            'keyword', 'argument', 'serialized_strings',
+        )
 
         if argument == ICUParser.PLURAL_ARG:
             return self._parse_pluralized_string(
@@ -229,7 +309,7 @@ class ICUParser(object):
             e.g. 'one { I ate {cnt} apple. } other { I ate {cnt} apples. }'
         :return: A pluralized ICUString instance or None
         """
-        if not self.allow_numeric_plural_values:
+        if not self.allow_numeric_plural_values and u'=' in serialized_strings:
             # The official ICU standard supports the numeric (`=N`)
             # syntax notation. Instead of providing the name of the plural
             # rule, you can define an integer rule instead, e.g. "=1" or "=2".
@@ -239,51 +319,25 @@ class ICUParser(object):
             # for backwards compatibility: if it's True, and the string is
             # following the =N syntax, we need to stop parsing this string
             # as pluralized and return None.
-            equality_item = (
-                pyparsing.oneOf(NUMERIC_RULES) +
-                pyparsing.nestedExpr('{', '}', ignoreExpr=pyparsing.Literal("'"))
+            equality_matches = NUMERIC_PLURAL_ITEM.searchString(
+                serialized_strings
             )
-            equality_matches = pyparsing.originalTextFor(equality_item)\
-                .searchString(serialized_strings)
 
             # If any match is found using this syntax, do not parse this
             # as pluralized
             if len(equality_matches) > 0:
                 return None
 
-        # Each item should be like '<proper_plurality_rule_str> {<content>}'
-        # Nested braces ({}) inside <content> are allowed.
-        #
-        # Note:
-        # Be sure to ignore single quotes ('), otherwise strings that include
-        # one quote in one plural and another one in another plural, will be
-        # parsed as pluralized but with less rules than they actually have.
-        # (matching will actually include content from multiple rules combined,
-        # instead of separating the content per rule). This seems like a
-        # pyparsing bug. Any other character that could be a potential
-        # separator doesn't seem cause any problem.
-        valid_plural_item = (
-            pyparsing.oneOf(SUPPORTED_PLURAL_RULES) +
-            pyparsing.nestedExpr('{', '}', ignoreExpr=pyparsing.Literal("'"))
-        )
-
         # Create a list of serialized plural items, e.g.:
         # ['one { I ate {count} apple. }']
-        valid_matches = pyparsing.originalTextFor(valid_plural_item)\
-            .searchString(serialized_strings)
+        # Each item should be like '<proper_plurality_rule_str> {<content>}'
+        valid_matches = VALID_PLURAL_ITEM.searchString(serialized_strings)
 
         # We need to make sure that the plural rules are valid.
         # Therefore, we also match any <alphanumeric> {<content>} string
         # and see if there are differences compared to the valid results
         # we got above.
-        any_plural_item = (
-            pyparsing.Word('=' + pyparsing.alphanums) +
-            pyparsing.nestedExpr('{', '}', ignoreExpr=pyparsing.Literal("'"))
-        )
-
-        all_matches = pyparsing.originalTextFor(any_plural_item).searchString(
-            serialized_strings
-        )
+        all_matches = ANY_PLURAL_ITEM_TEXT.searchString(serialized_strings)
 
         self._validate_plural_content_format(
             key, serialized_strings, all_matches,
@@ -293,7 +347,7 @@ class ICUParser(object):
         # If not, an error will be raised
         if len(valid_matches) != len(all_matches):
             self._handle_invalid_plural_format(
-                serialized_strings, any_plural_item, key, value
+                serialized_strings, ANY_PLURAL_ITEM, key, value
             )
 
         # Create a list of tuples [(plurality_str, content_with_braces)]
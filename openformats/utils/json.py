@@ -5,6 +5,8 @@ import re
 
 import six
 
+from .newlines import NewlineIndex
+
 
 class DumbJson(object):
     """ A utility to help iterate over a JSON string. The main focuses are:
@@ -54,6 +56,20 @@ class DumbJson(object):
 
             >>> assert list(DumbJson('{"a": null}')) == [("a", 2, None, 6)]
             >>> assert list(DumbJson('[null]')) == [(None, 2)]
+
+        DumbJson is lenient by default; it will happily iterate over some
+        strings that aren't valid JSON, like '["a\\qb"]'. Pass `strict=True`
+        to make it validate everything it goes over, raising a ValueError for
+        invalid escape sequences, unescaped control characters in strings,
+        numbers with leading zeros, non-JSON whitespace or anything other
+        than whitespace after the end of the outermost container. Since
+        validation happens while iterating, the source is only known to be
+        valid after the outermost container has been iterated over
+        completely (in a DFS manner):
+
+            >>> list(DumbJson('["a"] "b"', strict=True))
+            ValueError: Was expecting only whitespace after the end of the
+            JSON container on line 1, found `"` instead
     """
 
     # Symbols
@@ -66,11 +82,48 @@ class DumbJson(object):
     CARRIAGE_RETURN = u'\r'
     TAB = u'\t'
 
-    def __init__(self, source, start=0):
+    # Patterns, matched in place against the source with `pattern.match(
+    # source, position)` so that the rest of the document is never copied
+    WHITESPACE_PAT = re.compile(r'\s*', re.UNICODE)
+    STRICT_WHITESPACE_PAT = re.compile(r'[ \t\n\r]*')
+    # Everything up to (including) the first double quote that isn't escaped
+    STRING_END_PAT = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+    # Same, but only allowing the escape sequences and characters that are
+    # valid within JSON strings
+    STRICT_STRING_END_PAT = re.compile(
+        r'[^"\\\x00-\x1f]*'
+        r'(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"'
+    )
+    LEADING_ZERO_PAT = re.compile(r'-?0\d', re.UNICODE)
+    VALUE_PAT = re.compile(
+        r'{dict_list_string}|{true_false_null}|'
+        r'{e_notation}|{_float}|{integer}'.format(
+            dict_list_string=r'[{\["]',
+            true_false_null=r'true|false|null',
+            e_notation=r'-?\d+e-?\d+',
+            _float=r'-?\d+\.\d+',
+            integer=r'-?\d+',
+        ),
+        re.UNICODE
+    )
+
+    def __init__(self, source, start=0, newline_index=None, strict=False):
         self.source = source
+        # Only the outermost container checks what follows it in strict mode
+        self._is_outermost = newline_index is None
+        # Shared with all the containers embedded in this one
+        if newline_index is None:
+            newline_index = NewlineIndex(source)
+        self.newline_index = newline_index
+        self.strict = strict
+        if strict:
+            self._whitespace_pat = self.STRICT_WHITESPACE_PAT
+            self._string_end_pat = self.STRICT_STRING_END_PAT
+        else:
+            self._whitespace_pat = self.WHITESPACE_PAT
+            self._string_end_pat = self.STRING_END_PAT
         self._end = None
-        starting_symbol, self.start = self._find_next('{[', start,
-                                                      require_whitespace=True)
+        starting_symbol, self.start = self._find_next('{[', start)
         if starting_symbol == '{':
             self.type = dict
         elif starting_symbol == '[':
@@ -90,22 +143,18 @@ class DumbJson(object):
         start = self.start + 1
 
         # Maybe it's an empty dict
-        end, end_p = self._find_next([self.DOUBLE_QUOTES, '}'], start,
-                                     require_whitespace=True)
+        end, end_p = self._expect([self.DOUBLE_QUOTES, '}'], start)
         if end == "}":
-            self.end = end_p
+            self._set_end(end_p)
             return
 
         while True:
             # Lets find our key
-            _, start_key_quote_p = self._find_next(self.DOUBLE_QUOTES, start,
-                                                   require_whitespace=True)
+            _, start_key_quote_p = self._expect(self.DOUBLE_QUOTES, start)
             key_p = start_key_quote_p + 1
-            _, end_key_quote_p = self._find_next(self.DOUBLE_QUOTES, key_p,
-                                                 require_whitespace=False)
+            end_key_quote_p = self._find_closing_quote(key_p)
             key = self.source[key_p:end_key_quote_p]
-            _, colon_p = self._find_next(':', end_key_quote_p + 1,
-                                         require_whitespace=True)
+            _, colon_p = self._expect(':', end_key_quote_p + 1)
             value_start_string, value_start_computed, value_start_p =\
                 self._process_value(colon_p + 1)
 
@@ -114,15 +163,13 @@ class DumbJson(object):
             if value_start_string == self.DOUBLE_QUOTES:
                 # We found a string!
                 value_p = value_start_p + 1
-                _, value_end_quote_p = self._find_next(
-                    self.DOUBLE_QUOTES, value_p, require_whitespace=False
-                )
+                value_end_quote_p = self._find_closing_quote(value_p)
                 value = self.source[value_p:value_end_quote_p]
                 yield key, key_p, value, value_p
                 next_p = value_end_quote_p + 1
             elif value_start_string in ('{', '['):
                 # We found an embedded, lets return an instance of ourself
-                embedded = DumbJson(self.source, value_start_p)
+                embedded = self._embedded(value_start_p)
                 yield key, key_p, embedded, value_start_p
                 next_p = embedded.end + 1
             elif (value_start_computed is not None or
@@ -134,13 +181,11 @@ class DumbJson(object):
                 # Something went wrong
                 raise ValueError("No JSON value could be decoded")
 
-            next_symbol, next_symbol_p = self._find_next(
-                ',}', next_p, require_whitespace=True
-            )
+            next_symbol, next_symbol_p = self._expect(',}', next_p)
             if next_symbol == ',':
                 start = next_symbol_p + 1
-            elif next_symbol == '}':
-                self.end = next_symbol_p
+            else:
+                self._set_end(next_symbol_p)
                 break
 
     def _iter_list(self):
@@ -149,11 +194,10 @@ class DumbJson(object):
         start = self.start + 1
 
         # Maybe it's an empty list
-        match = re.search(r'^\s*.', self.source[start:])
-        if match:
-            if match.group()[-1] == "]":
-                self.end = start + match.end() - 1
-                return
+        first_p = self._whitespace_pat.match(self.source, start).end()
+        if self.source[first_p:first_p + 1] == "]":
+            self._set_end(first_p)
+            return
 
         while True:
             # Lets find our items
@@ -165,15 +209,13 @@ class DumbJson(object):
             if item_start_string == self.DOUBLE_QUOTES:
                 # We found a string!
                 item_p = item_start_p + 1
-                _, end_item_quote_p = self._find_next(self.DOUBLE_QUOTES,
-                                                      item_p,
-                                                      require_whitespace=False)
+                end_item_quote_p = self._find_closing_quote(item_p)
                 item = self.source[item_p:end_item_quote_p]
                 yield item, item_p
                 next_p = end_item_quote_p + 1
             elif item_start_string in ('{', '['):
                 # We found an embedded, lets return an instance of ourself
-                embedded = DumbJson(self.source, item_start_p)
+                embedded = self._embedded(item_start_p)
                 yield embedded, item_start_p
                 next_p = embedded.end + 1
             elif (item_start_computed is not None or
@@ -185,40 +227,79 @@ class DumbJson(object):
                 # Something went wrong
                 raise ValueError("No JSON value could be decoded")
 
-            next_symbol, next_symbol_p = self._find_next(
-                ',]', next_p, require_whitespace=True
-            )
+            next_symbol, next_symbol_p = self._expect(',]', next_p)
             if next_symbol == ',':
                 start = next_symbol_p + 1
-            elif next_symbol == ']':
-                self.end = next_symbol_p
+            else:
+                self._set_end(next_symbol_p)
                 break
 
-    def _find_next(self, symbols, start=0, require_whitespace=True):
-        symbols = {s for s in symbols}
-        after_backslash = False
-        for ptr in six.moves.xrange(start, len(self.source)):
-            candidate = self.source[ptr]
-            if candidate == '\\':
-                after_backslash = not after_backslash
-            if candidate in symbols:
-                if candidate == self.DOUBLE_QUOTES and after_backslash:
-                    after_backslash = False
-                    continue
-                return candidate, ptr
-            if candidate != '\\':
-                after_backslash = False
-            if require_whitespace and not candidate.isspace():
-                newline_count = self.source.count(self.NEWLINE, 0, ptr)
-                raise ValueError(
-                    u"Was expecting whitespace or one of `{symbols}` on line "
-                    u"{line_no}, found `{candidate}` instead".format(
-                        symbols=''.join(sorted(symbols)),
-                        line_no=newline_count + 1,
-                        candidate=candidate,
-                    )
+    def _find_next(self, symbols, start=0):
+        """ Skip whitespace after `start` and return the next symbol and its
+            position, as long as it is one of `symbols`. Returns
+            `(None, None)` if the end of the source is reached first.
+        """
+
+        ptr = self._whitespace_pat.match(self.source, start).end()
+        if ptr == len(self.source):
+            return None, None
+        candidate = self.source[ptr]
+        if candidate in symbols:
+            return candidate, ptr
+        raise ValueError(
+            u"Was expecting whitespace or one of `{symbols}` on line "
+            u"{line_no}, found `{candidate}` instead".format(
+                symbols=''.join(sorted(set(symbols))),
+                line_no=self.newline_index.line_number(ptr),
+                candidate=candidate,
+            )
+        )
+
+    def _expect(self, symbols, start):
+        """ Like `_find_next`, but the end of the source is an error too. """
+
+        symbol, ptr = self._find_next(symbols, start)
+        if symbol is None:
+            raise ValueError(
+                u"Was expecting one of `{symbols}` on line {line_no}, found "
+                u"the end of the input instead".format(
+                    symbols=''.join(sorted(set(symbols))),
+                    line_no=self.newline_index.line_number(len(self.source)),
+                )
+            )
+        return symbol, ptr
+
+    def _find_closing_quote(self, start):
+        """ Return the position of the first double quote after `start` that
+            isn't escaped with a backslash.
+        """
+
+        match = self._string_end_pat.match(self.source, start)
+        if match is None:
+            raise ValueError(
+                u"Unterminated or invalid string starting on line "
+                u"{}".format(self.newline_index.line_number(start - 1))
+            )
+        return match.end() - 1
+
+    def _embedded(self, start):
+        return DumbJson(self.source, start, self.newline_index,
+                        strict=self.strict)
+
+    def _set_end(self, end):
+        self.end = end
+        if not (self.strict and self._is_outermost):
+            return
+        ptr = self._whitespace_pat.match(self.source, end + 1).end()
+        if ptr != len(self.source):
+            raise ValueError(
+                u"Was expecting only whitespace after the end of the JSON "
+                u"container on line {line_no}, found `{candidate}` "
+                u"instead".format(
+                    line_no=self.newline_index.line_number(ptr),
+                    candidate=self.source[ptr],
                 )
-        return None, None
+            )
 
     def _process_value(self, start):
         """ A variation of _find_next. If the next non-empty character after
@@ -237,26 +318,23 @@ class DumbJson(object):
             - value_start_p: where the value, whatever it is, is encountered
         """
 
-        # Lets construct a regular expression to find the first non-empty char
-        value_pat = r'{dict_list_string}|{true_false_null}|{e_notation}|'\
-            r'{_float}|{integer}'.format(
-                dict_list_string=r'[{\["]',
-                true_false_null=r'true|false|null',
-                e_notation=r'-?\d+e-?\d+',
-                _float=r'-?\d+\.\d+',
-                integer=r'-?\d+',
-            )
-        first_non_empty = r'^(?P<spaces>\s*)(?P<value>{})'.format(value_pat)
-        match = re.search(first_non_empty, self.source[start:])
+        value_start = self._whitespace_pat.match(self.source, start).end()
+        match = self.VALUE_PAT.match(self.source, value_start)
         # We probably found a match, otherwise this is not JSON
         if match:
-            spaces, value = match.groups()
-            value_start = start + len(spaces)
+            value = match.group()
             if value in ('{', '[', self.DOUBLE_QUOTES):
                 return value, None, value_start
-            else:
-                # We either have true/false/null or a number of sorts
-                return value, json.loads(value), value_start
+            if self.strict and self.LEADING_ZERO_PAT.match(value):
+                raise ValueError(
+                    u"Numbers cannot have leading zeros, found `{value}` on "
+                    u"line {line_no}".format(
+                        value=value,
+                        line_no=self.newline_index.line_number(value_start),
+                    )
+                )
+            # We either have true/false/null or a number of sorts
+            return value, json.loads(value), value_start
         else:
             raise ValueError("No JSON value could be decoded")
 
@@ -300,107 +378,98 @@ class DumbJson(object):
         return [(found.get(key, (None, None))) for key in keys]
 
 
+# Maps every character that `escape` has to replace to its escape sequence
+ESCAPE_TABLE = {
+    DumbJson.DOUBLE_QUOTES: u'\\"',
+    DumbJson.BACKSLASH: u'\\\\',
+    DumbJson.BACKSPACE: u'\\b',
+    DumbJson.FORMFEED: u'\\f',
+    DumbJson.NEWLINE: u'\\n',
+    DumbJson.CARRIAGE_RETURN: u'\\r',
+    DumbJson.TAB: u'\\t',
+}
+ESCAPE_PAT = re.compile(u'[{}]'.format(re.escape(u''.join(ESCAPE_TABLE))))
+
+# The reverse of ESCAPE_TABLE, plus the optional escaping of forward slashes
+UNESCAPE_TABLE = {
+    u'\\"': DumbJson.DOUBLE_QUOTES,
+    u'\\/': DumbJson.FORWARD_SLASH,
+    u'\\\\': DumbJson.BACKSLASH,
+    u'\\b': DumbJson.BACKSPACE,
+    u'\\f': DumbJson.FORMFEED,
+    u'\\n': DumbJson.NEWLINE,
+    u'\\r': DumbJson.CARRIAGE_RETURN,
+    u'\\t': DumbJson.TAB,
+}
+# Escape sequences that are not recognized (eg '\q' or '\u12') are left
+# untouched
+UNESCAPE_PAT = re.compile(r'\\(?:["/\\bfnrt]|u[0-9a-fA-F]{4})')
+
+
 def escape(string):
-    return u''.join(_escape_generator(string))
+    """ Escape double quotes, backslashes and the `\\b\\f\\n\\r\\t` control
+        characters of `string` so that it can be placed within the double
+        quotes of a JSON string. Strings with nothing to escape are returned
+        as they are.
+    """
+
+    # `sub` returns strings without any matches as they are
+    return ESCAPE_PAT.sub(_escape_match, string)
     # btw, this seems equivalent to
     # return json.dumps(string, ensure_ascii=False)[1:-1]
 
 
-def _escape_generator(string):
-    for symbol in string:
-        if symbol == DumbJson.DOUBLE_QUOTES:
-            yield DumbJson.BACKSLASH
-            yield DumbJson.DOUBLE_QUOTES
-        elif symbol == DumbJson.BACKSLASH:
-            yield DumbJson.BACKSLASH
-            yield DumbJson.BACKSLASH
-        elif symbol == DumbJson.BACKSPACE:
-            yield DumbJson.BACKSLASH
-            yield u'b'
-        elif symbol == DumbJson.FORMFEED:
-            yield DumbJson.BACKSLASH
-            yield u'f'
-        elif symbol == DumbJson.NEWLINE:
-            yield DumbJson.BACKSLASH
-            yield u'n'
-        elif symbol == DumbJson.CARRIAGE_RETURN:
-            yield DumbJson.BACKSLASH
-            yield u'r'
-        elif symbol == DumbJson.TAB:
-            yield DumbJson.BACKSLASH
-            yield u't'
-        else:
-            yield symbol
+def escape_many(strings):
+    """ Return a list with the escaped version of each of `strings`. Dicts
+        (like the strings of pluralized OpenStrings) are escaped value by
+        value.
+    """
+
+    return _apply_many(escape, strings)
 
 
 def unescape(string):
-    return u''.join(_unescape_generator(string))
+    """ The reverse of `escape`; also turns `\\/` into `/` and `\\uXXXX` escape
+        sequences into the characters they stand for.
+    """
+
+    if DumbJson.BACKSLASH not in string:
+        return string
+    return UNESCAPE_PAT.sub(_unescape_match, string)
     # btw, this seems equivalent to
     # return json.loads(u'"{}"'.format(string))
 
 
-def _unescape_generator(string):
-    # I don't like this aldschool approach, but we may have to rewind a bit
-    ptr = 0
-    while True:
-        if ptr >= len(string):
-            break
-
-        symbol = string[ptr]
-
-        if symbol != DumbJson.BACKSLASH:
-            yield symbol
-            ptr += 1
-            continue
-
-        try:
-            next_symbol = string[ptr + 1]
-        except IndexError:
-            yield DumbJson.BACKSLASH
-            ptr += 1
-            continue
-
-        if next_symbol in (DumbJson.DOUBLE_QUOTES, DumbJson.FORWARD_SLASH,
-                           DumbJson.BACKSLASH):
-            yield next_symbol
-            ptr += 2
-        elif next_symbol == u'b':
-            yield DumbJson.BACKSPACE
-            ptr += 2
-        elif next_symbol == u'f':
-            yield DumbJson.FORMFEED
-            ptr += 2
-        elif next_symbol == u'n':
-            yield DumbJson.NEWLINE
-            ptr += 2
-        elif next_symbol == u'r':
-            yield DumbJson.CARRIAGE_RETURN
-            ptr += 2
-        elif next_symbol == u't':
-            yield DumbJson.TAB
-            ptr += 2
-        elif next_symbol == u'u':
-            unicode_escaped = string[ptr:ptr + 6]
-            try:
-                unescaped = unicode_escaped.\
-                    encode('ascii').\
-                    decode('unicode-escape')
-            except Exception:
-                yield DumbJson.BACKSLASH
-                yield u'u'
-                ptr += 2
-                continue
-            if len(unescaped) != 1:
-                yield DumbJson.BACKSLASH
-                yield u'u'
-                ptr += 2
-                continue
-            yield unescaped
-            ptr += 6
+def unescape_many(strings):
+    """ Return a list with the unescaped version of each of `strings`. Dicts
+        (like the strings of pluralized OpenStrings) are unescaped value by
+        value.
+    """
+
+    return _apply_many(unescape, strings)
+
+
+def _escape_match(match):
+    return ESCAPE_TABLE[match.group()]
+
+
+def _unescape_match(match):
+    sequence = match.group()
+    try:
+        return UNESCAPE_TABLE[sequence]
+    except KeyError:
+        return six.unichr(int(sequence[2:], 16))
+
 
+def _apply_many(func, strings):
+    result = []
+    append = result.append
+    for string in strings:
+        if isinstance(string, dict):
+            append({key: func(value) for key, value in six.iteritems(string)})
         else:
-            yield symbol
-            ptr += 1
+            append(func(string))
+    return result
 
 
 for symbol in (DumbJson.BACKSLASH, DumbJson.DOUBLE_QUOTES,
@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from bisect import bisect_left
+
 import six
 
 
@@ -35,3 +37,49 @@ def force_newline_type(content, newline_type):
     if newline_type == 'DOS':
         new_content = new_content.replace(NEWLINE, CARRIAGE_RETURN_NEWLINE)
     return new_content
+
+
+class NewlineIndex(object):
+    """ Finds the line number of a position in `source`.
+
+        The positions of the newlines are only collected the first time a line
+        number is requested, so that parsers don't have to count newlines as
+        they go just in case an error needs to be reported. After that, every
+        lookup is a binary search:
+
+            >>> index = NewlineIndex("a\nb\nc")
+            >>> index.line_number(4)
+            3
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._positions = None
+
+    @property
+    def positions(self):
+        if self._positions is not None:
+            return self._positions
+
+        if isinstance(self.source, six.text_type):
+            NEWLINE = "\n"
+        else:
+            NEWLINE = b"\n"
+
+        positions = []
+        ptr = self.source.find(NEWLINE)
+        while ptr != -1:
+            positions.append(ptr)
+            ptr = self.source.find(NEWLINE, ptr + 1)
+        self._positions = positions
+        return self._positions
+
+    def newline_count(self, position):
+        """ The number of newlines in `source` before `position`. """
+
+        return bisect_left(self.positions, position)
+
+    def line_number(self, position):
+        """ The (1-based) line number of the character at `position`. """
+
+        return self.newline_count(position) + 1
@@ -1,11 +1,13 @@
 import re
-from itertools import count
+from array import array
+from bisect import bisect_left
 
 import six
 
 from openformats.utils.compat import ensure_unicode
 
 from ..transcribers import Transcriber
+from .newlines import NewlineIndex
 
 
 def escape(string, inline_tags, escape_text):
@@ -97,62 +99,87 @@ def _escape_tag(root, transcriber, inline_tags, escape_text):
 
 class DumbXml(object):
     """
-        Describes and XML tag with its contents.
+        Describes an XML tag with its contents, as a span of a source string.
 
-        The fact that the content starts with a '<' and ends with a '>' is
-        assumed.
+        The tag is assumed to start with a '<' at `start`, optionally after
+        some whitespace, and its contents to end before `end`. All positions
+        are relative to the start of `source`, so the tag and the tags found
+        inside it share the same source and nothing gets copied unless asked
+        for.
 
-        You can iterate over the contents with the `find` method, which
+        You can iterate over the tags contained with the `find` method, which
         takes a tag name, a list of tag names or nothing as arguments and
-        yields
+        yields a DumbXml object for each matching tag, in document order.
     """
 
-    OPENING_TAG_PAT = r'^\s*\<(?P<name>[^\s\n\>]+)(?P<attrs>[^\>]*)\>'
-    ATTR_PAT = r'\b(?P<key>[^=]+)="(?P<value>[^"]+)"'
+    OPENING_TAG_PAT = re.compile(
+        ensure_unicode(r'\s*\<(?P<name>[^\s\n\>]+)(?P<attrs>[^\>]*)\>'),
+        re.DOTALL
+    )
+    ATTR_PAT = re.compile(
+        ensure_unicode(r'\b(?P<key>[^=]+)="(?P<value>[^"]+)"')
+    )
     COMMENT = "!--"
-    SINGLE_TAG_PAT = r'/\s*\>$'
+    COMMENT_START = u"<!--"
+    COMMENT_END = u"-->"
+    SINGLE_TAG_PAT = re.compile(ensure_unicode(r'/\s*\>$'))
+    COMMENT_START_PAT = re.compile(ensure_unicode(re.escape(COMMENT_START)))
+    COMMENT_END_PAT = re.compile(ensure_unicode(re.escape(COMMENT_END)))
 
-    def __init__(self, content):
+    def __init__(self, source, start=0, end=None, comments=None):
         """
             Does some parsing and sets the following attributes to `self`:
 
-            * content: The content of the tag, including the opening/closing
-                tags
+            * source, start, end: where the tag is, `end` being the end of
+                its closing tag
             * name: The name of the tag
             * attrs: A dictionary of all the attributes of the tag with their
                 values
-            * inner_offset: the place of the character where the inner content
-                of the tag starts, aka the length of the opening tag
-            * inner: the inner content of the tag
-        """
+            * inner_start, inner_end: where the inner content of the tag
+                starts and ends, `inner_end` never being before `inner_start`
 
-        # Fix regex encoding
-        self.opening_tag_pat = re.compile(ensure_unicode(self.OPENING_TAG_PAT),
-                                          re.DOTALL)
-        self.attr_pat = re.compile(ensure_unicode(self.ATTR_PAT))
-        self.single_tag_pat = re.compile(ensure_unicode(self.SINGLE_TAG_PAT))
+            `comments` is only passed to the tags found inside this one, so
+            that the comments of the source are only looked up once.
+        """
 
-        self.content = content
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        if comments is None:
+            comments = self._find_comments(source)
+        self.comments = comments
 
-        if self.content[:4] == "<!--":
+        if source.startswith(self.COMMENT_START, start, self.end):
             # Special case for comment
-            self.inner_offset = 4
+            self.inner_start = start + len(self.COMMENT_START)
             self.name = self.COMMENT
             self.attrs = {}
-            self.inner = self.content[4:self.content.index("-->")]
+            self.inner_end = max(
+                source.index(self.COMMENT_END, start, self.end),
+                self.inner_start
+            )
             return
 
-        opening_match = self.opening_tag_pat.search(content)
-        self.inner_offset = opening_match.end()
-        self.name = opening_match.groupdict()['name']
-        attrs = opening_match.groupdict()['attrs']
+        opening_match = self.OPENING_TAG_PAT.match(source, start, self.end)
+        self.inner_start = opening_match.end()
+        self.name = opening_match.group('name')
         self.attrs = {}
-        for match in self.attr_pat.finditer(attrs):
-            self.attrs[match.groupdict()['key']] = match.groupdict()['value']
+        for match in self.ATTR_PAT.finditer(opening_match.group('attrs')):
+            self.attrs[match.group('key')] = match.group('value')
+
+        closing_start, _ = self.find_closing(start)
+        # The closing tag may be found within a malformed opening tag
+        self.inner_end = max(closing_start, self.inner_start)
 
-        closing_start, closing_end = self.find_closing(0)
+    @property
+    def inner(self):
+        """ The inner content of the tag. """
+        return self.source[self.inner_start:self.inner_end]
 
-        self.inner = self.content[opening_match.end():closing_start]
+    @property
+    def content(self):
+        """ The content of the tag, including the opening/closing tags. """
+        return self.source[self.start:self.end]
 
     def find(self, tags=[]):
         if isinstance(tags, (six.binary_type, six.text_type)):
@@ -168,85 +195,88 @@ class DumbXml(object):
                 re.DOTALL
             )
 
-        for match in pat.finditer(self.content):
-            if match.start() == 0 or self._is_within_comment(match):
+        # Cursors into the positions comments start and end at. Matches come
+        # in order, so the cursors only need to move forward to always point
+        # after the last comment delimiter before the current match
+        comment_starts, comment_ends = self.comments
+        first_comment_start = comment_start = bisect_left(
+            comment_starts, self.start + len(self.COMMENT_START) - 1
+        )
+        first_comment_end = comment_end = bisect_left(
+            comment_ends, self.start + len(self.COMMENT_END) - 1
+        )
+
+        for match in pat.finditer(self.source, self.start, self.end):
+            position = match.start()
+            while (comment_start < len(comment_starts) and
+                   comment_starts[comment_start] <= position):
+                comment_start += 1
+            while (comment_end < len(comment_ends) and
+                   comment_ends[comment_end] <= position):
+                comment_end += 1
+
+            if position == self.start:
                 continue
-            closing_start, closing_end = self.find_closing(match.start())
-            found = DumbXml(self.content[match.start():closing_end])
+            if (comment_start > first_comment_start and
+                    (comment_end == first_comment_end or
+                     comment_ends[comment_end - 1] <
+                     comment_starts[comment_start - 1])):
+                # Within a comment
+                continue
+
+            closing_start, closing_end = self.find_closing(position)
+            found = DumbXml(self.source, position, closing_end, self.comments)
             if not tags or found.name in tags:
-                offset = match.start()
-                yield found, offset
+                yield found
 
     def find_closing(self, start):
         # assume start is on a '<'
 
-        if self.content[start:start + 4] == "<!--":
+        if self.source.startswith(self.COMMENT_START, start, self.end):
             # Special case for comment
-            closing_start = self.content[start:].index("-->")
-            return start + closing_start, start + closing_start + 3
+            closing_start = self.source.index(self.COMMENT_END, start,
+                                              self.end)
+            return closing_start, closing_start + len(self.COMMENT_END)
 
-        opening_match = self.opening_tag_pat.search(self.content[start:])
+        opening_match = self.OPENING_TAG_PAT.match(self.source, start,
+                                                   self.end)
 
-        if self.single_tag_pat.search(opening_match.group()):
+        if self.SINGLE_TAG_PAT.search(opening_match.group()):
             # Single tag, eg `<foo a="b" />`
-            return start + opening_match.end(), start + opening_match.end()
+            return opening_match.end(), opening_match.end()
 
-        tag_name = opening_match.groupdict()['name']
+        tag_name = opening_match.group('name')
         tag_pat = re.compile(
             ensure_unicode(
                 r'\<(?:(?:{tag_name})|(?:/{tag_name}\>))'.
                 format(tag_name=re.escape(tag_name))
             )
         )
-        match_generator = tag_pat.finditer(self.content[start:])
+        match_generator = tag_pat.finditer(self.source, start, self.end)
         first_match = next(match_generator)
-        assert first_match and first_match.start() == 0 and\
+        assert first_match and first_match.start() == start and\
             first_match.group()[1] != '/'
         count = 1
         for match in match_generator:
-            matched = match.group()
-            if matched[1] == '/' or matched == "-->":
+            if match.group()[1] == '/':
                 # closing tag
                 count -= 1
             else:
                 count += 1
 
             if count == 0:
-                return start + match.start(), start + match.end()
-
-    def _is_within_comment(self, match):
-        # Previous opening comment
-        try:
-            opening = match.start() -\
-                self.content[match.start()::-1].index("--!<")
-        except ValueError:
-            opening = None
-        # Previous closing comment
-        try:
-            closing = match.start() -\
-                self.content[match.start()::-1].index(">--")
-        except ValueError:
-            closing = None
-
-        if opening is not None:
-            if closing is not None:
-                if closing > opening:
-                    return False
-                else:
-                    return True
-            else:
-                return True
-        else:
-            return False
+                return match.start(), match.end()
 
+    @classmethod
+    def _find_comments(cls, source):
+        """ Return the sorted positions of the last character of every '<!--'
+            and every '-->' in `source`.
+        """
 
-if __name__ == "__main__":
-    document = DumbXml(
-        '<resources><string name="foo">hello world</string></resources>'
-    )
-    strings = document.find('string')
-    string, _ = next(strings)
-    print("{}: {}".format(string.attrs['name'], string.inner))
+        return ([match.end() - 1
+                 for match in cls.COMMENT_START_PAT.finditer(source)],
+                [match.end() - 1
+                 for match in cls.COMMENT_END_PAT.finditer(source)])
 
 
 class DumbXmlSyntaxError(Exception):
@@ -339,6 +369,13 @@ class NewDumbXml(object):
         `find_descendants`, which accept a tag name or list of tag names as
         argument. If the argument is left None, all children and descendants
         will be yielded.
+
+        The whole tag, its descendants and its tail are scanned once, when the
+        DumbXml object is created, into an `XmlIndex`. The objects yielded
+        while iterating are views into the same index, so no part of the
+        source is ever scanned twice. Syntax errors are still raised lazily:
+        only accessing something that the scanning could not reach because of
+        the error will raise it.
     """
 
     BACKSLASH = u"\\"
@@ -350,22 +387,50 @@ class NewDumbXml(object):
     NEWLINE = u"\n"
     EQUAL_SIGN = u"="
 
-    class NOT_CACHED:
-        "Special value for None because for some properties, None is valid"
-
     COMMENT = '!--'
+    COMMENT_START = u"<!--"
+    COMMENT_END = u"-->"
+    CDATA_START = u"<![CDATA["
+    CDATA_END = u"]]>"
 
-    def __init__(self, source, start=0):
+    def __init__(self, source, start=0, newline_index=None):
         self.source = source
         self.start = start
-        self._position = self._tag = self._attrib = self._attrib_string =\
-            self._attributes = self._text_position = self._text =\
-            self._content_end = self._tail_position = self._tail =\
-            self.NOT_CACHED
+        self.index = XmlIndex(source, start, newline_index)
+        # Shared with all the tags found inside this one
+        self.newline_index = self.index.newline_index
+        self.element = 0
+        self._attrib = None
+
+        if not self.index.positions:
+            # Not even the tag could be found
+            raise self.index.error
+
+    @classmethod
+    def _from_index(cls, index, element):
+        view = cls.__new__(cls)
+        view.source = index.source
+        view.start = index.positions[element]
+        view.index = index
+        view.newline_index = index.newline_index
+        view.element = element
+        view._attrib = None
+        return view
+
+    def _check(self, stage):
+        """ Raise the error that prevented the scanning from reaching `stage`
+            for this tag, if any.
+        """
+
+        if self.index.stages[self.element] < stage:
+            raise self.index.error
 
-        # Start with tag because if this is a comment, it will mess up with the
-        # retrieving of other attributes
-        self.tag
+    def _get_position(self, positions, stage):
+        self._check(stage)
+        position = positions[self.element]
+        if position == XmlIndex.MISSING:
+            return None
+        return position
 
     @property
     def position(self):
@@ -375,11 +440,7 @@ class NewDumbXml(object):
             ^
         """
 
-        if self._position is not self.NOT_CACHED:
-            return self._position
-
-        self._position = self._find_next_lt(self.start)
-        return self._position
+        return self.index.positions[self.element]
 
     @property
     def tag(self):
@@ -389,97 +450,18 @@ class NewDumbXml(object):
              ^^^^
         """
 
-        if self._tag is not self.NOT_CACHED:
-            return self._tag
-
-        start = self.position
-        end = start + len("<!--")
-        if self.source[start:end] == "<!--":
-            self._tag = self.COMMENT
-            self._process_comment()
-            return self._tag
-
-        for ptr in six.moves.xrange(self.position + 1, len(self.source)):
-            candidate = self.source[ptr]
-            if (candidate in (self.FORWARD_SLASH, self.GREATER_THAN) or
-                    candidate.isspace()):
-                self._tag = self.source[self.position + 1:ptr]
-                return self._tag
-        raise DumbXmlSyntaxError(u"Opening tag not closed on line {}".
-                                 format(self._find_line_number()))
+        return self.index.tags[self.element]
 
     @property
     def attributes(self):
-        if self._attributes is not self.NOT_CACHED:
-            return self._attributes
-
-        start = self.position + 1 + len(self.tag)
-        self._attributes = []
-        (status,
-         key_position, key, value_position, value, quote_type) = [None] * 6
-
-        for ptr in count(start):
-            try:
-                candidate = self.source[ptr]
-            except IndexError:
-                raise DumbXmlSyntaxError(
-                    u"Opening tag '{}' not closed on line {}".
-                    format(self.tag, self._find_line_number())
-                )
-
-            # `status` lifecycle should be:
-            #   None -> IN_KEY -> AFTER_KEY -> IN_VALUE -> None -> ...
-            if status is None:
-                if candidate in (self.FORWARD_SLASH, self.GREATER_THAN):
-                    # <a .... /> or <a .... >
-                    #         ^             ^
-                    break
-                elif candidate.isspace():
-                    # <a   b="c">
-                    #    ^
-                    continue
-                else:
-                    # <a  b="c" ...>
-                    #     ^
-                    status, key_position, key = "IN_KEY", ptr, [candidate]
-            elif status == "IN_KEY":
-                if candidate == self.EQUAL_SIGN:
-                    # <a b="c" ... >
-                    #     ^
-                    status = "AFTER_KEY"
-                else:
-                    # <a bcd="ef" ... >
-                    #     ^
-                    key.append(candidate)
-            elif status == "AFTER_KEY":
-                if candidate in (self.SINGLE_QUOTE, self.DOUBLE_QUOTES):
-                    # <a b="cde" ... >
-                    #      ^
-                    (status, quote_type, value_position,
-                     value) = "IN_VALUE", candidate, ptr + 1, []
-            elif status == "IN_VALUE":
-                if candidate == quote_type:
-                    # <a b="c" ... >
-                    #        ^
-                    status = None
-                    self._attributes.append((key_position, u''.join(key),
-                                             value_position, u''.join(value)))
-                else:
-                    # <a b="cde" ... >
-                    #        ^
-                    value.append(candidate)
-
-        self._attrib_string = self.source[start:ptr]
-
-        return self._attributes
+        self._check(XmlIndex.ATTRIBUTES)
+        return self.index.attributes[self.element]
 
     @property
     def attrib(self):
-        if self._attrib is not self.NOT_CACHED:
-            return self._attrib
-
-        self._attrib = {key: value for _, key, _, value in self.attributes}
-
+        if self._attrib is None:
+            self._attrib = {key: value
+                            for _, key, _, value in self.attributes}
         return self._attrib
 
     @property
@@ -490,41 +472,8 @@ class NewDumbXml(object):
                   ^
         """
 
-        if self._text_position is not self.NOT_CACHED:
-            return self._text_position
-
-        if self._attrib_string is self.NOT_CACHED:
-            self.attrib  # This will generate self._attrib_string
-
-        ptr = self.position + 1 + len(self.tag) + len(self._attrib_string)
-        candidate = self.source[ptr]
-        # Based on how we calculated '_attrib_string', this should either be
-        # '/' or '>'
-        if candidate == self.FORWARD_SLASH:
-            # This is a "single-tag", eg '<br />'
-            self._text_position = None
-            start = ptr + 1
-            for ptr in six.moves.xrange(start, len(self.source)):
-                candidate = self.source[ptr]
-                if candidate.isspace():
-                    continue
-                elif candidate == self.GREATER_THAN:
-                    self._tail_position = ptr + 1
-                    return self._text_position
-                else:
-                    raise DumbXmlSyntaxError(
-                        u"Opening tag '{}' not closed on line {}".
-                        format(self.tag, self._find_line_number())
-                    )
-            raise DumbXmlSyntaxError(
-                u"Opening tag '{}' not closed on line {}".
-                format(self.tag, self._find_line_number())
-            )
-        elif candidate == self.GREATER_THAN:
-            self._text_position = ptr + 1
-            return self._text_position
-        else:
-            raise DumbXmlSyntaxError(u"Something went wrong")
+        return self._get_position(self.index.text_positions,
+                                  XmlIndex.TEXT_POSITION)
 
     @property
     def text(self):
@@ -534,62 +483,22 @@ class NewDumbXml(object):
                   ^^^^^
         """
 
-        if self._text is not self.NOT_CACHED:
-            return self._text
-
-        if self.text_position is None:
-            self._text = None
-            return self._text
-
-        next_tag_position = self._find_next_lt(self.text_position)
-        if next_tag_position == len(self.source):
-            raise DumbXmlSyntaxError(
-                u"Tag '{}' not closed on line {}".
-                format(self.tag, self._find_line_number())
-            )
-
-        self._text = self.source[self.text_position:next_tag_position]
-        return self._text
+        text_end = self._get_position(self.index.text_ends, XmlIndex.TEXT)
+        if text_end is None:
+            return None
+        return self.source[self.text_position:text_end]
 
     def __iter__(self):
         if self.text is None or self.tag == self.COMMENT:
             return
 
-        start = self.text_position + len(self.text)
-        while True:
-            if self.source[start + 1] == self.FORWARD_SLASH:
-                # We found the closing tag
-                self._content_end = start
-                closing_tag = self.source[start + 2: start + 2 + len(self.tag)]
-                if closing_tag != self.tag:
-                    raise DumbXmlSyntaxError(
-                        u"Closing tag '{}' does not match opening tag '{}' on "
-                        u"line {}".
-                        format(closing_tag, self.tag, self._find_line_number())
-                    )
-                for ptr in six.moves.xrange(start + 2 + len(self.tag),
-                                            len(self.source)):
-                    candidate = self.source[ptr]
-                    if candidate.isspace():
-                        continue
-                    elif candidate == self.GREATER_THAN:
-                        self._tail_position = ptr + 1
-                        return
-                    else:
-                        raise DumbXmlSyntaxError(
-                            u"Invalid closing of tag '{}' on line {}".
-                            format(self.tag, self._find_line_number())
-                        )
-                raise DumbXmlSyntaxError(
-                    u"Invalid closing of tag '{}' on line {}".
-                    format(self.tag, self._find_line_number())
-                )
-            else:
-                # Use `self.__class__` in case this is a subclass (eg to handle
-                # HTML)
-                inner = self.__class__(self.source, start)
-                yield inner
-                start = inner.end
+        for element in self.index.iter_children(self.element):
+            # Use `self.__class__` in case this is a subclass (eg to handle
+            # HTML)
+            yield self.__class__._from_index(self.index, element)
+        # Raise the error that interrupted the scanning of the contents, if
+        # any
+        self.content_end
 
     @property
     def content_end(self):
@@ -599,13 +508,7 @@ class NewDumbXml(object):
                                         ^
         """
 
-        if self._content_end is not self.NOT_CACHED:
-            return self._content_end
-        if self.text_position is None:
-            return None
-        for _ in self:
-            pass
-        return self._content_end
+        return self._get_position(self.index.content_ends, XmlIndex.CONTENT)
 
     @property
     def content(self):
@@ -629,18 +532,7 @@ class NewDumbXml(object):
                                   ^
         """
 
-        if self._tail_position is not self.NOT_CACHED:
-            return self._tail_position
-
-        # _tail_position might be set when getting 'text_position'
-        self.text_position
-        if self._tail_position is not self.NOT_CACHED:
-            return self._tail_position
-
-        # Otherwise, it should be set after iterating
-        for _ in self:
-            pass
-        return self._tail_position
+        return self._get_position(self.index.tail_positions, XmlIndex.CONTENT)
 
     @property
     def tail(self):
@@ -650,12 +542,7 @@ class NewDumbXml(object):
                                   ^^^^^^^^^^^^^^
         """
 
-        if self._tail is not self.NOT_CACHED:
-            return self._tail
-
-        self._tail = self.source[self.tail_position:
-                                 self._find_next_lt(self.tail_position)]
-        return self.tail
+        return self.source[self.tail_position:self.end]
 
     @property
     def end(self):
@@ -665,7 +552,7 @@ class NewDumbXml(object):
                                                 ^
         """
 
-        return self.tail_position + len(self.tail)
+        return self._get_position(self.index.ends, XmlIndex.TAIL)
 
     def find_children(self, *tags):
         for child in self:
@@ -679,45 +566,287 @@ class NewDumbXml(object):
             for inner in child.find_descendants(*tags):
                 yield inner
 
-    def _find_next_lt(self, start):
-        in_cdata = False
-        for ptr in six.moves.xrange(start, len(self.source)):
-            candidate = self.source[ptr]
-            if in_cdata:
-                if (candidate == ']' and
-                        self.source[ptr:ptr + len("]]>")] == "]]>"):
-                    in_cdata = False
+
+class XmlIndex(object):
+    """ All the tags of an XML string, found by scanning it once.
+
+        Scanning starts from the first tag after `start` and covers that tag,
+        everything inside it and its tail. Each tag found is identified by its
+        order of appearance (its "element") and its properties are kept in
+        parallel arrays, indexed by element, with the same meaning as the
+        properties of `NewDumbXml`. Texts and tails are kept as the positions
+        they end at, `parents` holds the element each element is directly
+        inside of and `subtree_ends` the element that follows all of its
+        descendants. Positions and elements that don't exist (eg the text
+        position of a single tag or the parent of the outermost tag) are
+        `MISSING`.
+
+        The scanning stops at the first syntax error, which is kept in
+        `error`. `stages` holds how far the scanning of each element got, so
+        that the error can be raised only when something it prevented from
+        being found is asked for.
+    """
+
+    # The stages of scanning an element, in order
+    TAG, ATTRIBUTES, TEXT_POSITION, TEXT, CONTENT, TAIL = range(1, 7)
+
+    MISSING = -1
+
+    # The scanning jumps straight to the next interesting character with these
+    # instead of walking the source one character at a time
+    TAG_END_PAT = re.compile(ensure_unicode(r'[/>\s]'), re.UNICODE)
+    QUOTE_PAT = re.compile(ensure_unicode(r'[\'"]'))
+    WHITESPACE_PAT = re.compile(ensure_unicode(r'\s*'), re.UNICODE)
+
+    def __init__(self, source, start=0, newline_index=None):
+        self.source = source
+        if newline_index is None:
+            newline_index = NewlineIndex(source)
+        self.newline_index = newline_index
+
+        self.positions = array('l')
+        self.tags = []
+        self.attributes = []
+        self.text_positions = array('l')
+        self.text_ends = array('l')
+        self.content_ends = array('l')
+        self.tail_positions = array('l')
+        self.ends = array('l')
+        self.parents = array('l')
+        self.subtree_ends = array('l')
+        self.stages = array('b')
+        self.error = None
+
+        try:
+            self._scan(start)
+        except (DumbXmlSyntaxError, IndexError) as exc:
+            self.error = exc
+
+    def _scan(self, start):
+        element = self._add_element(start, self.MISSING)
+        while True:
+            if self.stages[element] == self.TEXT:
+                # <a>text<b>...</a>
+                #        ^
+                ptr = self.text_ends[element]
             else:
-                if candidate == self.LESS_THAN:
-                    # Check against CDATA
-                    if self.source[ptr:ptr + len("<![CDATA[")] == "<![CDATA[":
-                        in_cdata = True
-                    else:
-                        return ptr
-        # We reached the end of the string, lets return accordingly
-        return len(self.source)
-
-    def _process_comment(self):
-        # We already know position and tag
-
-        self._attrib_string = ""
-        self._attributes = []
-        self._attrib = {}
-
-        self._text_position = self.position + len("<!--")
-        for ptr in six.moves.xrange(self._text_position, len(self.source)):
-            candidate = self.source[ptr]
-            if candidate == '-' and self.source[ptr:ptr + len("-->")] == "-->":
-                self._content_end = ptr
-                self._text = self.source[self.text_position:ptr]
-                self._tail_position = ptr + len("-->")
+                # The element is complete, continue with the parent's
+                # contents after its tail
+                ptr = self._add_tail(element)
+                element = self.parents[element]
+                if element == self.MISSING:
+                    return
+
+            if self.source[ptr + 1] == NewDumbXml.FORWARD_SLASH:
+                self._add_closing_tag(element, ptr)
+            else:
+                element = self._add_element(ptr, element)
+
+    def _append(self, position, tag, parent):
+        element = len(self.positions)
+        self.positions.append(position)
+        self.tags.append(tag)
+        self.attributes.append(None)
+        self.text_positions.append(self.MISSING)
+        self.text_ends.append(self.MISSING)
+        self.content_ends.append(self.MISSING)
+        self.tail_positions.append(self.MISSING)
+        self.ends.append(self.MISSING)
+        self.parents.append(parent)
+        self.subtree_ends.append(self.MISSING)
+        self.stages.append(self.TAG)
+        return element
+
+    def _set_content_scanned(self, element):
+        self.subtree_ends[element] = len(self.positions)
+        self.stages[element] = self.CONTENT
+
+    def iter_children(self, element):
+        """ Yield the elements directly inside `element` that were found. """
+
+        child = element + 1
+        while (child < len(self.positions) and
+               self.parents[child] == element):
+            yield child
+            child = self.subtree_ends[child]
+            if child == self.MISSING:
+                # The scanning stopped inside this child
                 return
-        raise DumbXmlSyntaxError(u"Comment not closed on line {}".
-                                 format(self._find_line_number()))
 
-    def _find_line_number(self, ptr=None):
-        ptr = ptr or self.position
-        return self.source[:ptr].count(self.NEWLINE) + 1
+    def _add_element(self, start, parent):
+        """ Scan the element starting on the first tag after `start` up until
+            its text.
+        """
+
+        source = self.source
+        position = self.find_next_lt(start)
+
+        if source.startswith(NewDumbXml.COMMENT_START, position):
+            text_position = position + len(NewDumbXml.COMMENT_START)
+            content_end = source.find(NewDumbXml.COMMENT_END, text_position)
+            if content_end == -1:
+                raise DumbXmlSyntaxError(u"Comment not closed on line {}".
+                                         format(self._line_number(position)))
+            element = self._append(position, NewDumbXml.COMMENT, parent)
+            self.attributes[element] = []
+            self.text_positions[element] = text_position
+            self.text_ends[element] = content_end
+            self.content_ends[element] = content_end
+            self.tail_positions[element] = (content_end +
+                                            len(NewDumbXml.COMMENT_END))
+            self._set_content_scanned(element)
+            return element
+
+        match = self.TAG_END_PAT.search(source, position + 1)
+        if match is None:
+            raise DumbXmlSyntaxError(u"Opening tag not closed on line {}".
+                                     format(self._line_number(position)))
+        element = self._append(position, source[position + 1:match.start()],
+                               parent)
+
+        ptr = self._add_attributes(element, match.start())
+        if source[ptr] == NewDumbXml.FORWARD_SLASH:
+            # This is a "single-tag", eg '<br />'
+            tail_position = self._find_closing_gt(ptr + 1)
+            if tail_position is None:
+                self._raise_opening_tag_not_closed(element)
+            self.tail_positions[element] = tail_position
+            self._set_content_scanned(element)
+            return element
+
+        text_position = ptr + 1
+        self.text_positions[element] = text_position
+        self.stages[element] = self.TEXT_POSITION
+
+        next_tag_position = self.find_next_lt(text_position)
+        if next_tag_position == len(source):
+            raise DumbXmlSyntaxError(
+                u"Tag '{}' not closed on line {}".
+                format(self.tags[element], self._line_number(position))
+            )
+        self.text_ends[element] = next_tag_position
+        self.stages[element] = self.TEXT
+        return element
+
+    def _add_attributes(self, element, start):
+        """ Scan the attributes of the element, starting right after its tag
+            name, and return the position of the '/' or '>' that follows them.
+        """
+
+        source = self.source
+        attributes = []
+        ptr = start
+        while True:
+            ptr = self.WHITESPACE_PAT.match(source, ptr).end()
+            if ptr == len(source):
+                self._raise_opening_tag_not_closed(element)
+            if source[ptr] in (NewDumbXml.FORWARD_SLASH,
+                               NewDumbXml.GREATER_THAN):
+                # <a .... /> or <a .... >
+                #         ^             ^
+                break
+
+            # <a  b="c" ...>
+            #     ^
+            key_position = ptr
+            equal_sign = source.find(NewDumbXml.EQUAL_SIGN, ptr + 1)
+            if equal_sign == -1:
+                self._raise_opening_tag_not_closed(element)
+
+            # <a b="cde" ... >
+            #      ^
+            match = self.QUOTE_PAT.search(source, equal_sign + 1)
+            if match is None:
+                self._raise_opening_tag_not_closed(element)
+            value_position = match.end()
+
+            # <a b="c" ... >
+            #        ^
+            ptr = source.find(match.group(), value_position)
+            if ptr == -1:
+                self._raise_opening_tag_not_closed(element)
+            attributes.append((key_position, source[key_position:equal_sign],
+                               value_position, source[value_position:ptr]))
+            ptr += 1
+
+        self.attributes[element] = attributes
+        self.stages[element] = self.ATTRIBUTES
+        return ptr
+
+    def _add_closing_tag(self, element, start):
+        """ Scan the closing tag of the element, which starts at `start`. """
+
+        tag = self.tags[element]
+        self.content_ends[element] = start
+        closing_tag = self.source[start + 2:start + 2 + len(tag)]
+        if closing_tag != tag:
+            raise DumbXmlSyntaxError(
+                u"Closing tag '{}' does not match opening tag '{}' on line {}".
+                format(closing_tag, tag,
+                       self._line_number(self.positions[element]))
+            )
+        tail_position = self._find_closing_gt(start + 2 + len(tag))
+        if tail_position is None:
+            raise DumbXmlSyntaxError(
+                u"Invalid closing of tag '{}' on line {}".
+                format(tag, self._line_number(self.positions[element]))
+            )
+        self.tail_positions[element] = tail_position
+        self._set_content_scanned(element)
+
+    def _add_tail(self, element):
+        """ Scan the tail of the element and return where it ends. """
+
+        end = self.find_next_lt(self.tail_positions[element])
+        self.ends[element] = end
+        self.stages[element] = self.TAIL
+        return end
+
+    def find_next_lt(self, start):
+        """ Return the position of the first '<' after `start` that does not
+            belong to a CDATA section, or the length of the source if there
+            isn't one.
+        """
+
+        source = self.source
+        while True:
+            ptr = source.find(NewDumbXml.LESS_THAN, start)
+            if ptr == -1:
+                break
+            # Check against CDATA
+            if not source.startswith(NewDumbXml.CDATA_START, ptr):
+                return ptr
+            ptr = source.find(NewDumbXml.CDATA_END,
+                              ptr + len(NewDumbXml.CDATA_START))
+            if ptr == -1:
+                break
+            start = ptr + len(NewDumbXml.CDATA_END)
+        # We reached the end of the string, lets return accordingly
+        return len(source)
+
+    def _find_closing_gt(self, start):
+        """ Return the position after the '>' that follows `start`, allowing
+            only whitespace in between, or None if there isn't one.
+
+            <br   />    </a   >
+                   ^        ^
+        """
+
+        ptr = self.WHITESPACE_PAT.match(self.source, start).end()
+        if (ptr < len(self.source) and
+                self.source[ptr] == NewDumbXml.GREATER_THAN):
+            return ptr + 1
+        return None
+
+    def _raise_opening_tag_not_closed(self, element):
+        raise DumbXmlSyntaxError(
+            u"Opening tag '{}' not closed on line {}".
+            format(self.tags[element],
+                   self._line_number(self.positions[element]))
+        )
+
+    def _line_number(self, ptr):
+        return self.newline_index.line_number(ptr)
 
 
 for symbol in (NewDumbXml.BACKSLASH, NewDumbXml.FORWARD_SLASH,
@@ -0,0 +1,174 @@
+from __future__ import absolute_import
+
+import io
+import struct
+import zipfile
+import zlib
+
+import six
+
+# General purpose flags
+DATA_DESCRIPTOR_FLAG = 0x08
+UTF8_FLAG = 0x800
+
+# Header id of the zip64 extra field
+ZIP64_EXTRA_ID = 0x0001
+
+DATA_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+STRUCT_DATA_DESCRIPTOR = '<4s3L'
+
+
+def rewrite_zip(content, replacements):
+    """ Return a copy of the zip archive `content` with the contents of some
+        of its members replaced.
+
+        Members that are not in `replacements` are copied into the new
+        archive with their compressed data as it is, so images, fonts and
+        other media are neither decompressed nor compressed again. Only the
+        replacements are compressed, deflated unless the member they replace
+        was stored uncompressed. The order of the members, their names,
+        timestamps and attributes are kept:
+
+            >>> template = rewrite_zip(content, {
+            ...     'word/document.xml': document.encode('utf-8'),
+            ... })
+
+        Archives that need zip64 extensions are rewritten member by member
+        with `zipfile` instead.
+
+        :param content: the bytes of the zip archive
+        :param replacements: a dict from member names to their new contents,
+            as bytes
+        :return: the bytes of the new zip archive
+        :raises KeyError: if a replacement is not a member of the archive
+    """
+
+    source = zipfile.ZipFile(io.BytesIO(content))
+    infolist = source.infolist()
+    for filename in replacements:
+        source.getinfo(filename)
+
+    if _needs_zip64(content, infolist, replacements):
+        return _recompress(source, infolist, replacements)
+
+    out = io.BytesIO()
+    central_directory = []
+    for info in infolist:
+        header_offset = out.tell()
+        flag_bits = info.flag_bits
+        extract_version = info.extract_version
+        compress_type = info.compress_type
+        if info.filename in replacements:
+            data = replacements[info.filename]
+            crc = zlib.crc32(data) & 0xffffffff
+            file_size = len(data)
+            flag_bits &= UTF8_FLAG
+            if compress_type != zipfile.ZIP_STORED:
+                compress_type = zipfile.ZIP_DEFLATED
+                extract_version = max(extract_version, 20)
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                              zlib.DEFLATED, -15)
+                data = compressor.compress(data) + compressor.flush()
+        else:
+            data = _get_raw_data(content, info)
+            crc = info.CRC
+            file_size = info.file_size
+        compress_size = len(data)
+
+        name = _encode_filename(info)
+        dosdate, dostime = _get_dos_date_time(info.date_time)
+        out.write(struct.pack(
+            zipfile.structFileHeader, zipfile.stringFileHeader,
+            extract_version, info.reserved, flag_bits, compress_type,
+            dostime, dosdate, crc, compress_size, file_size, len(name),
+            len(info.extra)
+        ))
+        out.write(name)
+        out.write(info.extra)
+        out.write(data)
+        if flag_bits & DATA_DESCRIPTOR_FLAG:
+            out.write(struct.pack(STRUCT_DATA_DESCRIPTOR,
+                                  DATA_DESCRIPTOR_SIGNATURE, crc,
+                                  compress_size, file_size))
+
+        central_directory.append(struct.pack(
+            zipfile.structCentralDir, zipfile.stringCentralDir,
+            info.create_version, info.create_system, extract_version,
+            info.reserved, flag_bits, compress_type, dostime, dosdate, crc,
+            compress_size, file_size, len(name), len(info.extra),
+            len(info.comment), 0, info.internal_attr, info.external_attr,
+            header_offset
+        ) + name + info.extra + info.comment)
+
+    central_directory_offset = out.tell()
+    for entry in central_directory:
+        out.write(entry)
+    out.write(struct.pack(
+        zipfile.structEndArchive, zipfile.stringEndArchive, 0, 0,
+        len(central_directory), len(central_directory),
+        out.tell() - central_directory_offset, central_directory_offset,
+        len(source.comment)
+    ))
+    out.write(source.comment)
+    return out.getvalue()
+
+
+def _needs_zip64(content, infolist, replacements):
+    if len(infolist) >= 0xffff:
+        return True
+    size = len(content) + sum(len(data)
+                              for data in six.itervalues(replacements))
+    if size > zipfile.ZIP64_LIMIT:
+        return True
+    for info in infolist:
+        extra = info.extra
+        while len(extra) >= 4:
+            header_id, length = struct.unpack('<HH', extra[:4])
+            if header_id == ZIP64_EXTRA_ID:
+                return True
+            extra = extra[4 + length:]
+    return False
+
+
+def _recompress(source, infolist, replacements):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', allowZip64=True) as archive:
+        for info in infolist:
+            data = replacements.get(info.filename)
+            if data is None:
+                data = source.read(info)
+            archive.writestr(info, data, compress_type=info.compress_type)
+    return out.getvalue()
+
+
+def _get_raw_data(content, info):
+    """ Return a view of the compressed data of a member, as found in the
+        archive.
+    """
+
+    start = info.header_offset
+    end = start + zipfile.sizeFileHeader
+    header = struct.unpack(zipfile.structFileHeader, content[start:end])
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipfile(
+            "Bad magic number for file header of {}".format(info.filename)
+        )
+    # The name and the extra field lengths come last in the header
+    start = end + header[-2] + header[-1]
+    return memoryview(content)[start:start + info.compress_size]
+
+
+def _encode_filename(info):
+    filename = info.orig_filename
+    if isinstance(filename, six.binary_type):
+        return filename
+    if info.flag_bits & UTF8_FLAG:
+        return filename.encode('utf-8')
+    return filename.encode('cp437')
+
+
+def _get_dos_date_time(date_time):
+    year, month, day, hours, minutes, seconds = date_time
+    dosdate = (year - 1980) << 9 | month << 5 | day
+    dostime = hours << 11 | minutes << 5 | (seconds // 2)
+    return dosdate, dostime
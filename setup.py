@@ -9,7 +9,6 @@ install_requires = [
     'PyYAML==5.1',
     'pyparsing==2.2.0',
     'lxml==4.6.2',
-    'beautifulsoup4==4.9.3',
     'ucflib @ git+https://github.com/kbairak/ucflib.git@py3_compatibility#egg=ucflib-0.2.1',  # noqa
 ]
 
@@ -33,6 +32,6 @@ setup(
     test_suite="openformats.tests.run_tests.run_all",
     packages=find_packages(
         where='.',
-        exclude=('tests*', 'testbed')
+        exclude=('tests*', 'testbed', 'benchmarks*')
     )
 )